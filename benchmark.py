@@ -0,0 +1,274 @@
+"""
+Headless benchmark suite for the tracking, world and renderer hot paths.
+
+Runs without a camera or display and writes machine-readable JSON.
+Pass --baseline to compare against an earlier run and fail on regressions:
+
+    python benchmark.py --output bench.json
+    python benchmark.py --baseline bench.json --tolerance 0.15
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+
+import cv2
+import numpy as np
+
+from frame_sources import create_source
+from grid_world import GridWorld
+from hologram_renderer import HologramRenderer
+from hand_tracking import HandState, NUM_LANDMARKS
+
+FRAME_WIDTH = 1280
+FRAME_HEIGHT = 720
+
+
+def summarize(samples_ns, ops_per_sample=1):
+    """Turn per-sample durations (ns) into a result dict."""
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    total_s = samples.sum() / 1000.0
+    return {
+        'samples': len(samples),
+        'mean_ms': float(samples.mean()),
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p95_ms': float(np.percentile(samples, 95)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'ops_per_sec': float(len(samples) * ops_per_sample / total_s) if total_s > 0 else 0.0,
+    }
+
+
+def load_frames(spec, count):
+    """Read `count` frames from a frame source spec, unpaced."""
+    source = create_source(spec, FRAME_WIDTH, FRAME_HEIGHT, paced=False, loop=True)
+    if not source.open():
+        raise Exception(f"Could not open frame source: {spec}")
+    
+    frames = []
+    while len(frames) < count:
+        ret, frame = source.read()
+        if not ret:
+            break
+        frames.append(frame)
+    source.release()
+    return frames
+
+
+def bench_tracker(frames_spec, num_frames, results):
+    """HandTracker.process_frame on recorded or synthetic frames."""
+    from hand_tracking import HandTracker
+    
+    frames = load_frames(frames_spec, num_frames)
+    configs = [
+        ('full', {}),
+        ('downscale', {'inference_mode': 'downscale'}),
+        ('roi', {'inference_mode': 'roi'}),
+        ('keyframe4', {'keyframe_interval': 4}),
+    ]
+    
+    for name, options in configs:
+        tracker = HandTracker(max_hands=1, **options)
+        samples = []
+        for frame in frames:
+            work = frame.copy()  # process_frame draws on its input
+            start = time.perf_counter_ns()
+            tracker.process_frame(work)
+            samples.append(time.perf_counter_ns() - start)
+        tracker.close()
+        results[f'tracker.process_frame.{name}'] = summarize(samples)
+        print_result(f'tracker.process_frame.{name}', results)
+
+
+def bench_world(op_counts, results):
+    """GridWorld place/query/remove throughput."""
+    rng = np.random.default_rng(0)
+    grid_size = 100
+    
+    for count in op_counts:
+        coords = rng.integers(0, grid_size, size=(count, 3)).tolist()
+        world = GridWorld(grid_size=grid_size)
+        
+        for op_name, op in (('place', world.place_block),
+                            ('has', world.has_block),
+                            ('remove', world.remove_block)):
+            start = time.perf_counter_ns()
+            for x, y, z in coords:
+                op(x, y, z)
+            elapsed = time.perf_counter_ns() - start
+            
+            key = f'world.{op_name}.{count}'
+            results[key] = summarize([elapsed], ops_per_sample=count)
+            results[key]['ns_per_op'] = elapsed / count
+            print_result(key, results)
+            
+            if op_name == 'has':
+                # Whole-world query through the vectorized occupancy view
+                start = time.perf_counter_ns()
+                world.get_block_arrays()
+                key = f'world.occupied.{count}'
+                results[key] = summarize([time.perf_counter_ns() - start])
+                print_result(key, results)
+    
+    # Vectorized bulk edits on a 64^3 box
+    world = GridWorld(grid_size=grid_size)
+    for op_name, op in (('fill_box', lambda: world.fill_box((0, 0, 0), (63, 63, 63))),
+                        ('clear_box', lambda: world.clear_box((0, 0, 0), (63, 63, 63)))):
+        start = time.perf_counter_ns()
+        op()
+        key = f'world.{op_name}.64'
+        results[key] = summarize([time.perf_counter_ns() - start], ops_per_sample=64 ** 3)
+        print_result(key, results)
+
+
+def fake_hand():
+    """A HandState with one open hand in the middle of the frame."""
+    rng = np.random.default_rng(1)
+    landmarks = np.zeros((1, NUM_LANDMARKS, 3), dtype=np.float32)
+    landmarks[0, :, 0] = FRAME_WIDTH / 2 + rng.uniform(-80, 80, NUM_LANDMARKS)
+    landmarks[0, :, 1] = FRAME_HEIGHT / 2 + rng.uniform(-80, 80, NUM_LANDMARKS)
+    return HandState(landmarks, np.array([1]))
+
+
+def bench_renderer(block_counts, num_frames, results):
+    """HologramRenderer.render_frame with growing worlds, HUD on and off."""
+    rng = np.random.default_rng(2)
+    frame = load_frames('synthetic', 1)[0]
+    hand = fake_hand()
+    no_hand = HandState(np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32), np.zeros(0, dtype=np.intp))
+    grid_size = 32
+    
+    for count in block_counts:
+        world = GridWorld(grid_size=grid_size)
+        cells = rng.choice(grid_size ** 3, size=count, replace=False)
+        for cell in cells.tolist():
+            x, rest = divmod(cell, grid_size * grid_size)
+            y, z = divmod(rest, grid_size)
+            world.place_block(x, y, z, world.color_palette[cell % len(world.color_palette)])
+        
+        for hud in (True, False):
+            renderer = HologramRenderer(FRAME_WIDTH, FRAME_HEIGHT)
+            renderer.show_hud = hud
+            tracker_state = hand if hud else no_hand
+            
+            renderer.render_frame(frame, world, tracker_state)  # warm-up
+            samples = []
+            for _ in range(num_frames):
+                start = time.perf_counter_ns()
+                renderer.render_frame(frame, world, tracker_state)
+                samples.append(time.perf_counter_ns() - start)
+            
+            key = f"renderer.render_frame.{count}.{'hud' if hud else 'nohud'}"
+            results[key] = summarize(samples)
+            print_result(key, results)
+        
+        # Cold frames that rasterize the whole block layer (world swap, resize)
+        samples = []
+        for _ in range(num_frames):
+            renderer.block_color = None
+            start = time.perf_counter_ns()
+            renderer.render_frame(frame, world, no_hand)
+            samples.append(time.perf_counter_ns() - start)
+        key = f"renderer.rebuild_blocks.{count}"
+        results[key] = summarize(samples)
+        print_result(key, results)
+
+
+def print_result(key, results):
+    """Print one result line."""
+    result = results[key]
+    print(f"  {key:<40} mean {result['mean_ms']:9.3f} ms   p95 {result['p95_ms']:9.3f} ms   "
+          f"{result['ops_per_sec']:12.1f} ops/s")
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare mean times against a baseline run.
+    
+    Returns:
+        List of (key, baseline_ms, current_ms, change) for regressions
+    """
+    regressions = []
+    print("\nComparison with baseline:")
+    for key, result in sorted(results.items()):
+        base = baseline.get('results', {}).get(key)
+        if base is None:
+            print(f"  {key:<40} (new)")
+            continue
+        
+        change = (result['mean_ms'] - base['mean_ms']) / base['mean_ms'] if base['mean_ms'] else 0.0
+        flag = ''
+        if change > tolerance:
+            flag = '  REGRESSION'
+            regressions.append((key, base['mean_ms'], result['mean_ms'], change))
+        print(f"  {key:<40} {base['mean_ms']:9.3f} -> {result['mean_ms']:9.3f} ms ({change:+.1%}){flag}")
+    return regressions
+
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="BlocksByPi headless benchmarks")
+    parser.add_argument('--suites', default='tracker,world,renderer',
+                        help="Comma separated suites to run: tracker, world, renderer")
+    parser.add_argument('--frames', default='synthetic',
+                        help="Frame source for tracker benchmarks (video:<path>, images:<dir>, synthetic)")
+    parser.add_argument('--tracker-frames', type=int, default=100,
+                        help="Frames processed per tracker configuration")
+    parser.add_argument('--world-ops', default='1000,100000,1000000',
+                        help="Comma separated operation counts for world benchmarks")
+    parser.add_argument('--blocks', default='0,100,1000,10000',
+                        help="Comma separated block counts for renderer benchmarks")
+    parser.add_argument('--render-frames', type=int, default=30,
+                        help="Frames rendered per renderer configuration")
+    parser.add_argument('--output', default=None, help="Write results JSON to this path")
+    parser.add_argument('--baseline', default=None, help="Baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="Allowed slowdown before a result counts as a regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the selected benchmarks."""
+    args = parse_args(argv)
+    suites = [name.strip() for name in args.suites.split(',') if name.strip()]
+    results = {}
+    
+    if 'tracker' in suites:
+        print("Tracker:")
+        bench_tracker(args.frames, args.tracker_frames, results)
+    if 'world' in suites:
+        print("World:")
+        bench_world([int(n) for n in args.world_ops.split(',')], results)
+    if 'renderer' in suites:
+        print("Renderer:")
+        bench_renderer([int(n) for n in args.blocks.split(',')], args.render_frames, results)
+    
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+        },
+        'results': results,
+    }
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.tolerance:.0%}")
+            return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
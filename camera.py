@@ -1,14 +1,20 @@
-import cv2
+import time
 import threading
 import numpy as np
+from frame_sources import WebcamSource
 
 class CameraFeed:
     """
     Manages webcam feed capture with threading for smooth performance.
     Provides frame access to other modules.
+    
+    Frames are decoded straight into a preallocated ring of buffers and
+    tagged with a monotonically increasing sequence number. Consumers use
+    read_next() to block for a newer frame and release() to hand the slot
+    back to the capture thread.
     """
     
-    def __init__(self, camera_id=0, width=1280, height=720):
+    def __init__(self, camera_id=0, width=1280, height=720, source=None, buffer_size=4):
         """
         Initialize camera feed.
         
@@ -16,43 +22,162 @@ class CameraFeed:
             camera_id: Webcam device ID (default 0)
             width: Frame width in pixels
             height: Frame height in pixels
+            source: Optional FrameSource (video file, image directory, synthetic).
+                    Defaults to the webcam given by camera_id.
+            buffer_size: Number of frame buffers in the ring (at least 3)
         """
         self.camera_id = camera_id
         self.width = width
         self.height = height
-        self.cap = None
-        self.frame = None
+        self.source = source
         self.running = False
+        self.thread = None
         self.lock = threading.Lock()
+        self.frame_ready = threading.Condition(self.lock)
+        
+        # Frame ring: buffers are allocated on the first frame (real size known)
+        self.buffer_size = max(3, buffer_size)
+        self.ring = None
+        self.slot_seq = [-1] * self.buffer_size
+        self.slot_time = [0.0] * self.buffer_size
+        self.slot_holds = [0] * self.buffer_size
+        self.latest_slot = -1
+        self.latest_seq = -1
+        self.last_read_seq = -1
+        
+        # Counters
+        self.frames_captured = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0
+        self.frames_duplicated = 0
         
     def start(self):
         """Start the camera feed in a separate thread."""
-        self.cap = cv2.VideoCapture(self.camera_id)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.source is None:
+            self.source = WebcamSource(self.camera_id, self.width, self.height)
         
-        if not self.cap.isOpened():
+        if not self.source.open():
+            self.source.release()
             raise Exception("Could not open camera. Check camera permissions and availability.")
         
+        # Sources report their real size (webcams may ignore the request)
+        self.width = self.source.width or self.width
+        self.height = self.source.height or self.height
+        
         self.running = True
         self.thread = threading.Thread(target=self._update_frame, daemon=True)
         self.thread.start()
-        print(f"Camera started: {self.width}x{self.height}")
+        print(f"Camera started: {self.width}x{self.height} ({type(self.source).__name__})")
         
     def _update_frame(self):
         """Internal method to continuously capture frames."""
         while self.running:
-            ret, frame = self.cap.read()
-            if ret:
-                with self.lock:
-                    self.frame = frame
+            with self.frame_ready:
+                slot = self._free_slot()
+                if slot is None:
+                    # Every buffer is held by a consumer, wait for a release
+                    self.frame_ready.wait(timeout=0.1)
+                    continue
+                buffer = self.ring[slot] if self.ring is not None else None
+            
+            # Decode outside the lock, straight into the free slot
+            ret, frame = self.source.read(image=buffer)
+            timestamp = time.perf_counter()
+            
+            if not ret:
+                if not self.source.is_opened():
+                    # Finite source ran out (end of video / image list)
+                    break
+                continue
+            
+            with self.frame_ready:
+                if self.ring is None:
+                    self.ring = [np.empty_like(frame) for _ in range(self.buffer_size)]
+                    self.ring[slot] = frame
+                elif frame is not buffer:
+                    # Decoder could not reuse the buffer (size change), adopt its array
+                    self.ring[slot] = frame
+                
+                self.latest_seq += 1
+                self.slot_seq[slot] = self.latest_seq
+                self.slot_time[slot] = timestamp
+                self.latest_slot = slot
+                self.frames_captured += 1
+                self.frame_ready.notify_all()
+        
+        with self.frame_ready:
+            self.frame_ready.notify_all()
+    
+    def _free_slot(self):
+        """Pick the oldest slot that is neither the latest frame nor held."""
+        best = None
+        for slot in range(self.buffer_size):
+            if slot == self.latest_slot or self.slot_holds[slot]:
+                continue
+            if best is None or self.slot_seq[slot] < self.slot_seq[best]:
+                best = slot
+        return best
+    
+    def read_next(self, after_seq=-1, timeout=None):
+        """
+        Block until a frame newer than after_seq is available.
+        
+        The returned frame is a view into the ring, not a copy. It stays
+        valid (and may be drawn on) until release(seq) is called.
+        
+        Args:
+            after_seq: Sequence number of the last frame processed (-1 for any)
+            timeout: Maximum seconds to wait (None waits forever)
+            
+        Returns:
+            (seq, frame, timestamp) tuple, or None on timeout / source end.
+            timestamp is the time.perf_counter() value at capture.
+        """
+        with self.frame_ready:
+            available = self.frame_ready.wait_for(
+                lambda: self.latest_seq > after_seq or not self.is_running(), timeout)
+            if not available or self.latest_seq <= after_seq:
+                return None
+            
+            slot = self.latest_slot
+            seq = self.latest_seq
+            self.slot_holds[slot] += 1
+            
+            if after_seq >= 0:
+                self.frames_dropped += seq - after_seq - 1
+            self.frames_delivered += 1
+            self.last_read_seq = seq
+            return seq, self.ring[slot], self.slot_time[slot]
+    
+    def release(self, seq):
+        """Return the buffer holding frame seq to the capture thread."""
+        with self.frame_ready:
+            for slot in range(self.buffer_size):
+                if self.slot_seq[slot] == seq and self.slot_holds[slot] > 0:
+                    self.slot_holds[slot] -= 1
+                    self.frame_ready.notify_all()
+                    return
     
     def read(self):
-        """Get the latest frame from camera."""
+        """Get a copy of the latest frame from camera."""
         with self.lock:
-            if self.frame is None:
+            if self.latest_slot < 0:
                 return None
-            return self.frame.copy()
+            if self.latest_seq == self.last_read_seq:
+                self.frames_duplicated += 1
+            self.last_read_seq = self.latest_seq
+            return self.ring[self.latest_slot].copy()
+    
+    def get_stats(self):
+        """Return capture/delivery counters."""
+        with self.lock:
+            return {
+                'captured': self.frames_captured,
+                'delivered': self.frames_delivered,
+                'dropped': self.frames_dropped,
+                'duplicated': self.frames_duplicated,
+                'latest_seq': self.latest_seq,
+            }
     
     def get_dimensions(self):
         """Return camera frame dimensions."""
@@ -60,15 +185,19 @@ class CameraFeed:
     
     def stop(self):
         """Stop the camera feed and release resources."""
-        self.running = False
+        with self.frame_ready:
+            self.running = False
+            self.frame_ready.notify_all()
         if self.thread:
             self.thread.join(timeout=1.0)
-        if self.cap:
-            self.cap.release()
-        print("Camera stopped")
+        if self.source:
+            self.source.release()
+        stats = self.get_stats()
+        print(f"Camera stopped (captured {stats['captured']}, dropped {stats['dropped']}, "
+              f"duplicated {stats['duplicated']})")
     
     def is_running(self):
         """Check if camera is running."""
-        return self.running and self.cap is not None and self.cap.isOpened()
+        return self.running and self.source is not None and self.source.is_opened()
 
 
@@ -0,0 +1,162 @@
+import numpy as np
+
+
+class EditJournal:
+    """
+    Undo/redo history for a GridWorld.
+    
+    Every world change is recorded as one operation: the changed cells and
+    their old/new palette indices, appended to contiguous arrays. Undo and
+    redo replay those deltas, so their cost follows the size of the edit,
+    not the size of the world, and the journal never copies the world.
+    History is bounded: once it holds more than max_ops operations or
+    max_cells changed cells, the oldest operations are evicted.
+    """
+    
+    def __init__(self, world, max_ops=10000, max_cells=4000000):
+        """
+        Attach a journal to a world.
+        
+        Args:
+            world: GridWorld to record
+            max_ops: Maximum number of operations kept
+            max_cells: Maximum number of changed cells kept across all operations
+        """
+        self.world = world
+        self.max_ops = max_ops
+        self.max_cells = max_cells
+        
+        # Append-only delta arrays, grown by doubling
+        capacity = 1024
+        self.coords = np.zeros((capacity, 3), dtype=np.int32)
+        self.old = np.zeros(capacity, dtype=np.uint8)
+        self.new = np.zeros(capacity, dtype=np.uint8)
+        self.used = 0
+        
+        self.offsets = []      # start of each operation in the delta arrays
+        self.base_op = 0       # global number of the oldest kept operation
+        self.position = 0      # global number of operations currently applied
+        self.replaying = False
+        
+        world.add_listener(self._record)
+    
+    def _record(self, coords, old, new):
+        """World listener: append one operation."""
+        if self.replaying or len(coords) == 0:
+            return
+        
+        # A new edit discards the redo tail
+        self._truncate(self.position)
+        
+        n = len(coords)
+        self._reserve(self.used + n)
+        self.offsets.append(self.used)
+        self.coords[self.used:self.used + n] = coords
+        self.old[self.used:self.used + n] = old
+        self.new[self.used:self.used + n] = new
+        self.used += n
+        self.position += 1
+        self._evict()
+    
+    def _reserve(self, size):
+        """Grow the delta arrays to hold at least size cells."""
+        capacity = len(self.old)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ('coords', 'old', 'new'):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self.used] = array[:self.used]
+            setattr(self, name, grown)
+    
+    def _truncate(self, op):
+        """Drop operations from global number op onwards."""
+        count = op - self.base_op
+        if count >= len(self.offsets):
+            return
+        self.used = self.offsets[count]
+        del self.offsets[count:]
+    
+    def _evict(self):
+        """Drop the oldest operations while the history is over its bounds."""
+        if len(self.offsets) <= self.max_ops and self.used <= self.max_cells:
+            return
+        
+        # Evict a quarter at a time so the array shift is amortized
+        keep_ops = min(len(self.offsets), self.max_ops) * 3 // 4
+        drop = len(self.offsets) - keep_ops
+        while drop < len(self.offsets) and self.used - self.offsets[drop] > self.max_cells * 3 // 4:
+            drop += 1
+        drop = min(drop, self.position - self.base_op)
+        if drop <= 0:
+            return
+        
+        cut = self.offsets[drop] if drop < len(self.offsets) else self.used
+        remaining = self.used - cut
+        for array in (self.coords, self.old, self.new):
+            array[:remaining] = array[cut:self.used]
+        self.used = remaining
+        self.offsets = [offset - cut for offset in self.offsets[drop:]]
+        self.base_op += drop
+    
+    def _op_range(self, op):
+        """Delta array slice of global operation op."""
+        index = op - self.base_op
+        start = self.offsets[index]
+        stop = self.offsets[index + 1] if index + 1 < len(self.offsets) else self.used
+        return slice(start, stop)
+    
+    def _apply(self, coords, indices):
+        """Write cells through the world without recording them."""
+        self.replaying = True
+        try:
+            self.world._apply_cells(coords, indices)
+        finally:
+            self.replaying = False
+    
+    def can_undo(self):
+        """Check if there is an operation to undo."""
+        return self.position > self.base_op
+    
+    def can_redo(self):
+        """Check if there is an undone operation to redo."""
+        return self.position < self.base_op + len(self.offsets)
+    
+    def undo(self):
+        """
+        Revert the last operation.
+        
+        Returns:
+            True if an operation was undone
+        """
+        if not self.can_undo():
+            return False
+        self.position -= 1
+        cells = self._op_range(self.position)
+        self._apply(self.coords[cells], self.old[cells])
+        return True
+    
+    def redo(self):
+        """
+        Re-apply the next undone operation.
+        
+        Returns:
+            True if an operation was redone
+        """
+        if not self.can_redo():
+            return False
+        cells = self._op_range(self.position)
+        self._apply(self.coords[cells], self.new[cells])
+        self.position += 1
+        return True
+    
+    def get_stats(self):
+        """History size, for the UI and for tuning the bounds."""
+        return {
+            'ops': len(self.offsets),
+            'position': self.position - self.base_op,
+            'cells': self.used,
+            'bytes': self.used * 14,
+        }
@@ -0,0 +1,270 @@
+import numpy as np
+
+from voxel_storage import EMPTY
+
+# Outward normal of each cube face: +x, -x, +y, -y, +z, -z
+FACE_NORMALS = np.array([[1, 0, 0], [-1, 0, 0],
+                         [0, 1, 0], [0, -1, 0],
+                         [0, 0, 1], [0, 0, -1]], dtype=np.int64)
+
+# Direction of the neighbour's face that touches face d
+OPPOSITE = np.array([1, 0, 3, 2, 5, 4], dtype=np.intp)
+
+# Corners of each face as offsets from the cell's lower corner, in outline order
+FACE_CORNERS = np.array([
+    [[1, 0, 0], [1, 1, 0], [1, 1, 1], [1, 0, 1]],
+    [[0, 0, 0], [0, 0, 1], [0, 1, 1], [0, 1, 0]],
+    [[0, 1, 0], [0, 1, 1], [1, 1, 1], [1, 1, 0]],
+    [[0, 0, 0], [1, 0, 0], [1, 0, 1], [0, 0, 1]],
+    [[0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]],
+    [[0, 0, 0], [0, 1, 0], [1, 1, 0], [1, 0, 0]],
+], dtype=np.float64)
+
+# Change sets larger than this (in cells) rebuild the index instead of patching it
+REBUILD_CELLS = 4096
+
+
+class FaceIndex:
+    """
+    Exposed block faces of a GridWorld, kept up to date as the world changes.
+
+    A face is exposed when its block's neighbour in that direction is empty
+    or outside the world. Faces live in compact arrays (swap-remove on
+    deletion) with a dict from packed (cell, direction) key to slot, so a
+    single block edit only re-evaluates the faces of that cell and of its
+    six neighbours, and reading all faces costs O(exposed faces).
+    """
+
+    def __init__(self, world):
+        """
+        Build the index for a world and attach it as a listener.
+
+        Args:
+            world: GridWorld to index
+        """
+        self.world = world
+        self.size = world.grid_size
+
+        capacity = 1024
+        self.cells = np.zeros((capacity, 3), dtype=np.int32)
+        self.directions = np.zeros(capacity, dtype=np.uint8)
+        self.colors = np.zeros(capacity, dtype=np.uint8)
+        self.keys = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+        self.slots = {}  # face key -> slot in the arrays
+
+        self.rebuild()
+        world.add_listener(self._on_change)
+
+    def _face_keys(self, cells, directions):
+        """Pack (cell, direction) pairs into int64 keys."""
+        cells = np.asarray(cells, dtype=np.int64)
+        size = self.size
+        return ((cells[:, 0] * size + cells[:, 1]) * size + cells[:, 2]) * 6 + directions
+
+    def _occupied(self, cells):
+        """Occupancy of cells, with cells outside the world counting as empty."""
+        inside = np.all((cells >= 0) & (cells < self.size), axis=1)
+        occupied = np.zeros(len(cells), dtype=bool)
+        occupied[inside] = self.world.blocks.values_at(cells[inside]) != EMPTY
+        return occupied
+
+    def rebuild(self):
+        """Recompute every exposed face from the world, in one vectorized pass."""
+        coords, indices = self.world.get_block_arrays()
+        cells, directions, colors = [], [], []
+        for direction, normal in enumerate(FACE_NORMALS):
+            exposed = ~self._occupied(coords + normal)
+            cells.append(coords[exposed])
+            directions.append(np.full(int(exposed.sum()), direction, dtype=np.uint8))
+            colors.append(indices[exposed])
+
+        self.count = 0
+        self._reserve(sum(len(c) for c in cells))
+        self._append(np.concatenate(cells), np.concatenate(directions), np.concatenate(colors))
+        self.slots = dict(zip(self.keys[:self.count].tolist(), range(self.count)))
+
+    def _reserve(self, size):
+        """Grow the face arrays to hold at least size faces."""
+        capacity = len(self.keys)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ('cells', 'directions', 'colors', 'keys'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def _append(self, cells, directions, colors):
+        """Add faces at the end of the arrays (slots are not registered)."""
+        n = len(cells)
+        end = self.count + n
+        self._reserve(end)
+        self.cells[self.count:end] = cells
+        self.directions[self.count:end] = directions
+        self.colors[self.count:end] = colors
+        self.keys[self.count:end] = self._face_keys(cells, directions)
+        self.count = end
+
+    def _remove(self, slots):
+        """Remove faces by slot, filling the holes from the end of the arrays."""
+        slots = np.asarray(slots, dtype=np.intp)
+        for key in self.keys[slots].tolist():
+            del self.slots[key]
+
+        kept = self.count - len(slots)
+        holes = np.sort(slots[slots < kept])
+        tail = np.arange(kept, self.count)
+        movers = tail[~np.isin(tail, slots)]
+        for array in (self.cells, self.directions, self.colors, self.keys):
+            array[holes] = array[movers]
+        self.slots.update(zip(self.keys[holes].tolist(), holes.tolist()))
+        self.count = kept
+
+    def _on_change(self, coords, old, new):
+        """World listener: re-evaluate the faces around changed cells."""
+        if len(coords) == 0:
+            return
+        if len(coords) > REBUILD_CELLS:
+            self.rebuild()
+            return
+
+        # Faces of the changed cells, and the neighbour faces touching them
+        n = len(coords)
+        directions = np.tile(np.arange(6), n)
+        own = np.repeat(coords, 6, axis=0)
+        neighbours = own + FACE_NORMALS[directions]
+        cells = np.concatenate([own, neighbours])
+        directions = np.concatenate([directions, OPPOSITE[directions]])
+        inside = np.all((cells >= 0) & (cells < self.size), axis=1)
+        cells, directions = cells[inside], directions[inside]
+        keys, first = np.unique(self._face_keys(cells, directions), return_index=True)
+        cells, directions = cells[first], directions[first]
+
+        values = self.world.blocks.values_at(cells)
+        exposed = (values != EMPTY) & ~self._occupied(cells + FACE_NORMALS[directions])
+
+        get = self.slots.get
+        slots = np.array([get(key, -1) for key in keys.tolist()], dtype=np.intp)
+        present = slots >= 0
+
+        # Recolor faces that stay, drop faces that got covered, add new ones
+        stay = present & exposed
+        self.colors[slots[stay]] = values[stay]
+        if (present & ~exposed).any():
+            self._remove(slots[present & ~exposed])
+        added = exposed & ~present
+        if added.any():
+            start = self.count
+            self._append(cells[added], directions[added], values[added])
+            self.slots.update(zip(keys[added].tolist(), range(start, self.count)))
+
+    def get_faces(self):
+        """
+        Copy of every exposed face.
+
+        Returns:
+            ((F, 3) intp cells, (F,) face directions (index into
+            FACE_NORMALS), (F,) uint8 palette indices)
+        """
+        return (self.cells[:self.count].astype(np.intp),
+                self.directions[:self.count].astype(np.intp),
+                self.colors[:self.count].copy())
+
+    def __len__(self):
+        return self.count
+
+    def get_mesh(self, greedy=False):
+        """
+        Build a quad mesh of the exposed faces.
+
+        Args:
+            greedy: Merge coplanar, adjacent faces of the same color into
+                    larger rectangles (runs along one in-plane axis first,
+                    then equal runs along the other)
+
+        Returns:
+            (vertices, quads, directions, colors): (4Q, 3) float32 corner
+            positions in grid units, (Q, 4) int32 vertex indices wound
+            counter-clockwise seen from outside, (Q,) uint8 face directions
+            and (Q,) uint8 palette indices
+        """
+        cells = self.cells[:self.count].astype(np.int64)
+        directions = self.directions[:self.count].astype(np.int64)
+        colors = self.colors[:self.count]
+
+        # Plane of each face, and its two in-plane axes (u, v) = (a + 1, a + 2) mod 3
+        axis = directions // 2
+        positive = directions % 2 == 0
+        rows = np.arange(len(cells))
+        plane = cells[rows, axis] + positive
+        u = cells[rows, (axis + 1) % 3]
+        v = cells[rows, (axis + 2) % 3]
+        u1, v1 = u + 1, v + 1
+
+        if greedy and len(cells):
+            u, u1, v, v1, directions, plane, colors = _merge_faces(u, v, directions, plane, colors)
+            axis = directions // 2
+            positive = directions % 2 == 0
+
+        # Corners in the plane: (u0, v0), (u1, v0), (u1, v1), (u0, v1),
+        # reversed for faces pointing down their axis
+        count = len(u)
+        corner_u = np.stack([u, u1, u1, u], axis=1)
+        corner_v = np.stack([v, v, v1, v1], axis=1)
+        reverse = ~positive
+        corner_u[reverse] = corner_u[reverse][:, ::-1]
+        corner_v[reverse] = corner_v[reverse][:, ::-1]
+
+        # Scatter (plane, u, v) back to (x, y, z)
+        local = (np.broadcast_to(plane[:, None], (count, 4)), corner_u, corner_v)
+        vertices = np.zeros((count, 4, 3), dtype=np.float32)
+        rows = np.arange(count)[:, None]
+        corners = np.arange(4)[None, :]
+        for k in range(3):
+            vertices[rows, corners, ((axis + k) % 3)[:, None]] = local[k]
+        quads = np.arange(4 * count, dtype=np.int32).reshape(count, 4)
+        return vertices.reshape(-1, 3), quads, directions.astype(np.uint8), np.asarray(colors, dtype=np.uint8)
+
+
+def _runs(sorted_keys, contiguous):
+    """Start index of each run: a new run starts where the key changes or contiguity breaks."""
+    breaks = np.ones(len(sorted_keys), dtype=bool)
+    breaks[1:] = (np.diff(sorted_keys) != 0) | ~contiguous
+    return np.flatnonzero(breaks)
+
+
+def _merge_faces(u, v, directions, plane, colors):
+    """
+    Merge unit faces into rectangles, vectorized.
+
+    Faces sharing a direction, plane, row v and color are first joined into
+    runs of consecutive u; runs with the same extent are then stacked along
+    consecutive v.
+
+    Returns:
+        (u0, u1, v0, v1, directions, plane, colors) of the rectangles, with
+        u1 and v1 exclusive
+    """
+    colors = np.asarray(colors, dtype=np.int64)
+
+    # Runs along u
+    order = np.lexsort((u, colors, v, plane, directions))
+    u, v, directions, plane, colors = u[order], v[order], directions[order], plane[order], colors[order]
+    group = (((directions * 4096 + plane) * 4096 + v) * 256) + colors
+    starts = _runs(group, np.diff(u) == 1)
+    ends = np.append(starts[1:], len(u))
+    u0, u1 = u[starts], u[ends - 1] + 1
+    v, directions, plane, colors = v[starts], directions[starts], plane[starts], colors[starts]
+
+    # Stack equal runs along v
+    order = np.lexsort((v, colors, u1, u0, plane, directions))
+    u0, u1, v, directions, plane, colors = (u0[order], u1[order], v[order],
+                                            directions[order], plane[order], colors[order])
+    group = ((((directions * 4096 + plane) * 4096 + u0) * 4096 + u1) * 256) + colors
+    starts = _runs(group, np.diff(v) == 1)
+    ends = np.append(starts[1:], len(v))
+    return (u0[starts], u1[starts], v[starts], v[ends - 1] + 1,
+            directions[starts], plane[starts], colors[starts])
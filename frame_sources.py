@@ -0,0 +1,328 @@
+import os
+import time
+import cv2
+import numpy as np
+
+
+class FrameSource:
+    """
+    Base class for anything CameraFeed can pull frames from.
+    Mirrors the cv2.VideoCapture read() contract so sources are interchangeable.
+    """
+    
+    def __init__(self, fps=30.0, paced=True, loop=False):
+        """
+        Initialize common source settings.
+        
+        Args:
+            fps: Nominal frames per second of the source
+            paced: Deliver frames in real time at the source FPS when True,
+                   as fast as possible when False
+            loop: Restart from the beginning when a finite source runs out
+        """
+        self.fps = fps
+        self.paced = paced
+        self.loop = loop
+        self.width = 0
+        self.height = 0
+        self.exhausted = False
+        self._next_due = None
+    
+    def open(self):
+        """Open the underlying device or file. Returns True on success."""
+        raise NotImplementedError
+    
+    def read(self, image=None):
+        """
+        Read the next frame.
+        
+        Args:
+            image: Optional preallocated BGR buffer to decode into
+        
+        Returns:
+            (ok, frame) tuple, same as cv2.VideoCapture.read()
+        """
+        self._pace()
+        return self._grab(image)
+    
+    def _grab(self, image):
+        """Produce the next frame without pacing."""
+        raise NotImplementedError
+    
+    def _pace(self):
+        """Sleep until the next frame is due when running in paced mode."""
+        if not self.paced or not self.fps:
+            return
+        now = time.perf_counter()
+        if self._next_due is None or now - self._next_due > 1.0:
+            # First frame, or we fell far behind: resynchronise instead of bursting
+            self._next_due = now
+        delay = self._next_due - now
+        if delay > 0:
+            time.sleep(delay)
+        self._next_due += 1.0 / self.fps
+    
+    def is_opened(self):
+        """Check if the source can still deliver frames."""
+        return not self.exhausted
+    
+    def release(self):
+        """Release any resources held by the source."""
+        pass
+    
+    def _store(self, frame, image):
+        """Copy frame into image when a matching buffer was supplied."""
+        if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+            np.copyto(image, frame)
+            return image
+        return frame
+
+
+class WebcamSource(FrameSource):
+    """Live webcam capture through cv2.VideoCapture."""
+    
+    def __init__(self, camera_id=0, width=1280, height=720, paced=True):
+        """
+        Initialize webcam source.
+        
+        Args:
+            camera_id: Webcam device ID
+            width: Requested frame width in pixels
+            height: Requested frame height in pixels
+            paced: Ignored in practice, the device itself delivers at its own rate
+        """
+        super().__init__(fps=0, paced=paced)
+        self.camera_id = camera_id
+        self.width = width
+        self.height = height
+        self.cap = None
+    
+    def open(self):
+        self.cap = cv2.VideoCapture(self.camera_id)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if not self.cap.isOpened():
+            return False
+        
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or self.width
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or self.height
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return True
+    
+    def read(self, image=None):
+        # The driver already blocks until the next frame, no extra pacing needed
+        return self._grab(image)
+    
+    def _grab(self, image):
+        if image is not None:
+            return self.cap.read(image=image)
+        return self.cap.read()
+    
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+    
+    def release(self):
+        if self.cap:
+            self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file on disk."""
+    
+    def __init__(self, path, paced=True, loop=False):
+        """
+        Initialize video file source.
+        
+        Args:
+            path: Path to the video file
+            paced: Play back at the file's FPS when True
+            loop: Rewind to the first frame at end of file
+        """
+        super().__init__(paced=paced, loop=loop)
+        self.path = path
+        self.cap = None
+    
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            return False
+        
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return True
+    
+    def _grab(self, image):
+        ret, frame = self.cap.read(image=image) if image is not None else self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(image=image) if image is not None else self.cap.read()
+        if not ret:
+            self.exhausted = True
+        return ret, frame
+    
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened() and not self.exhausted
+    
+    def release(self):
+        if self.cap:
+            self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Frames loaded from a directory of still images, in filename order."""
+    
+    EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+    
+    def __init__(self, directory, fps=30.0, paced=True, loop=True, preload=True):
+        """
+        Initialize image directory source.
+        
+        Args:
+            directory: Folder containing the images
+            fps: Rate at which images are delivered in paced mode
+            paced: Deliver images in real time at fps when True
+            loop: Start over after the last image
+            preload: Decode every image up front so reads cost no disk I/O
+        """
+        super().__init__(fps=fps, paced=paced, loop=loop)
+        self.directory = directory
+        self.preload = preload
+        self.paths = []
+        self.images = []
+        self.index = 0
+    
+    def open(self):
+        if not os.path.isdir(self.directory):
+            return False
+        
+        self.paths = sorted(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.lower().endswith(self.EXTENSIONS)
+        )
+        if not self.paths:
+            return False
+        
+        if self.preload:
+            self.images = [cv2.imread(path) for path in self.paths]
+            first = self.images[0]
+        else:
+            first = cv2.imread(self.paths[0])
+        if first is None:
+            return False
+        
+        self.height, self.width = first.shape[:2]
+        return True
+    
+    def _grab(self, image):
+        if self.index >= len(self.paths):
+            if not self.loop:
+                self.exhausted = True
+                return False, None
+            self.index = 0
+        
+        if self.preload:
+            frame = self.images[self.index]
+        else:
+            frame = cv2.imread(self.paths[self.index])
+        self.index += 1
+        
+        if frame is None:
+            return False, None
+        stored = self._store(frame, image)
+        if self.preload and stored is frame:
+            # Preloaded images are shared, hand out a private copy
+            stored = frame.copy()
+        return True, stored
+
+
+class SyntheticSource(FrameSource):
+    """
+    Procedurally generated frames for hardware-free runs.
+    Draws a moving skin-toned blob over a gradient background.
+    """
+    
+    def __init__(self, width=1280, height=720, fps=30.0, paced=True, num_frames=None):
+        """
+        Initialize synthetic source.
+        
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            fps: Rate at which frames are delivered in paced mode
+            paced: Deliver frames in real time at fps when True
+            num_frames: Stop after this many frames (None for endless)
+        """
+        super().__init__(fps=fps, paced=paced)
+        self.width = width
+        self.height = height
+        self.num_frames = num_frames
+        self.frame_index = 0
+        self.background = None
+    
+    def open(self):
+        # Prebuild the static gradient once, each frame only adds the blob
+        ramp_x = np.linspace(20, 90, self.width, dtype=np.float32)
+        ramp_y = np.linspace(10, 60, self.height, dtype=np.float32)
+        self.background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.background[:, :, 0] = ramp_y[:, None] + ramp_x[None, :] * 0.5
+        self.background[:, :, 1] = ramp_y[:, None]
+        self.background[:, :, 2] = ramp_x[None, :]
+        return True
+    
+    def _grab(self, image):
+        if self.num_frames is not None and self.frame_index >= self.num_frames:
+            self.exhausted = True
+            return False, None
+        
+        frame = self._store(self.background, image)
+        if frame is self.background:
+            frame = self.background.copy()
+        
+        t = self.frame_index / (self.fps or 30.0)
+        cx = int(self.width * (0.5 + 0.3 * np.sin(t * 1.3)))
+        cy = int(self.height * (0.5 + 0.25 * np.cos(t * 0.9)))
+        radius = max(8, self.height // 8)
+        cv2.circle(frame, (cx, cy), radius, (120, 160, 220), -1)
+        cv2.putText(frame, f"#{self.frame_index}", (20, self.height - 20),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        
+        self.frame_index += 1
+        return True, frame
+
+
+def create_source(spec, width=1280, height=720, paced=True, loop=None, fps=None):
+    """
+    Build a frame source from a short text spec.
+    
+    Args:
+        spec: "webcam[:id]", "video:<path>", "images:<dir>" or "synthetic[:frames]"
+        width, height: Requested size for webcam and synthetic sources
+        paced: Real-time delivery when True, as fast as possible when False
+        loop: Restart finite sources when they run out (None keeps the
+              source's own default: videos stop, image folders loop)
+        fps: Delivery rate of image and synthetic sources (None keeps the
+             source's default)
+    
+    Returns:
+        FrameSource instance (not yet opened)
+    """
+    kind, _, arg = spec.partition(':')
+    kind = kind.lower()
+    options = {'paced': paced}
+    if loop is not None:
+        options['loop'] = loop
+    rate = {} if fps is None else {'fps': fps}
+    
+    if kind == 'webcam':
+        return WebcamSource(int(arg) if arg else 0, width, height, paced=paced)
+    if kind == 'video':
+        return VideoFileSource(arg, **options)
+    if kind == 'images':
+        return ImageDirectorySource(arg, **options, **rate)
+    if kind == 'synthetic':
+        num_frames = int(arg) if arg else None
+        return SyntheticSource(width, height, paced=paced, num_frames=num_frames, **rate)
+    
+    raise ValueError(f"Unknown frame source: {spec}")
@@ -0,0 +1,327 @@
+"""
+Pluggable per-hand gesture classifiers.
+
+Every classifier maps a batch of landmark features (see landmark_features)
+to gesture codes (index into hand_tracking.GESTURES) and a confidence in
+[0, 1] that the GestureEngine uses to weight its debouncing:
+
+    codes, confidence = classifier.predict(landmark_features(hands, handedness))
+
+RuleClassifier works out of the box. KNNClassifier and MLPClassifier are
+trained offline from recorded landmark traces (see train_gestures.py) and
+saved as .npz files that load_classifier() reads back.
+"""
+import numpy as np
+
+# Landmark indices
+NUM_LANDMARKS = 21
+WRIST = 0
+THUMB_MCP = 2
+THUMB_TIP = 4
+MIDDLE_MCP = 9
+
+# Thumb then index, middle, ring and pinky: tips and the joint below them
+THUMB_TIP_AND_FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+THUMB_IP_AND_FINGER_PIPS = np.array([3, 6, 10, 14, 18])
+
+NUM_GESTURES = 6  # len(hand_tracking.GESTURES), code 0 is "no gesture"
+NUM_FEATURES = (NUM_LANDMARKS - 1) * 2
+
+# Gesture code by number of extended fingers (thumb included)
+FINGER_COUNT_GESTURES = np.array([3, 2, 4, 0, 0, 1], dtype=np.intp)
+
+
+def landmark_features(hands, handedness=None):
+    """
+    Wrist-relative, scale-normalized 2D landmark features, for all hands at once.
+
+    Landmarks are moved so the wrist sits at the origin, divided by the
+    palm length (wrist to middle-finger MCP) and mirrored in x for left
+    hands, so one model serves both hands at any distance from the camera.
+    Image orientation is kept, thumbs-up and thumbs-sideways differ.
+
+    Args:
+        hands: (n, 21, 2+) landmark array in pixels
+        handedness: Optional sequence of n 'Left'/'Right' labels
+
+    Returns:
+        (n, 40) float32 array (x, y of landmarks 1-20)
+    """
+    xy = np.asarray(hands, dtype=np.float32)[:, :, :2]
+    xy = xy - xy[:, WRIST:WRIST + 1]
+    palm = np.linalg.norm(xy[:, MIDDLE_MCP], axis=1)
+    xy = xy / np.maximum(palm, 1e-6)[:, None, None]
+    if handedness is not None:
+        left = np.array([label == 'Left' for label in handedness], dtype=bool)
+        xy[left, :, 0] *= -1
+    return xy[:, 1:].reshape(len(xy), NUM_FEATURES)
+
+
+def _points(features):
+    """(n, 21, 2) landmark positions back from features (wrist at the origin)."""
+    points = np.zeros((len(features), NUM_LANDMARKS, 2), dtype=np.float32)
+    points[:, 1:] = features.reshape(len(features), NUM_LANDMARKS - 1, 2)
+    return points
+
+
+class RuleClassifier:
+    """
+    Hand-written finger-counting rules on normalized features.
+
+    A finger is extended when its tip is farther from the wrist than its
+    PIP joint; the thumb when its tip is farther from the palm center than
+    its IP joint. Both tests hold for either hand at any palm rotation.
+    Thumbs-up is tested before the finger counts so it is reachable.
+    Confidence is how clearly the fingers are bent or extended on average,
+    so one borderline finger (a tucked thumb) does not sink the whole hand.
+    """
+
+    def __init__(self, margin=0.15, thumb_up_ratio=0.5):
+        """
+        Initialize the rules.
+
+        Args:
+            margin: Relative length difference at which a finger counts as
+                    clearly bent or extended (confidence 1)
+            thumb_up_ratio: Height of the thumb tip above its MCP joint, in
+                            palm lengths, for a thumbs-up
+        """
+        self.margin = margin
+        self.thumb_up_ratio = thumb_up_ratio
+
+    def predict(self, features):
+        """
+        Classify a batch of hands.
+
+        Args:
+            features: (n, 40) array from landmark_features
+
+        Returns:
+            ((n,) intp gesture codes, (n,) float32 confidences)
+        """
+        points = _points(features)
+
+        # Extension ratios: fingers against the wrist, thumb against the palm center
+        tips = points[:, THUMB_TIP_AND_FINGER_TIPS]
+        joints = points[:, THUMB_IP_AND_FINGER_PIPS]
+        tips[:, 0] -= points[:, MIDDLE_MCP]
+        joints[:, 0] -= points[:, MIDDLE_MCP]
+        ratios = np.sqrt((tips ** 2).sum(axis=2) / np.maximum((joints ** 2).sum(axis=2), 1e-12))
+
+        extended = ratios > 1.0
+        codes = FINGER_COUNT_GESTURES[extended.sum(axis=1)]
+
+        # Thumbs-up: thumb pointing up in the image, every other finger folded
+        thumb_rise = points[:, THUMB_MCP, 1] - points[:, THUMB_TIP, 1]
+        thumb_up = extended[:, 0] & ~extended[:, 1:].any(axis=1) & (thumb_rise > self.thumb_up_ratio)
+        codes[thumb_up] = 5
+
+        confidence = np.minimum(np.abs(ratios - 1.0) / self.margin, 1.0).mean(axis=1)
+        return codes, confidence.astype(np.float32)
+
+
+class KNNClassifier:
+    """
+    k-nearest-neighbour vote over recorded feature vectors.
+    Confidence is the share of the k neighbours that agree.
+    """
+
+    def __init__(self, k=5, features=None, labels=None):
+        """
+        Initialize the classifier.
+
+        Args:
+            k: Number of neighbours that vote
+            features: (N, 40) training features (see fit)
+            labels: (N,) training gesture codes
+        """
+        self.k = k
+        self.features = None
+        self.labels = None
+        self.norms = None
+        self.features_t = None
+        if features is not None:
+            self.fit(features, labels)
+
+    def fit(self, features, labels):
+        """Remember the training set."""
+        self.features = np.asarray(features, dtype=np.float32)
+        self.labels = np.asarray(labels, dtype=np.intp)
+        self.norms = (self.features ** 2).sum(axis=1)
+        self.features_t = np.ascontiguousarray(self.features.T)  # fast layout for the matmul
+        return self
+
+    def predict(self, features):
+        """
+        Classify a batch of hands with one distance matrix.
+
+        Returns:
+            ((n,) intp gesture codes, (n,) float32 confidences)
+        """
+        if self.labels is None:
+            raise ValueError("KNNClassifier has no training samples, call fit() first")
+        features = np.asarray(features, dtype=np.float32)
+        n = len(features)
+        k = min(self.k, len(self.labels))
+        if n == 0 or k == 0:
+            return np.zeros(n, dtype=np.intp), np.zeros(n, dtype=np.float32)
+
+        # Squared distances without building an (n, N, 40) difference array
+        # (the query's own norm is the same for every neighbour and left out)
+        distances = self.norms - 2 * (features @ self.features_t)
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+
+        # Votes per gesture, counted with one bincount over offset labels
+        offsets = np.arange(n)[:, None] * NUM_GESTURES
+        votes = np.bincount((self.labels[nearest] + offsets).ravel(),
+                            minlength=n * NUM_GESTURES).reshape(n, NUM_GESTURES)
+        codes = votes.argmax(axis=1)
+        return codes, (votes[np.arange(n), codes] / k).astype(np.float32)
+
+    def save(self, path):
+        """Write the classifier to an .npz file."""
+        np.savez_compressed(path, kind='knn', k=self.k, features=self.features, labels=self.labels)
+
+
+class MLPClassifier:
+    """
+    One-hidden-layer perceptron with a softmax output.
+    Confidence is the probability of the predicted gesture.
+    """
+
+    def __init__(self, hidden=32, seed=0):
+        """
+        Initialize the classifier with random weights.
+
+        Args:
+            hidden: Hidden layer width
+            seed: Random seed of the initial weights
+        """
+        rng = np.random.default_rng(seed)
+        self.w1 = (rng.standard_normal((NUM_FEATURES, hidden)) / np.sqrt(NUM_FEATURES)).astype(np.float32)
+        self.b1 = np.zeros(hidden, dtype=np.float32)
+        self.w2 = (rng.standard_normal((hidden, NUM_GESTURES)) / np.sqrt(hidden)).astype(np.float32)
+        self.b2 = np.zeros(NUM_GESTURES, dtype=np.float32)
+
+    def _forward(self, features):
+        """Hidden activations and output probabilities."""
+        hidden = np.tanh(features @ self.w1 + self.b1)
+        logits = hidden @ self.w2 + self.b2
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return hidden, probabilities
+
+    def fit(self, features, labels, epochs=500, learning_rate=0.01, weight_decay=1e-4):
+        """
+        Train with full-batch Adam on the cross-entropy loss.
+
+        Args:
+            features: (N, 40) training features
+            labels: (N,) training gesture codes
+            epochs: Gradient steps
+            learning_rate: Adam step size
+            weight_decay: L2 penalty on the weights
+
+        Returns:
+            self
+        """
+        features = np.asarray(features, dtype=np.float32)
+        targets = np.eye(NUM_GESTURES, dtype=np.float32)[np.asarray(labels, dtype=np.intp)]
+        params = [self.w1, self.b1, self.w2, self.b2]
+        moments = [np.zeros_like(p) for p in params]
+        squares = [np.zeros_like(p) for p in params]
+        beta1, beta2 = 0.9, 0.999
+
+        for step in range(1, epochs + 1):
+            hidden, probabilities = self._forward(features)
+            d_logits = (probabilities - targets) / len(features)
+            d_hidden = (d_logits @ self.w2.T) * (1 - hidden ** 2)
+            grads = [features.T @ d_hidden + weight_decay * self.w1, d_hidden.sum(axis=0),
+                     hidden.T @ d_logits + weight_decay * self.w2, d_logits.sum(axis=0)]
+
+            for param, grad, moment, square in zip(params, grads, moments, squares):
+                moment *= beta1
+                moment += (1 - beta1) * grad
+                square *= beta2
+                square += (1 - beta2) * grad ** 2
+                corrected = moment / (1 - beta1 ** step)
+                param -= learning_rate * corrected / (np.sqrt(square / (1 - beta2 ** step)) + 1e-8)
+        return self
+
+    def predict(self, features):
+        """
+        Classify a batch of hands with two small matrix multiplies.
+
+        Returns:
+            ((n,) intp gesture codes, (n,) float32 confidences)
+        """
+        _, probabilities = self._forward(np.asarray(features, dtype=np.float32))
+        codes = probabilities.argmax(axis=1)
+        return codes, probabilities[np.arange(len(codes)), codes]
+
+    def save(self, path):
+        """Write the classifier to an .npz file."""
+        np.savez_compressed(path, kind='mlp', w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2)
+
+
+def load_classifier(path):
+    """
+    Load a classifier saved by KNNClassifier.save or MLPClassifier.save.
+
+    Returns:
+        KNNClassifier or MLPClassifier
+    """
+    with np.load(path) as data:
+        kind = str(data['kind'])
+        if kind == 'knn':
+            return KNNClassifier(int(data['k']), data['features'], data['labels'])
+        if kind == 'mlp':
+            classifier = MLPClassifier(hidden=data['w1'].shape[1])
+            classifier.w1, classifier.b1 = data['w1'], data['b1']
+            classifier.w2, classifier.b2 = data['w2'], data['b2']
+            return classifier
+    raise ValueError(f"Unknown classifier kind: {kind}")
+
+
+class GestureRecorder:
+    """
+    Collects labelled landmark traces for offline training.
+
+    Every hand of every recorded frame becomes one sample. Traces are saved
+    as .npz files with landmarks (N, 21, 3), handedness (N,) and labels (N,)
+    gesture codes, which train_gestures.py consumes.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the recorder.
+
+        Args:
+            path: .npz file written by save()
+        """
+        self.path = path
+        self.label = None  # gesture code being recorded, None pauses recording
+        self.landmarks = []
+        self.handedness = []
+        self.labels = []
+
+    def add(self, state):
+        """Record the hands of one HandState under the current label."""
+        if self.label is None or state.num_hands == 0:
+            return
+        self.landmarks.append(np.array(state.landmarks, dtype=np.float32))
+        self.handedness.extend(state.handedness)
+        self.labels.extend([self.label] * state.num_hands)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def save(self):
+        """Write the trace file (nothing is written without samples)."""
+        if not self.labels:
+            return
+        np.savez_compressed(self.path, landmarks=np.concatenate(self.landmarks),
+                            handedness=np.array(self.handedness),
+                            labels=np.array(self.labels, dtype=np.intp))
+        print(f"Saved {len(self.labels)} gesture samples to {self.path}")
@@ -0,0 +1,258 @@
+from collections import deque
+
+import numpy as np
+
+
+class GestureRule:
+    """
+    Timing rules for one gesture, all durations in milliseconds.
+    Because they are measured on frame timestamps, gesture latency is the
+    same at 15 FPS and at 60 FPS.
+    """
+    
+    def __init__(self, enter_ms=100, exit_ms=150, enter_ratio=0.7,
+                 hold_ms=0, repeat_ms=None, cooldown_ms=0):
+        """
+        Initialize gesture timing.
+        
+        Args:
+            enter_ms: Window over which the raw gesture must dominate to become active
+            exit_ms: Time the raw gesture may be missing before the active one ends
+            enter_ratio: Share of samples in the enter window that must agree
+            hold_ms: Time the gesture must stay active before its action fires
+            repeat_ms: Re-fire interval while held (None fires once per activation)
+            cooldown_ms: Time after firing during which no other action fires
+        """
+        self.enter_ms = enter_ms
+        self.exit_ms = exit_ms
+        self.enter_ratio = enter_ratio
+        self.hold_ms = hold_ms
+        self.repeat_ms = repeat_ms
+        self.cooldown_ms = cooldown_ms
+
+
+# Cooldowns match the old 15/30 frame counters at 30 FPS
+DEFAULT_RULES = {
+    'place': GestureRule(hold_ms=100, cooldown_ms=500),
+    'delete': GestureRule(hold_ms=100, cooldown_ms=500),
+    'change_color': GestureRule(enter_ms=150, hold_ms=200, cooldown_ms=1000),
+}
+
+
+class GestureEngine:
+    """
+    Debounces raw per-frame gestures into stable, timed gesture actions.
+    
+    A raw gesture becomes active once it dominates the enter window, and
+    stays active until it has been missing for the exit window. This gives
+    hysteresis against frame-to-frame flicker. Actions fire after the
+    minimum hold and then at the repeat rate, if the gesture has one.
+    """
+    
+    def __init__(self, rules=None, default_rule=None, min_confidence=0.25):
+        """
+        Initialize the engine.
+        
+        Args:
+            rules: Dict of gesture name -> GestureRule (defaults to DEFAULT_RULES)
+            default_rule: Rule for gestures missing from rules
+            min_confidence: Classifier confidence below which a frame does not
+                            vote for its gesture
+        """
+        self.rules = dict(DEFAULT_RULES if rules is None else rules)
+        self.default_rule = default_rule or GestureRule()
+        self.min_confidence = min_confidence
+        self.window_ms = max([self.default_rule.enter_ms] +
+                             [rule.enter_ms for rule in self.rules.values()])
+        
+        self.history = deque()  # (timestamp, gesture, confidence)
+        self.active = None
+        self.active_since = 0.0
+        self.last_seen = 0.0
+        self.next_fire = None
+        self.blocked_until = 0.0
+    
+    def rule_for(self, gesture):
+        """Return the timing rule of a gesture."""
+        return self.rules.get(gesture, self.default_rule)
+    
+    def update(self, gesture, timestamp, confidence=1.0):
+        """
+        Feed the raw gesture of one frame.
+        
+        Args:
+            gesture: Raw gesture name (or None)
+            timestamp: Frame capture time in seconds
+            confidence: Classifier confidence of the raw gesture (0-1)
+        
+        Returns:
+            Name of the gesture whose action should run now, or None
+        """
+        now = timestamp
+        self.history.append((now, gesture, confidence))
+        horizon = now - self.window_ms / 1000.0
+        while len(self.history) > 1 and self.history[1][0] <= horizon:
+            self.history.popleft()
+        
+        # Active gesture ends once it has been missing for its exit window
+        if self.active is not None:
+            if gesture == self.active:
+                self.last_seen = now
+            elif now - self.last_seen >= self.rule_for(self.active).exit_ms / 1000.0:
+                self.active = None
+                self.next_fire = None
+        
+        # A new gesture enters once it dominates its enter window
+        if self.active is None and gesture is not None:
+            rule = self.rule_for(gesture)
+            if self._support(gesture, now, rule.enter_ms) >= rule.enter_ratio:
+                self.active = gesture
+                self.active_since = now
+                self.last_seen = now
+                self.next_fire = now + rule.hold_ms / 1000.0
+        
+        return self._fire(now)
+    
+    def _support(self, gesture, now, window_ms):
+        """
+        Share of samples in the window showing gesture with at least
+        min_confidence. Returns 0 until the window has been fully observed.
+        """
+        start = now - window_ms / 1000.0
+        if window_ms > 0 and self.history[0][0] > start:
+            return 0.0
+        
+        total = 0.0
+        agree = 0.0
+        for t, g, c in reversed(self.history):
+            if t < start:
+                break
+            total += 1.0
+            if g == gesture and c >= self.min_confidence:
+                agree += 1.0
+        return agree / total if total else 0.0
+    
+    def _fire(self, now):
+        """Return the active gesture if its action is due."""
+        if self.active is None or self.next_fire is None:
+            return None
+        if now < self.next_fire or now < self.blocked_until:
+            return None
+        
+        rule = self.rule_for(self.active)
+        self.next_fire = now + rule.repeat_ms / 1000.0 if rule.repeat_ms else None
+        self.blocked_until = now + rule.cooldown_ms / 1000.0
+        return self.active
+    
+    def get_active(self):
+        """Get the current debounced gesture."""
+        return self.active
+    
+    def reset(self):
+        """Forget all history (e.g. when tracking restarts)."""
+        self.history.clear()
+        self.active = None
+        self.next_fire = None
+
+
+# Landmark indices used by the two-hand gestures
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+
+# Per-hand gesture codes (see hand_tracking.GESTURES) that start two-hand poses
+OPEN_PALM = 1
+INDEX_POINT = 2
+
+
+class TwoHandGestures:
+    """
+    Continuous gestures made with the two longest-tracked hands.
+    
+    - zoom: both hands pinch; the change in distance between the two
+      pinch points gives a scale factor per frame
+    - rotate: both palms open; the turn of the wrist-to-wrist line gives
+      an angle per frame
+    - select: both index fingers point; the two fingertips span a box
+    
+    A pose becomes active once held for hold_ms and ends as soon as it is
+    lost. While a two-hand gesture is active, single-hand actions should
+    be suppressed.
+    """
+    
+    def __init__(self, hold_ms=150):
+        """
+        Initialize the recognizer.
+        
+        Args:
+            hold_ms: Time a two-hand pose must be held before it takes effect
+        """
+        self.hold_ms = hold_ms
+        self.pose = None         # pose seen on the last frame
+        self.pose_since = 0.0
+        self.active = None
+        self.last_measure = None  # distance (zoom) or angle (rotate) on the last frame
+    
+    def update(self, hand, timestamp):
+        """
+        Feed one frame of tracker results.
+        
+        Args:
+            hand: HandTracker or HandState with this frame's results
+            timestamp: Frame capture time in seconds
+        
+        Returns:
+            (gesture, value) while a two-hand gesture is active, else None.
+            value is the scale factor since the last frame for 'zoom', the
+            angle in degrees since the last frame for 'rotate', and the two
+            (x, y) index fingertips for 'select'.
+        """
+        state = hand.state if hasattr(hand, 'state') else hand
+        pose = self._pose(state)
+        if pose != self.pose:
+            self.pose = pose
+            self.pose_since = timestamp
+            self.active = None
+            self.last_measure = None
+        if pose is None:
+            return None
+        if self.active is None:
+            if timestamp - self.pose_since < self.hold_ms / 1000.0:
+                return None
+            self.active = pose
+        
+        points = state.landmarks[:2, :, :2]
+        if pose == 'select':
+            return pose, (tuple(points[0, INDEX_TIP].tolist()), tuple(points[1, INDEX_TIP].tolist()))
+        
+        if pose == 'zoom':
+            pinch = (points[:, THUMB_TIP] + points[:, INDEX_TIP]) / 2
+            measure = float(np.linalg.norm(pinch[1] - pinch[0]))
+        else:
+            dx, dy = points[1, WRIST] - points[0, WRIST]
+            measure = float(np.degrees(np.arctan2(dy, dx)))
+        
+        previous, self.last_measure = self.last_measure, measure
+        if previous is None:
+            return pose, 1.0 if pose == 'zoom' else 0.0
+        if pose == 'zoom':
+            return pose, measure / previous if previous > 0 else 1.0
+        # Wrap the turn into [-180, 180)
+        return pose, (measure - previous + 180.0) % 360.0 - 180.0
+    
+    def _pose(self, state):
+        """Two-hand pose of this frame's first two hands, or None."""
+        if state.num_hands < 2:
+            return None
+        if state.pinching[:2].all():
+            return 'zoom'
+        gestures = state.gestures[:2]
+        if (gestures == OPEN_PALM).all():
+            return 'rotate'
+        if (gestures == INDEX_POINT).all():
+            return 'select'
+        return None
+    
+    def get_active(self):
+        """Get the active two-hand gesture, or None."""
+        return self.active
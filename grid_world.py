@@ -1,4 +1,15 @@
 import numpy as np
+from collections import deque
+from scipy import ndimage
+from voxel_storage import ColorTable, EMPTY, create_storage
+from face_index import FaceIndex
+
+# Number of recent changes kept for dirty_regions_since()
+DIRTY_LOG_SIZE = 1024
+
+# Largest world (in cells) an empty-space flood fill may spread through;
+# fills of the open space around larger worlds are refused
+FLOOD_FILL_MAX_CELLS = 256 ** 3
 
 class GridWorld:
     """
@@ -6,17 +17,21 @@ class GridWorld:
     Manages block coordinates, colors, and world state.
     """
     
-    def __init__(self, grid_size=20, block_size=0.5):
+    def __init__(self, grid_size=20, block_size=0.5, storage='auto'):
         """
         Initialize the 3D grid world.
         
         Args:
             grid_size: Number of blocks per dimension
             block_size: Size of each block in world units
+            storage: Block storage backend, "dense" (uint8 palette volume),
+                     "chunked" (16³ chunks allocated on demand, for large
+                     grids), "dict" (sparse (x, y, z) -> index map) or
+                     "auto" (dense for small grids, chunked for large ones)
         """
         self.grid_size = grid_size
         self.block_size = block_size
-        self.blocks = {}  # Dictionary: (x, y, z) -> color
+        self.blocks = create_storage(storage, grid_size)  # (x, y, z) -> palette index
         
         # Block color palette (RGB values 0-1)
         self.color_palette = [
@@ -27,10 +42,32 @@ class GridWorld:
             (1.0, 0.5, 0.0),   # Orange
         ]
         self.current_color_index = 0
+        self.color_table = ColorTable(self.color_palette)
         
         # Cursor position for block placement
         self.cursor_pos = [grid_size // 2, 0, grid_size // 2]
         
+        # Height the cursor returns to when pointing at empty space (Q/E)
+        self.cursor_layer = 0
+        
+        # Block the pointing ray hit last (see aim_cursor), removed by "delete"
+        self.target_pos = None
+        
+        # Second corner for box/line edits, and the copy/paste clipboard
+        self.anchor_pos = None
+        self.clipboard = None
+        
+        # Callbacks notified of every change as (coords, old, new) arrays
+        self.listeners = []
+        
+        # Bumped on every change; recent changes are logged as
+        # (version, lo, hi) boxes so caches can refresh only what changed
+        self.version = 0
+        self.dirty_log = deque(maxlen=DIRTY_LOG_SIZE)
+        
+        # Exposed-face index, built on first use and then kept up to date
+        self.face_index = None
+        
     def world_to_grid(self, x, y, z):
         """
         Convert world coordinates to grid coordinates.
@@ -78,7 +115,12 @@ class GridWorld:
         if 0 <= gx < self.grid_size and 0 <= gy < self.grid_size and 0 <= gz < self.grid_size:
             if color is None:
                 color = self.color_palette[self.current_color_index]
-            self.blocks[(gx, gy, gz)] = color
+            index = self.color_table.index_of(color)
+            previous = self.blocks.set(gx, gy, gz, index)
+            if previous != index:
+                self._mark_dirty((gx, gy, gz), (gx + 1, gy + 1, gz + 1))
+                if self.listeners:
+                    self._notify([(gx, gy, gz)], [previous], [index])
             return True
         return False
     
@@ -89,26 +131,440 @@ class GridWorld:
         Args:
             gx, gy, gz: Grid coordinates
         """
-        if (gx, gy, gz) in self.blocks:
-            del self.blocks[(gx, gy, gz)]
+        if self.has_block(gx, gy, gz):
+            previous = self.blocks.set(gx, gy, gz, EMPTY)
+            self._mark_dirty((gx, gy, gz), (gx + 1, gy + 1, gz + 1))
+            if self.listeners:
+                self._notify([(gx, gy, gz)], [previous], [EMPTY])
             return True
         return False
     
+    def in_bounds(self, gx, gy, gz):
+        """Check if grid coordinates lie inside the world."""
+        return 0 <= gx < self.grid_size and 0 <= gy < self.grid_size and 0 <= gz < self.grid_size
+    
     def has_block(self, gx, gy, gz):
         """Check if a block exists at grid coordinates."""
-        return (gx, gy, gz) in self.blocks
+        return self.in_bounds(gx, gy, gz) and self.blocks.get(gx, gy, gz) != EMPTY
     
     def get_block_color(self, gx, gy, gz):
         """Get the color of a block at grid coordinates."""
-        return self.blocks.get((gx, gy, gz))
+        if not self.in_bounds(gx, gy, gz):
+            return None
+        return self.color_table.color_of(self.blocks.get(gx, gy, gz))
     
     def get_all_blocks(self):
-        """Get all blocks in the world."""
-        return self.blocks.items()
+        """Get all blocks in the world as ((x, y, z), color) pairs."""
+        color_of = self.color_table.color_of
+        return [(cell, color_of(index)) for cell, index in self.blocks.items()]
+    
+    def get_block_arrays(self):
+        """
+        Get all blocks as arrays, for vectorized whole-world work.
+        
+        Returns:
+            (coords, indices): (N, 3) intp grid coordinates and (N,) uint8
+            palette indices. Colors are self.color_table.rgb[indices].
+        """
+        coords = self.blocks.nonzero()
+        return coords, self.blocks.values_at(coords)
+    
+    def iter_chunks(self):
+        """
+        Iterate over populated chunks of the world, so renderers and
+        exporters only visit space that holds blocks.
+        
+        Yields:
+            ((x0, y0, z0) chunk origin, uint8 palette-index chunk array)
+        """
+        return self.blocks.iter_chunks()
+    
+    def get_face_index(self):
+        """
+        Get the exposed-face index of this world, building it on first use.
+        From then on every edit updates it incrementally.
+        
+        Returns:
+            FaceIndex
+        """
+        if self.face_index is None:
+            self.face_index = FaceIndex(self)
+        return self.face_index
+    
+    def get_exposed_faces(self):
+        """
+        Get every block face not covered by a neighbouring block.
+        
+        Returns:
+            ((F, 3) intp cells, (F,) face directions (see face_index.FACE_NORMALS),
+            (F,) uint8 palette indices)
+        """
+        return self.get_face_index().get_faces()
+    
+    def add_listener(self, callback):
+        """
+        Register a callback for world changes.
+        
+        Args:
+            callback: Called as callback(coords, old, new) with (N, 3) intp
+                      coordinates and (N,) uint8 old/new palette indices
+        """
+        self.listeners.append(callback)
+    
+    def _mark_dirty(self, lo, hi):
+        """Bump the version and log the box [lo, hi) as changed."""
+        self.version += 1
+        self.dirty_log.append((self.version, lo, hi))
+    
+    def _mark_cells_dirty(self, coords):
+        """Log the bounding box of an (N, 3) array of changed cells."""
+        self._mark_dirty(tuple(coords.min(axis=0).tolist()),
+                         tuple((coords.max(axis=0) + 1).tolist()))
+    
+    def dirty_regions_since(self, version):
+        """
+        Get the boxes changed after a version, for incremental consumers
+        such as the renderer's block layer.
+        
+        Args:
+            version: A value of self.version seen earlier
+        
+        Returns:
+            List of ((x, y, z) lo, (x, y, z) hi exclusive) boxes, oldest
+            first, or None when the log no longer reaches back that far
+            and everything must be treated as changed
+        """
+        if version >= self.version:
+            return []
+        if not self.dirty_log or self.dirty_log[0][0] > version + 1:
+            return None
+        regions = []
+        for logged, lo, hi in reversed(self.dirty_log):
+            if logged <= version:
+                break
+            regions.append((lo, hi))
+        regions.reverse()
+        return regions
+    
+    def _notify(self, coords, old, new):
+        """Pass a change set to every listener."""
+        coords = np.asarray(coords, dtype=np.intp).reshape(-1, 3)
+        old = np.asarray(old, dtype=np.uint8)
+        new = np.asarray(new, dtype=np.uint8)
+        for callback in self.listeners:
+            callback(coords, old, new)
+    
+    def _index_for(self, color):
+        """Palette index for a color argument (None = current color)."""
+        if color is None:
+            color = self.color_palette[self.current_color_index]
+        return self.color_table.index_of(color)
+    
+    def _clip_box(self, p0, p1):
+        """
+        Order and clip two inclusive corners to the world.
+        
+        Returns:
+            (lo, hi) with hi exclusive, or None when the box misses the world
+        """
+        lo = np.maximum(np.minimum(p0, p1), 0)
+        hi = np.minimum(np.maximum(p0, p1) + 1, self.grid_size)
+        if np.any(hi <= lo):
+            return None
+        return tuple(lo.tolist()), tuple(hi.tolist())
+    
+    def _apply_box(self, lo, values, mask=None):
+        """
+        Write a box of palette indices and report what actually changed.
+        
+        Args:
+            lo: Lower corner of the box (in bounds)
+            values: uint8 box of new palette indices (scalar broadcasts)
+            mask: Optional boolean box, only True cells are written
+        
+        Returns:
+            (N, 3) intp array of changed cells
+        """
+        shape = values.shape if mask is None else mask.shape
+        hi = tuple(l + n for l, n in zip(lo, shape))
+        old = self.blocks.read_box(lo, hi)
+        values = np.broadcast_to(np.asarray(values, dtype=np.uint8), shape)
+        
+        changed = old != values
+        if mask is not None:
+            changed &= mask
+        local = np.argwhere(changed)
+        if len(local) == 0:
+            return local
+        
+        self.blocks.write_box(lo, values, changed)
+        coords = local + np.asarray(lo)
+        self._mark_cells_dirty(coords)
+        if self.listeners:
+            self._notify(coords, old[changed], values[changed])
+        return coords
+    
+    def _apply_cells(self, coords, indices):
+        """
+        Write palette indices to a list of cells and report what changed.
+        
+        Args:
+            coords: (N, 3) integer array, out-of-bounds cells are dropped
+            indices: Palette index per cell, or one index for all
+        
+        Returns:
+            (N, 3) intp array of changed cells
+        """
+        coords = np.asarray(coords, dtype=np.intp).reshape(-1, 3)
+        indices = np.broadcast_to(np.asarray(indices, dtype=np.uint8), (len(coords),))
+        inside = np.all((coords >= 0) & (coords < self.grid_size), axis=1)
+        coords, indices = coords[inside], indices[inside]
+        
+        # Keep the last write per cell so old/new pairs stay unambiguous
+        size = self.grid_size
+        cell_ids = (coords[:, 0].astype(np.int64) * size + coords[:, 1]) * size + coords[:, 2]
+        _, first = np.unique(cell_ids[::-1], return_index=True)
+        last = len(coords) - 1 - first
+        coords, indices = coords[last], indices[last]
+        
+        old = self.blocks.values_at(coords)
+        changed = old != indices
+        coords = coords[changed]
+        if len(coords):
+            self.blocks.set_many(coords, indices[changed])
+            self._mark_cells_dirty(coords)
+            if self.listeners:
+                self._notify(coords, old[changed], indices[changed])
+        return coords
+    
+    def fill_box(self, p0, p1, color=None):
+        """
+        Fill the box between two corners (inclusive).
+        
+        Args:
+            p0, p1: Opposite corners in grid coordinates
+            color: RGB color tuple (or None for current color)
+        
+        Returns:
+            (N, 3) intp array of changed cells
+        """
+        box = self._clip_box(p0, p1)
+        if box is None:
+            return np.zeros((0, 3), dtype=np.intp)
+        lo, hi = box
+        shape = tuple(h - l for l, h in zip(lo, hi))
+        return self._apply_box(lo, np.full(shape, self._index_for(color), dtype=np.uint8))
+    
+    def clear_box(self, p0, p1):
+        """Remove every block in the box between two corners (inclusive)."""
+        box = self._clip_box(p0, p1)
+        if box is None:
+            return np.zeros((0, 3), dtype=np.intp)
+        lo, hi = box
+        shape = tuple(h - l for l, h in zip(lo, hi))
+        return self._apply_box(lo, np.zeros(shape, dtype=np.uint8))
+    
+    def fill_shell(self, p0, p1, color=None, thickness=1):
+        """
+        Fill the hollow shell of the box between two corners.
+        
+        Args:
+            p0, p1: Opposite corners in grid coordinates (inclusive)
+            color: RGB color tuple (or None for current color)
+            thickness: Wall thickness in blocks
+        
+        Returns:
+            (N, 3) intp array of changed cells
+        """
+        box = self._clip_box(p0, p1)
+        if box is None:
+            return np.zeros((0, 3), dtype=np.intp)
+        lo, hi = box
+        shape = tuple(h - l for l, h in zip(lo, hi))
+        
+        # A cell is on the shell when it is within thickness of any face
+        mask = np.zeros(shape, dtype=bool)
+        for axis, n in enumerate(shape):
+            index = np.arange(n)
+            near_face = (index < thickness) | (index >= n - thickness)
+            mask |= near_face.reshape([-1 if a == axis else 1 for a in range(3)])
+        return self._apply_box(lo, np.full(shape, self._index_for(color), dtype=np.uint8), mask)
+    
+    def fill_sphere(self, center, radius, color=None):
+        """
+        Fill a solid sphere.
+        
+        Args:
+            center: Center cell in grid coordinates
+            radius: Radius in blocks
+            color: RGB color tuple (or None for current color, EMPTY clears)
+        
+        Returns:
+            (N, 3) intp array of changed cells
+        """
+        center = np.asarray(center)
+        r = int(np.ceil(radius))
+        box = self._clip_box(center - r, center + r)
+        if box is None:
+            return np.zeros((0, 3), dtype=np.intp)
+        lo, hi = box
+        
+        x, y, z = np.ogrid[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]]
+        mask = (x - center[0]) ** 2 + (y - center[1]) ** 2 + (z - center[2]) ** 2 <= radius * radius
+        index = EMPTY if color == EMPTY else self._index_for(color)
+        return self._apply_box(lo, np.full(mask.shape, index, dtype=np.uint8), mask)
+    
+    def fill_line(self, p0, p1, color=None):
+        """
+        Fill a 3D line of blocks between two cells (inclusive).
+        
+        Returns:
+            (N, 3) intp array of changed cells
+        """
+        p0 = np.asarray(p0, dtype=np.float64)
+        p1 = np.asarray(p1, dtype=np.float64)
+        steps = int(np.abs(p1 - p0).max())
+        t = np.linspace(0.0, 1.0, steps + 1)[:, None]
+        coords = np.rint(p0 + t * (p1 - p0)).astype(np.intp)
+        return self._apply_cells(coords, self._index_for(color))
+    
+    def flood_fill(self, seed, color=None):
+        """
+        Recolor the connected region (6-neighbourhood) of cells sharing the
+        seed's palette index. Seeding an empty cell fills the empty region.
+        
+        The region is labelled in one pass over the bounding box of all
+        blocks plus a one-cell margin, so enclosed spaces of any size are
+        filled completely. An empty region that reaches that margin is the
+        open space around the build and spreads through the whole world;
+        worlds larger than FLOOD_FILL_MAX_CELLS refuse such a fill.
+        
+        Args:
+            seed: Start cell in grid coordinates
+            color: RGB color tuple (or None for current color, EMPTY clears)
+        
+        Returns:
+            (N, 3) intp array of changed cells
+        """
+        none = np.zeros((0, 3), dtype=np.intp)
+        if not self.in_bounds(*seed):
+            return none
+        seed = np.asarray(seed)
+        index = EMPTY if color == EMPTY else self._index_for(color)
+        seed_index = self.blocks.get(*seed)
+        if seed_index == index:
+            return none
+        
+        occupied = self.blocks.nonzero()
+        lo, hi = seed, seed
+        if len(occupied):
+            lo = np.minimum(occupied.min(axis=0), seed)
+            hi = np.maximum(occupied.max(axis=0), seed)
+        lo, hi = self._clip_box(lo - 1, hi + 1)
+        region = self._component(seed, lo, hi)
+        
+        if seed_index == EMPTY and self._leaves_box(region, lo, hi):
+            if self.grid_size ** 3 > FLOOD_FILL_MAX_CELLS:
+                print(f"Flood fill skipped: open space of a {self.grid_size}^3 world "
+                      f"exceeds {FLOOD_FILL_MAX_CELLS} cells")
+                return none
+            lo, hi = (0, 0, 0), (self.grid_size,) * 3
+            region = self._component(seed, lo, hi)
+        
+        return self._apply_box(lo, np.full(region.shape, index, dtype=np.uint8), region)
+    
+    def _component(self, seed, lo, hi):
+        """Boolean box (lo..hi) of the cells connected to seed with its palette index."""
+        data = self.blocks.read_box(lo, hi)
+        local = tuple((seed - lo).tolist())
+        labels, _ = ndimage.label(data == data[local])  # 6-connected by default
+        return labels == labels[local]
+    
+    def _leaves_box(self, region, lo, hi):
+        """Whether region touches a face of the box that is not a world boundary."""
+        for axis in range(3):
+            if lo[axis] > 0 and region.take(0, axis=axis).any():
+                return True
+            if hi[axis] < self.grid_size and region.take(-1, axis=axis).any():
+                return True
+        return False
+    
+    def copy_region(self, p0, p1):
+        """
+        Copy the box between two corners (inclusive) to the clipboard.
+        
+        Returns:
+            uint8 palette-index array of the region (also kept in self.clipboard)
+        """
+        box = self._clip_box(p0, p1)
+        if box is None:
+            return None
+        self.clipboard = self.blocks.read_box(*box)
+        return self.clipboard
+    
+    def rotate_region(self, region=None, turns=1, axis=1):
+        """
+        Rotate a copied region by quarter turns.
+        
+        Args:
+            region: Palette-index array (None rotates the clipboard in place)
+            turns: Number of 90° turns (negative turns the other way)
+            axis: Axis to rotate around (0 = x, 1 = y (vertical), 2 = z)
+        
+        Returns:
+            The rotated region
+        """
+        planes = {0: (1, 2), 1: (2, 0), 2: (0, 1)}[axis]
+        if region is None:
+            if self.clipboard is None:
+                return None
+            self.clipboard = np.ascontiguousarray(np.rot90(self.clipboard, turns, planes))
+            return self.clipboard
+        return np.ascontiguousarray(np.rot90(region, turns, planes))
+    
+    def paste_region(self, origin, region=None, skip_empty=True):
+        """
+        Paste a region with its lower corner at origin.
+        
+        Args:
+            origin: Grid position of the region's lower corner
+            region: Palette-index array (None pastes the clipboard)
+            skip_empty: Keep existing blocks where the region is empty
+        
+        Returns:
+            (N, 3) intp array of changed cells
+        """
+        region = self.clipboard if region is None else region
+        if region is None:
+            return np.zeros((0, 3), dtype=np.intp)
+        
+        # Crop the parts of the region that fall outside the world
+        origin = np.asarray(origin)
+        box = self._clip_box(origin, origin + np.asarray(region.shape) - 1)
+        if box is None:
+            return np.zeros((0, 3), dtype=np.intp)
+        lo, hi = box
+        start = np.asarray(lo) - origin
+        stop = np.asarray(hi) - origin
+        region = region[start[0]:stop[0], start[1]:stop[1], start[2]:stop[2]]
+        
+        mask = region != EMPTY if skip_empty else None
+        return self._apply_box(lo, region, mask)
+    
+    def set_anchor(self):
+        """Remember the cursor as the second corner for box and line edits."""
+        self.anchor_pos = tuple(self.cursor_pos)
+        print(f"Anchor set: {self.anchor_pos}")
     
     def clear_world(self):
         """Remove all blocks from the world."""
-        self.blocks.clear()
+        self._mark_dirty((0, 0, 0), (self.grid_size,) * 3)
+        if self.listeners:
+            coords, old = self.get_block_arrays()
+            self.blocks.clear()
+            self._notify(coords, old, np.zeros(len(coords), dtype=np.uint8))
+        else:
+            self.blocks.clear()
         print("World cleared")
     
     def update_cursor(self, hand_x, hand_y, frame_width, frame_height):
@@ -134,15 +590,142 @@ class GridWorld:
         self.cursor_pos[0] = max(0, min(self.grid_size - 1, self.cursor_pos[0]))
         self.cursor_pos[2] = max(0, min(self.grid_size - 1, self.cursor_pos[2]))
     
+    def raycast(self, origin, direction, max_distance=None):
+        """
+        Find the first block hit by a ray (Amanatides-Woo voxel traversal).
+    
+        The cells the ray crosses are generated from the sorted boundary
+        crossings of the three axes and read with one batched storage
+        lookup, so the cost is O(cells traversed), not O(blocks).
+    
+        Args:
+            origin: (x, y, z) ray start in grid units (cell (i, j, k) spans [i, i+1))
+            direction: (x, y, z) ray direction, need not be normalized
+            max_distance: Stop after this distance in grid units (None = world edge)
+    
+        Returns:
+            ((x, y, z) hit cell, (nx, ny, nz) normal of the face the ray
+            entered through, distance) or None when nothing is hit. The
+            normal is (0, 0, 0) when the ray starts inside a block.
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        length = np.linalg.norm(direction)
+        if length == 0:
+            return None
+        direction = direction / length
+    
+        # Clip the ray to the world box (slab test)
+        moving = direction != 0
+        inverse = np.where(moving, 1.0 / np.where(moving, direction, 1.0), np.inf)
+        with np.errstate(invalid='ignore'):
+            t0 = (0 - origin) * inverse
+            t1 = (self.grid_size - origin) * inverse
+        t_near = np.where(moving, np.minimum(t0, t1), -np.inf)
+        t_far = np.where(moving, np.maximum(t0, t1), np.inf)
+        # A ray parallel to a slab misses unless it starts inside it
+        if np.any(~moving & ((origin < 0) | (origin >= self.grid_size))):
+            return None
+        t_enter = max(float(t_near.max()), 0.0)
+        t_exit = float(t_far.min())
+        if max_distance is not None:
+            t_exit = min(t_exit, float(max_distance))
+        if t_exit <= t_enter:
+            return None
+    
+        step = np.sign(direction).astype(np.intp)
+        # Start cell, a point on a boundary belongs to the cell it moves into
+        point = origin + t_enter * direction
+        start = np.where(step < 0, np.ceil(point) - 1, np.floor(point)).astype(np.intp)
+        start = np.clip(start, 0, self.grid_size - 1)
+    
+        # Face the ray entered the world through, none when it starts inside
+        normal = np.zeros(3, dtype=np.intp)
+        if t_near.max() > 0:
+            axis = int(t_near.argmax())
+            normal[axis] = -step[axis]
+    
+        # Every boundary crossing before t_exit, tagged with its axis
+        times, axes = [np.array([t_enter])], [np.array([-1])]
+        for axis in np.flatnonzero(moving):
+            boundary = start[axis] + (step[axis] > 0)
+            first = (boundary - origin[axis]) * inverse[axis]
+            spacing = abs(inverse[axis])
+            count = max(0, int(np.ceil((t_exit - first) / spacing)))
+            times.append(first + spacing * np.arange(count))
+            axes.append(np.full(count, axis))
+        times = np.concatenate(times)
+        axes = np.concatenate(axes)
+        order = np.argsort(times, kind='stable')
+        times, axes = times[order], axes[order]
+    
+        # Cell after each crossing: the start cell plus the steps taken so far
+        moves = np.zeros((len(axes), 3), dtype=np.intp)
+        crossing = axes >= 0
+        moves[np.flatnonzero(crossing), axes[crossing]] = step[axes[crossing]]
+        cells = start + np.cumsum(moves, axis=0)
+        inside = np.all((cells >= 0) & (cells < self.grid_size), axis=1)
+        if not inside.all():
+            end = int(np.argmin(inside))
+            cells, times, axes = cells[:end], times[:end], axes[:end]
+    
+        hits = np.flatnonzero(self.blocks.values_at(cells) != EMPTY)
+        if len(hits) == 0:
+            return None
+        hit = hits[0]
+        if axes[hit] >= 0:
+            normal = np.zeros(3, dtype=np.intp)
+            normal[axes[hit]] = -step[axes[hit]]
+        return tuple(cells[hit].tolist()), tuple(normal.tolist()), float(times[hit])
+    
+    def aim_cursor(self, origin, direction):
+        """
+        Point the cursor along a ray.
+    
+        When the ray hits a block, that block becomes the target (for
+        removal) and the cursor moves onto the face the ray hit (for
+        placement), or onto the block itself when that face is on the
+        world boundary. Otherwise the cursor follows the ray down to the
+        build layer chosen with move_cursor_up/down, and there is no target.
+    
+        Args:
+            origin: (x, y, z) ray start in grid units
+            direction: (x, y, z) ray direction
+    
+        Returns:
+            The raycast() result, or None when no block was hit
+        """
+        hit = self.raycast(origin, direction)
+        self.target_pos = None
+        if hit is not None:
+            cell, normal, _ = hit
+            self.target_pos = cell
+            front = tuple(c + n for c, n in zip(cell, normal))
+            # Never leave the cursor on last frame's cell, it may be a different column
+            self.cursor_pos = list(front if self.in_bounds(*front) else cell)
+            return hit
+    
+        # Nothing hit, follow the ray to the middle of the build layer
+        self.cursor_pos[1] = self.cursor_layer
+        if direction[1] != 0:
+            t = (self.cursor_layer + 0.5 - origin[1]) / direction[1]
+            if t >= 0:
+                for axis in (0, 2):
+                    cell = int(np.floor(origin[axis] + t * direction[axis]))
+                    self.cursor_pos[axis] = max(0, min(self.grid_size - 1, cell))
+        return None
+    
     def move_cursor_up(self):
         """Move cursor up (Y axis)."""
         if self.cursor_pos[1] < self.grid_size - 1:
             self.cursor_pos[1] += 1
+        self.cursor_layer = self.cursor_pos[1]
     
     def move_cursor_down(self):
         """Move cursor down (Y axis)."""
         if self.cursor_pos[1] > 0:
             self.cursor_pos[1] -= 1
+        self.cursor_layer = self.cursor_pos[1]
     
     def get_cursor_position(self):
         """Get current cursor grid position."""
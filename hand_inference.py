@@ -0,0 +1,228 @@
+import time
+import queue
+import multiprocessing as mproc
+from collections import deque
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 21
+WORKER_POLL_INTERVAL = 0.1  # seconds between worker liveness checks while waiting
+
+
+def _inference_worker(worker_id, shm_name, frame_shape, num_slots, tasks, results, settings):
+    """
+    Worker process body: owns a MediaPipe Hands instance and runs it on
+    frames placed in its shared-memory slots.
+    
+    Only (seq, slot, landmarks, handedness) travels back, landmarks being a
+    small (hands, 21, 3) float32 array in normalized image coordinates.
+    A frame that fails posts landmarks None and the error message instead.
+    """
+    import mediapipe as mp
+    
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray((num_slots,) + tuple(frame_shape), dtype=np.uint8, buffer=shm.buf)
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=settings['max_hands'],
+        min_detection_confidence=settings['detection_confidence'],
+        min_tracking_confidence=settings['tracking_confidence']
+    )
+    
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot = task
+            
+            try:
+                rgb_frame = cv2.cvtColor(frames[slot], cv2.COLOR_BGR2RGB)
+                detected = hands.process(rgb_frame)
+                
+                if detected.multi_hand_landmarks:
+                    landmarks = np.array(
+                        [[(lm.x, lm.y, lm.z) for lm in hand.landmark]
+                         for hand in detected.multi_hand_landmarks],
+                        dtype=np.float32
+                    )
+                    handedness = [h.classification[0].label for h in detected.multi_handedness]
+                else:
+                    landmarks = np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+                    handedness = []
+            except Exception as e:
+                # Report the failure so the collector does not wait for it forever
+                landmarks, handedness = None, f"{type(e).__name__}: {e}"
+            
+            results.put((seq, worker_id, slot, landmarks, handedness))
+    finally:
+        hands.close()
+        del frames
+        shm.close()
+
+
+class InferencePool:
+    """
+    Runs hand inference in separate processes so it does not compete
+    with rendering for the GIL.
+    
+    Frames are copied into per-worker shared-memory slots (never pickled),
+    dispatched round-robin, and results are handed back in submission order.
+    """
+    
+    def __init__(self, num_workers=2, max_hands=1, detection_confidence=0.7,
+                 tracking_confidence=0.7, slots_per_worker=2):
+        """
+        Initialize the pool (processes start on the first frame).
+        
+        Args:
+            num_workers: Number of inference processes
+            max_hands: Maximum hands per frame
+            detection_confidence: MediaPipe detection threshold
+            tracking_confidence: MediaPipe tracking threshold
+            slots_per_worker: Frames that can be queued per worker
+        """
+        self.num_workers = max(1, num_workers)
+        self.slots_per_worker = max(1, slots_per_worker)
+        self.settings = {
+            'max_hands': max_hands,
+            'detection_confidence': detection_confidence,
+            'tracking_confidence': tracking_confidence,
+        }
+        
+        self.frame_shape = None
+        self.workers = []
+        self.next_worker = 0
+        self.next_seq = 0
+        self.in_flight = deque()  # (seq, tag) in submission order
+        self.finished = {}        # seq -> (landmarks, handedness)
+        self.results = None
+    
+    def start(self, frame_shape):
+        """Spawn the worker processes for frames of the given shape."""
+        # MediaPipe is not fork-safe, always spawn fresh interpreters
+        ctx = mproc.get_context('spawn')
+        self.frame_shape = tuple(frame_shape)
+        self.results = ctx.Queue()
+        frame_bytes = int(np.prod(self.frame_shape))
+        
+        for worker_id in range(self.num_workers):
+            shm = shared_memory.SharedMemory(create=True, size=frame_bytes * self.slots_per_worker)
+            frames = np.ndarray((self.slots_per_worker,) + self.frame_shape,
+                                dtype=np.uint8, buffer=shm.buf)
+            tasks = ctx.Queue()
+            process = ctx.Process(
+                target=_inference_worker,
+                args=(worker_id, shm.name, self.frame_shape, self.slots_per_worker,
+                      tasks, self.results, self.settings),
+                daemon=True
+            )
+            process.start()
+            self.workers.append({
+                'process': process,
+                'shm': shm,
+                'frames': frames,
+                'tasks': tasks,
+                'free_slots': list(range(self.slots_per_worker)),
+            })
+        
+        print(f"Inference pool started: {self.num_workers} worker process(es)")
+    
+    def submit(self, frame, tag=None):
+        """
+        Hand a frame to the next worker with a free slot.
+        
+        Args:
+            frame: BGR frame
+            tag: Any object returned alongside the frame's result
+        
+        Returns:
+            True if the frame was queued, False if every slot is busy
+        """
+        if not self.workers:
+            self.start(frame.shape)
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match pool shape {self.frame_shape}")
+        
+        for attempt in range(self.num_workers):
+            index = (self.next_worker + attempt) % self.num_workers
+            worker = self.workers[index]
+            if worker['free_slots']:
+                break
+        else:
+            return False
+        
+        self.next_worker = (index + 1) % self.num_workers
+        slot = worker['free_slots'].pop()
+        np.copyto(worker['frames'][slot], frame)
+        
+        seq = self.next_seq
+        self.next_seq += 1
+        self.in_flight.append((seq, tag))
+        worker['tasks'].put((seq, slot))
+        return True
+    
+    def pending(self):
+        """Number of submitted frames whose result has not been collected."""
+        return len(self.in_flight)
+    
+    def collect(self, timeout=None):
+        """
+        Wait for the result of the oldest submitted frame.
+        
+        Raises an exception if a worker failed on that frame or a worker
+        process died, rather than waiting for a result that never comes.
+        
+        Returns:
+            (landmarks, handedness, tag) or None on timeout / nothing pending.
+            landmarks is a (hands, 21, 3) float32 array of normalized coordinates.
+        """
+        if not self.in_flight:
+            return None
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        seq, tag = self.in_flight[0]
+        while seq not in self.finished:
+            wait = WORKER_POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            try:
+                done_seq, worker_id, slot, landmarks, handedness = self.results.get(timeout=wait)
+            except queue.Empty:
+                self._check_workers()
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                continue
+            self.workers[worker_id]['free_slots'].append(slot)
+            self.finished[done_seq] = (landmarks, handedness)
+        
+        self.in_flight.popleft()
+        landmarks, handedness = self.finished.pop(seq)
+        if landmarks is None:
+            raise Exception(f"Hand inference failed on frame {seq}: {handedness}")
+        return landmarks, handedness, tag
+    
+    def _check_workers(self):
+        """Raise if a worker process has exited while frames are in flight."""
+        for worker_id, worker in enumerate(self.workers):
+            process = worker['process']
+            if not process.is_alive():
+                raise Exception(f"Inference worker {worker_id} exited "
+                                f"(exit code {process.exitcode})")
+    
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        for worker in self.workers:
+            worker['tasks'].put(None)
+        for worker in self.workers:
+            worker['process'].join(timeout=2.0)
+            if worker['process'].is_alive():
+                worker['process'].terminate()
+            del worker['frames']
+            worker['shm'].close()
+            worker['shm'].unlink()
+        self.workers = []
+        self.in_flight.clear()
+        self.finished.clear()
@@ -4,8 +4,108 @@ import numpy as np
 # Import MediaPipe
 import mediapipe as mp
 
+from hand_inference import InferencePool
+from gesture_classifier import RuleClassifier, landmark_features
+
 MEDIAPIPE_AVAILABLE = True
 
+# Landmark indices
+NUM_LANDMARKS = 21
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+
+# Gesture codes produced by the classifier (index into GESTURES)
+GESTURES = (None, "place", "move", "delete", "rotate", "change_color")
+
+# Thumb-to-index tip distance, relative to palm length, below which a hand pinches
+PINCH_RATIO = 0.35
+
+# A detection continues a track when its wrist moved less than this share of the frame width
+TRACK_MATCH_DISTANCE = 0.25
+
+# Seconds the serial path waits for a worker-pool result before giving up
+INFERENCE_TIMEOUT = 5.0
+
+# Hand skeleton as a (connections, 2) index array for batched drawing
+HAND_CONNECTIONS = np.array(sorted(mp.solutions.hands.HAND_CONNECTIONS), dtype=np.intp)
+
+
+class HandState:
+    """
+    Tracker results for one frame, one row per hand.
+
+    landmarks is a (hands, 21, 3) float32 array of pixel x, y and MediaPipe z;
+    gestures holds one gesture code per hand and confidences the classifier's
+    confidence in it, pinching one flag per hand, handedness one
+    'Left'/'Right' label per hand and track_ids one stable ID per hand.
+    Rows are ordered by track ID, and the getters report the primary hand:
+    the one tracked the longest.
+    """
+
+    def __init__(self, landmarks, gestures, pinching=None, handedness=(), track_ids=None,
+                 confidences=None):
+        self.landmarks = landmarks
+        self.gestures = gestures
+        self.num_hands = len(landmarks)
+        if confidences is None:
+            confidences = np.ones(self.num_hands, dtype=np.float32)
+        self.confidences = confidences
+        self.pinching = np.zeros(self.num_hands, dtype=bool) if pinching is None else pinching
+        self.handedness = list(handedness) or [''] * self.num_hands
+        self.track_ids = np.arange(self.num_hands) if track_ids is None else track_ids
+
+    def find_hand(self, handedness=None, track_id=None):
+        """
+        Row of the hand with the given handedness and/or track ID.
+
+        Returns:
+            Row index, or None when no such hand is tracked
+        """
+        for i in range(self.num_hands):
+            if handedness is not None and self.handedness[i] != handedness:
+                continue
+            if track_id is not None and self.track_ids[i] != track_id:
+                continue
+            return i
+        return None
+
+    def get_primary_track(self):
+        """Track ID of the primary hand, or None without a hand."""
+        if self.num_hands == 0:
+            return None
+        return int(self.track_ids[0])
+
+    def get_gesture(self):
+        if self.num_hands == 0:
+            return None
+        return GESTURES[self.gestures[0]]
+
+    def get_confidence(self):
+        """Classifier confidence (0-1) in the primary hand's gesture, 0 without a hand."""
+        if self.num_hands == 0:
+            return 0.0
+        return float(self.confidences[0])
+
+    def get_hand_position(self):
+        """Wrist position (x, y, z) as a view, or None without a hand."""
+        if self.num_hands == 0:
+            return None
+        return self.landmarks[0, WRIST]
+
+    def get_index_position(self):
+        """Index fingertip position (x, y, z) as a view, or None without a hand."""
+        if self.num_hands == 0:
+            return None
+        return self.landmarks[0, INDEX_TIP]
+
+    def get_landmarks_3d(self):
+        """All 21 landmarks of the hand as a (21, 3) view, or None without a hand."""
+        if self.num_hands == 0:
+            return None
+        return self.landmarks[0]
+
 
 class HandTracker:
     """
@@ -13,31 +113,122 @@ class HandTracker:
     Detects hand landmarks and recognizes gestures for block building.
     """
 
-    def __init__(self, max_hands=1, detection_confidence=0.7, tracking_confidence=0.7):
+    INFERENCE_MODES = ('full', 'downscale', 'roi')
+
+    def __init__(self, max_hands=1, detection_confidence=0.7, tracking_confidence=0.7,
+                 inference_workers=0, inference_mode='full', inference_width=640,
+                 roi_scale=1.8, keyframe_interval=1, max_keyframe_interval=8,
+                 flow_scale=0.5, classifier=None):
         """
         Initialize MediaPipe hand tracking.
+
+        Args:
+            inference_workers: Run MediaPipe in this many worker processes
+                               (0 keeps inference in-process)
+            inference_mode: 'full' feeds the whole frame, 'downscale' feeds a
+                            resized frame, 'roi' feeds a crop around the last
+                            hand (full-frame search when the hand is lost)
+            inference_width: Maximum width of the image given to MediaPipe in
+                             'downscale' and 'roi' modes
+            roi_scale: Crop size as a multiple of the last hand bounding box
+            keyframe_interval: Run MediaPipe every N frames and propagate
+                               landmarks with optical flow in between
+                               (1 runs inference on every frame). N adapts
+                               to the flow residual between 2 and
+                               max_keyframe_interval.
+            max_keyframe_interval: Upper bound for the adaptive interval
+            flow_scale: Scale of the grayscale image used for optical flow
+            classifier: Gesture classifier with a predict(features) method
+                        (see gesture_classifier), RuleClassifier by default
         """
+        if inference_mode not in self.INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode: {inference_mode}")
+        if inference_workers > 0 and (inference_mode != 'full' or keyframe_interval > 1):
+            raise ValueError("Cropped, downscaled and keyframe inference are only supported in-process")
 
         # MediaPipe init
         self.mp_hands = mp.solutions.hands
-        self.mp_draw = mp.solutions.drawing_utils
-
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=max_hands,
-            min_detection_confidence=detection_confidence,
-            min_tracking_confidence=tracking_confidence
-        )
 
-        # Gesture state
-        self.current_gesture = None
-        self.hand_center = None
-        self.index_tip = None
-        self.landmarks_3d = None
+        self.inference_workers = inference_workers
+        self.pool = None
+        self.hands = None
+
+        if inference_workers > 0:
+            self.pool = InferencePool(
+                num_workers=inference_workers,
+                max_hands=max_hands,
+                detection_confidence=detection_confidence,
+                tracking_confidence=tracking_confidence
+            )
+        else:
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=max_hands,
+                min_detection_confidence=detection_confidence,
+                min_tracking_confidence=tracking_confidence
+            )
+
+        # Inference region settings
+        self.inference_mode = inference_mode
+        self.inference_width = inference_width
+        self.roi_scale = roi_scale
+        self.roi = None          # (x0, y0, x1, y1) crop fed to MediaPipe last frame
+        self.hand_bbox = None    # (x0, y0, x1, y1) of detected landmarks in pixels
+
+        # Preallocated per-hand state table, reused every frame: one row per
+        # hand with landmarks, gesture, pinch flag, handedness and track ID
+        self.max_hands = max_hands
+        self.landmarks = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.gesture_codes = np.zeros(max_hands, dtype=np.intp)
+        self.confidences = np.zeros(max_hands, dtype=np.float32)
+        self.pinching = np.zeros(max_hands, dtype=bool)
+        self.handedness = [''] * max_hands
+        self.track_ids = np.zeros(max_hands, dtype=np.intp)
+        self.num_hands = 0
+        self.next_track_id = 0
+        self.state = HandState(self.landmarks[:0], self.gesture_codes[:0])
+        self.classifier = classifier if classifier is not None else RuleClassifier()
+
+        # Wrists, labels and IDs of last frame's hands, to continue tracks
+        self.prev_wrists = np.zeros((max_hands, 2), dtype=np.float32)
+        self.prev_handedness = [''] * max_hands
+        self.prev_track_ids = np.zeros(max_hands, dtype=np.intp)
+        self.prev_count = 0
+
+        # Keyframe / optical-flow propagation state
+        self.keyframing = keyframe_interval > 1
+        self.keyframe_interval = keyframe_interval
+        self.max_keyframe_interval = max(keyframe_interval, max_keyframe_interval)
+        self.flow_scale = flow_scale
+        self.flow_error_low = 4.0    # residual below which the interval grows
+        self.flow_error_high = 12.0  # residual above which we re-detect immediately
+        self.frames_since_keyframe = 0
+        self.prev_gray = None
+        self.keyframes = 0
+        self.propagated_frames = 0
 
     def process_frame(self, frame):
         """Process a frame to detect hands and landmarks."""
 
+        if self.pool is not None:
+            # Out-of-process inference, wait for this frame's result
+            if not self.submit_frame(frame):
+                raise Exception("Inference pool has no free slot for the frame")
+            collected = self.collect_frame(timeout=INFERENCE_TIMEOUT)
+            if collected is None:
+                raise Exception(f"Hand inference timed out after {INFERENCE_TIMEOUT:.0f} s")
+            return collected[0]
+
+        if self.keyframing:
+            return self._process_keyframed(frame)
+
+        return self._run_inference(frame)
+
+    def _run_inference(self, frame):
+        """Run MediaPipe on the frame (or its inference region)."""
+        if self.inference_mode != 'full':
+            return self._process_region(frame)
+
         # Convert BGR to RGB
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         rgb_frame.flags.writeable = False
@@ -46,104 +237,323 @@ class HandTracker:
 
         rgb_frame.flags.writeable = True
 
-        # Reset states
-        self.current_gesture = None
-        self.hand_center = None
-        self.index_tip = None
-        self.landmarks_3d = None
+        count = self._read_landmarks(results.multi_hand_landmarks, results.multi_handedness)
+        return self._apply_results(frame, count)
+
+    def _process_region(self, frame):
+        """Run inference on a downscaled crop and map landmarks back to the frame."""
+        h, w = frame.shape[:2]
+        x0, y0, x1, y1 = self._inference_region(w, h)
+        crop = frame[y0:y1, x0:x1]
+        crop_w, crop_h = x1 - x0, y1 - y0
+
+        # Resize the crop only, then convert the (small) result to RGB
+        scale = min(1.0, self.inference_width / crop_w)
+        if scale < 1.0:
+            size = (max(1, int(crop_w * scale)), max(1, int(crop_h * scale)))
+            crop = cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+        rgb_crop = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        rgb_crop.flags.writeable = False
+
+        results = self.hands.process(rgb_crop)
+        count = self._read_landmarks(results.multi_hand_landmarks, results.multi_handedness)
+
+        if count:
+            # Crop-normalized -> frame-normalized (z follows the x scale)
+            sx, sy = crop_w / w, crop_h / h
+            hands = self.landmarks[:count]
+            hands *= (sx, sy, sx)
+            hands += (x0 / w, y0 / h, 0.0)
+
+        self.roi = (x0, y0, x1, y1)
+        return self._apply_results(frame, count)
+
+    def _inference_region(self, w, h):
+        """
+        Pick the part of the frame to feed to MediaPipe.
 
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
+        The crop is kept while the hand stays well inside it, because
+        MediaPipe's own tracking assumes a stable image between frames.
+        """
+        if self.inference_mode != 'roi' or self.hand_bbox is None:
+            return 0, 0, w, h
+
+        # Square crop around the hand, never smaller than a quarter of the frame height
+        bx0, by0, bx1, by1 = self.hand_bbox
+        size = int(max(bx1 - bx0, by1 - by0, h // 4) * self.roi_scale)
+        size = min(size, w, h)
+
+        if self.roi is not None and self.roi != (0, 0, w, h):
+            rx0, ry0, rx1, ry1 = self.roi
+            margin = 0.1 * (rx1 - rx0)
+            if (bx0 >= rx0 + margin and by0 >= ry0 + margin and
+                    bx1 <= rx1 - margin and by1 <= ry1 - margin and
+                    size >= 0.6 * (rx1 - rx0)):
+                return self.roi
+
+        cx, cy = (bx0 + bx1) // 2, (by0 + by1) // 2
+        x0 = min(max(0, cx - size // 2), w - size)
+        y0 = min(max(0, cy - size // 2), h - size)
+        return x0, y0, x0 + size, y0 + size
+
+    def _process_keyframed(self, frame):
+        """
+        Run inference on keyframes only and propagate landmarks with
+        pyramidal Lucas-Kanade flow on the frames in between.
+        """
+        # Grayscale pyramid base, taken before anything is drawn on the frame
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.flow_scale != 1.0:
+            gray = cv2.resize(gray, None, fx=self.flow_scale, fy=self.flow_scale,
+                              interpolation=cv2.INTER_AREA)
+
+        propagate = (self.num_hands > 0 and self.prev_gray is not None and
+                     self.prev_gray.shape == gray.shape and
+                     self.frames_since_keyframe < self.keyframe_interval)
+
+        if propagate and self._propagate_landmarks(gray):
+            self.prev_gray = gray
+            self.frames_since_keyframe += 1
+            self.propagated_frames += 1
+            return self._apply_results(frame, self.num_hands, normalized=False)
+
+        self.prev_gray = gray
+        self.frames_since_keyframe = 1
+        self.keyframes += 1
+        return self._run_inference(frame)
+
+    def _propagate_landmarks(self, gray):
+        """
+        Move the current landmarks along the optical flow to this frame.
 
-                # Draw landmarks
-                self.mp_draw.draw_landmarks(
-                    frame,
-                    hand_landmarks,
-                    self.mp_hands.HAND_CONNECTIONS
-                )
+        Returns:
+            False when tracking confidence dropped and a keyframe is needed
+        """
+        count = self.num_hands
+        hands = self.landmarks[:count]
+        prev_points = (hands[:, :, :2] * self.flow_scale).reshape(-1, 1, 2)
+
+        next_points, status, error = cv2.calcOpticalFlowPyrLK(
+            self.prev_gray, gray, prev_points, None,
+            winSize=(15, 15), maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
 
-                # Extract landmarks
-                self._extract_landmarks(hand_landmarks, frame.shape)
+        tracked = status.ravel() == 1
+        if tracked.mean() < 0.7:
+            self.keyframe_interval = 2
+            return False
+
+        # Adapt the keyframe interval to how well the flow is holding up
+        residual = float(np.median(error.ravel()[tracked]))
+        if residual > self.flow_error_high:
+            self.keyframe_interval = 2
+            return False
+        if residual < self.flow_error_low:
+            self.keyframe_interval = min(self.keyframe_interval + 1, self.max_keyframe_interval)
+        else:
+            self.keyframe_interval = max(2, self.keyframe_interval // 2)
+
+        # Lost points follow the median motion of the tracked ones
+        motion = (next_points - prev_points).reshape(-1, 2)
+        motion[~tracked] = np.median(motion[tracked], axis=0)
+        hands[:, :, :2] += motion.reshape(count, NUM_LANDMARKS, 2) / self.flow_scale
+        return True
+
+    def submit_frame(self, frame, tag=None):
+        """
+        Queue a frame for out-of-process inference without waiting.
 
-                # Recognize gesture
-                self.current_gesture = self._recognize_gesture(hand_landmarks)
+        Args:
+            frame: BGR frame, must stay untouched until collected
+            tag: Any object returned with the frame by collect_frame()
 
-        return frame
+        Returns:
+            True if queued, False if every worker slot is busy
+        """
+        return self.pool.submit(frame, (frame, tag))
 
-    def _extract_landmarks(self, hand_landmarks, frame_shape):
-        """Extract key landmark positions."""
-        h, w, _ = frame_shape
+    def collect_frame(self, timeout=None):
+        """
+        Wait for the oldest submitted frame and apply its results.
 
-        # Wrist center
-        wrist = hand_landmarks.landmark[0]
-        self.hand_center = (int(wrist.x * w), int(wrist.y * h), wrist.z)
+        Returns:
+            (frame, tag) with landmarks drawn and tracker state updated,
+            or None on timeout
+        """
+        result = self.pool.collect(timeout)
+        if result is None:
+            return None
 
-        # Index finger tip
-        index_tip = hand_landmarks.landmark[8]
-        self.index_tip = (int(index_tip.x * w), int(index_tip.y * h), index_tip.z)
+        landmarks, handedness, (frame, tag) = result
+        count = min(len(landmarks), self.max_hands)
+        self.landmarks[:count] = landmarks[:count]
+        self.handedness[:count] = handedness[:count]
+        return self._apply_results(frame, count), tag
 
-        # Store all landmarks
-        self.landmarks_3d = [(lm.x * w, lm.y * h, lm.z) for lm in hand_landmarks.landmark]
+    def pending_frames(self):
+        """Number of frames submitted to the worker pool but not collected."""
+        return self.pool.pending() if self.pool is not None else 0
 
-    def _recognize_gesture(self, hand_landmarks):
-        """Recognize hand gestures."""
-        fingers_up = self._count_fingers(hand_landmarks)
+    def _read_landmarks(self, multi_hand_landmarks, multi_handedness=None):
+        """
+        Copy MediaPipe landmark lists and handedness labels into the
+        preallocated state table.
 
-        if fingers_up == 5:
-            return "place"
-        elif fingers_up == 1:
-            return "move"
-        elif fingers_up == 0:
-            return "delete"
-        elif fingers_up == 2:
-            return "rotate"
-        elif self._is_thumb_up(hand_landmarks):
-            return "change_color"
+        Returns:
+            Number of hands copied (coordinates are still normalized)
+        """
+        if not multi_hand_landmarks:
+            return 0
 
-        return None
+        count = min(len(multi_hand_landmarks), self.max_hands)
+        for i in range(count):
+            self.landmarks[i] = [(lm.x, lm.y, lm.z) for lm in multi_hand_landmarks[i].landmark]
+            self.handedness[i] = multi_handedness[i].classification[0].label if multi_handedness else ''
+        return count
 
-    def _count_fingers(self, hand_landmarks):
-        """Count extended fingers."""
-        fingers = 0
+    def _assign_tracks(self, count, width):
+        """
+        Give this frame's hands the track IDs of last frame's nearest hands.
+
+        Pairs are matched greedily by wrist distance, with a handedness
+        mismatch counting as half the match radius; hands left without a
+        close predecessor start new tracks. Rows are then reordered by
+        track ID so the longest-tracked hand comes first.
+        """
+        wrists = self.landmarks[:count, WRIST, :2]
+        ids = np.full(count, -1, dtype=np.intp)
+        prev = self.prev_count
+        if prev:
+            radius = TRACK_MATCH_DISTANCE * width
+            cost = np.linalg.norm(wrists[:, None] - self.prev_wrists[None, :prev], axis=2)
+            cost += radius * 0.5 * np.array([[a != b for b in self.prev_handedness[:prev]]
+                                             for a in self.handedness[:count]], dtype=bool)
+            for flat in np.argsort(cost, axis=None):
+                i, j = divmod(int(flat), prev)
+                if cost[i, j] > radius:
+                    break
+                if ids[i] < 0 and self.prev_track_ids[j] not in ids:
+                    ids[i] = self.prev_track_ids[j]
+        for i in np.flatnonzero(ids < 0):
+            ids[i] = self.next_track_id
+            self.next_track_id += 1
+
+        order = np.argsort(ids)
+        if count > 1 and (order != np.arange(count)).any():
+            self.landmarks[:count] = self.landmarks[order]
+            self.handedness[:count] = [self.handedness[i] for i in order]
+        self.track_ids[:count] = ids[order]
+
+    def _apply_results(self, frame, count, normalized=True):
+        """
+        Finish a frame whose first `count` hands hold landmarks (normalized
+        unless stated otherwise): scale them to pixels, classify gestures
+        and draw the skeletons.
+        """
+        self.num_hands = count
+        self.hand_bbox = None
+
+        if count:
+            h, w = frame.shape[:2]
+            hands = self.landmarks[:count]
+            if normalized:
+                hands *= (w, h, 1.0)
+                self._assign_tracks(count, w)
+
+            # One batched pass classifies every hand
+            codes, confidences = self._classify_gestures(hands)
+            self.gesture_codes[:count] = codes
+            self.confidences[:count] = confidences
+            self.pinching[:count] = self._detect_pinches(hands)
+
+            self._draw_hands(frame, hands)
+
+            # Bounding box of all hands, seeds the next inference crop
+            xy = hands[:, :, :2].reshape(-1, 2)
+            x0, y0 = xy.min(axis=0)
+            x1, y1 = xy.max(axis=0)
+            self.hand_bbox = (max(0, int(x0)), max(0, int(y0)),
+                              min(w, int(x1)), min(h, int(y1)))
+
+        # Remember this frame's hands to continue their tracks
+        self.prev_count = count
+        self.prev_wrists[:count] = self.landmarks[:count, WRIST, :2]
+        self.prev_handedness[:count] = self.handedness[:count]
+        self.prev_track_ids[:count] = self.track_ids[:count]
+
+        self.state = HandState(self.landmarks[:count], self.gesture_codes[:count],
+                               self.pinching[:count], self.handedness[:count],
+                               self.track_ids[:count], self.confidences[:count])
+        return frame
 
-        # Thumb
-        if hand_landmarks.landmark[4].x < hand_landmarks.landmark[3].x:
-            fingers += 1
+    def _draw_hands(self, frame, hands):
+        """Draw skeletons of all hands with two batched OpenCV calls."""
+        points = hands[:, :, :2].astype(np.int32)
 
-        # Other fingers
-        finger_tips = [8, 12, 16, 20]
-        finger_pips = [6, 10, 14, 18]
+        # Every bone as a two-point polyline
+        bones = points[:, HAND_CONNECTIONS].reshape(-1, 2, 2)
+        cv2.polylines(frame, bones, False, (224, 224, 224), 2)
 
-        for tip, pip in zip(finger_tips, finger_pips):
-            if hand_landmarks.landmark[tip].y < hand_landmarks.landmark[pip].y:
-                fingers += 1
+        # Single-point polylines render as round dots
+        joints = points.reshape(-1, 1, 2)
+        cv2.polylines(frame, joints, False, (0, 0, 255), 5)
 
-        return fingers
+    def _classify_gestures(self, hands):
+        """
+        Recognize gestures for all hands at once.
 
-    def _is_thumb_up(self, hand_landmarks):
-        """Check thumb up gesture."""
-        thumb_tip = hand_landmarks.landmark[4]
-        thumb_mcp = hand_landmarks.landmark[2]
+        Args:
+            hands: (n, 21, 3) landmark array
 
-        thumb_up = thumb_tip.y < thumb_mcp.y
-        fingers_down = all(
-            hand_landmarks.landmark[tip].y > hand_landmarks.landmark[pip].y
-            for tip, pip in [(8, 6), (12, 10), (16, 14), (20, 18)]
-        )
+        Returns:
+            ((n,) array of gesture codes (see GESTURES), (n,) confidences)
+        """
+        features = landmark_features(hands, self.handedness[:len(hands)])
+        return self.classifier.predict(features)
+
+    def _detect_pinches(self, hands):
+        """
+        Flag hands whose thumb and index tips touch, for all hands at once.
+
+        Args:
+            hands: (n, 21, 3) landmark array
 
-        return thumb_up and fingers_down
+        Returns:
+            (n,) bool array
+        """
+        xy = hands[:, :, :2]
+        gap = np.linalg.norm(xy[:, THUMB_TIP] - xy[:, INDEX_TIP], axis=1)
+        palm = np.linalg.norm(xy[:, MIDDLE_MCP] - xy[:, WRIST], axis=1)
+        return gap < PINCH_RATIO * np.maximum(palm, 1e-6)
 
     def get_gesture(self):
-        return self.current_gesture
+        return self.state.get_gesture()
+
+    def get_confidence(self):
+        return self.state.get_confidence()
 
     def get_hand_position(self):
-        return self.hand_center
+        return self.state.get_hand_position()
 
     def get_index_position(self):
-        return self.index_tip
+        return self.state.get_index_position()
 
     def get_landmarks_3d(self):
-        return self.landmarks_3d
+        return self.state.get_landmarks_3d()
+
+    def get_primary_track(self):
+        return self.state.get_primary_track()
+
+    def snapshot(self):
+        """Capture the results of the last processed frame."""
+        count = self.num_hands
+        return HandState(self.landmarks[:count].copy(), self.gesture_codes[:count].copy(),
+                         self.pinching[:count].copy(), self.handedness[:count],
+                         self.track_ids[:count].copy(), self.confidences[:count].copy())
 
     def close(self):
-        self.hands.close()
+        if self.hands is not None:
+            self.hands.close()
+        if self.pool is not None:
+            self.pool.close()
@@ -1,21 +1,97 @@
 import cv2
 import numpy as np
 import math
+from instrumentation import NULL_SPAN
+from projection import OrbitCamera, FACE_SHADE, CUBE_CORNERS, CUBE_EDGES
+from face_index import FACE_CORNERS, FACE_NORMALS
+
+# Edge length (pixels) of the coarse tiles used to cull hidden blocks
+CULL_TILE = 8
+
+
+class StaticLayer:
+    """
+    Prerendered drawing that never changes between frames.
+    
+    The draw function runs once on two canvases with different backgrounds;
+    pixels that match on both were drawn, giving an exact mask even for
+    black fills. The layer keeps the bounding region of everything drawn,
+    with its pixels and mask, and is composited with one masked copy.
+    """
+    
+    def __init__(self, shape, draw):
+        """
+        Build the layer.
+        
+        Args:
+            shape: (height, width, 3) of the frames it is composited onto
+            draw: Function drawing onto a canvas and returning the list of
+                  (x0, y0, x1, y1) boxes (inclusive) it drew into
+        """
+        dark = np.zeros(shape, dtype=np.uint8)
+        light = np.full(shape, 255, dtype=np.uint8)
+        boxes = draw(dark)
+        draw(light)
+        mask = np.all(dark == light, axis=2)
+        
+        # (row slice, column slice) of every drawn box, for region-limited blending
+        height, width = shape[:2]
+        self.regions = []
+        for x0, y0, x1, y1 in boxes:
+            x0, y0 = max(0, x0), max(0, y0)
+            x1, y1 = min(width - 1, x1), min(height - 1, y1)
+            if x1 < x0 or y1 < y0:
+                continue
+            box_mask = mask[y0:y1 + 1, x0:x1 + 1]
+            if not box_mask.any():
+                continue
+            
+            # Shrink the box to the pixels actually drawn
+            rows = np.flatnonzero(box_mask.any(axis=1))
+            cols = np.flatnonzero(box_mask.any(axis=0))
+            self.regions.append((slice(int(y0 + rows[0]), int(y0 + rows[-1] + 1)),
+                                 slice(int(x0 + cols[0]), int(x0 + cols[-1] + 1))))
+        
+        # One region bounding every box, composited in a single masked copy
+        self.region = None
+        if self.regions:
+            self.region = (slice(min(r.start for r, _ in self.regions),
+                                 max(r.stop for r, _ in self.regions)),
+                           slice(min(c.start for _, c in self.regions),
+                                 max(c.stop for _, c in self.regions)))
+            self.pixels = dark[self.region].copy()
+            self.mask = mask[self.region].astype(np.uint8)
+    
+    def composite(self, frame):
+        """Paint the layer onto a frame in place."""
+        if self.region is not None:
+            # Single-channel mask: one SIMD pass instead of per-byte masking
+            cv2.copyTo(self.pixels, self.mask, frame[self.region])
+
 
 class HologramRenderer:
     """
     Renders futuristic hologram blocks and Iron Man HUD on camera feed.
     Uses OpenCV for 2D overlay rendering with glow effects.
+    
+    Two views are available: "flat" maps (x, z) straight to the screen and
+    shows height by block size, "projected" draws the visible cube faces
+    through a perspective OrbitCamera turned by the rotate gesture.
     """
     
-    def __init__(self, frame_width, frame_height):
+    VIEW_MODES = ('flat', 'projected')
+    
+    def __init__(self, frame_width, frame_height, view_mode='flat'):
         """
         Initialize the hologram renderer.
         
         Args:
             frame_width: Width of camera frame
             frame_height: Height of camera frame
+            view_mode: 'flat' or 'projected'
         """
+        if view_mode not in self.VIEW_MODES:
+            raise ValueError(f"Unknown view mode: {view_mode}")
         self.frame_width = frame_width
         self.frame_height = frame_height
         
@@ -23,70 +99,179 @@ class HologramRenderer:
         self.show_grid = True
         self.show_hud = True
         self.glow_intensity = 30
+        self.view_mode = view_mode
+        
+        # Projected view: orbit camera (created for the first world drawn),
+        # exposed faces of the last world version, and what the layer shows
+        self.camera = None
+        self.camera_limit = None
+        self.faces = None
+        self.faces_key = None
+        self.projected_key = None
         
         # Animation frame counter
         self.frame_count = 0
         
-    def render_frame(self, frame, grid_world, hand_tracker):
+        # Static layers, rebuilt on toggles or a resolution change
+        self.grid_layer = None
+        self.chrome_layer = None
+        
+        # Cached block layer (colors plus uint8 coverage mask), redrawn only where
+        # the world changed since block_version
+        self.block_color = None
+        self.block_mask = None
+        self.block_bounds = None  # (y0, y1, x0, x1) covering the mask, None when empty
+        self.block_world = None
+        self.block_version = -1
+        
+        # Reusable output buffer for render_frame(out=None)
+        self.output = None
+        
+        # Optional LatencyMonitor for per-step timings
+        self.monitor = None
+        
+    def render_frame(self, frame, grid_world, hand_tracker, out=None):
         """
         Render hologram blocks and HUD on frame.
         
+        The translucent overlay (grid, cursor, blocks) is blended with the
+        camera image only inside the regions it draws into, so per-frame
+        work follows overlay coverage rather than frame size.
+        
         Args:
             frame: Camera frame to render on
             grid_world: GridWorld instance with blocks
             hand_tracker: HandTracker instance
+            out: Frame to render into. None renders into a buffer owned by
+                 the renderer, which is overwritten by the next call;
+                 passing frame itself renders in place without any
+                 full-frame copy.
             
         Returns:
             Rendered frame with holograms
         """
         self.frame_count += 1
-        output = frame.copy()
-        
-        # Create overlay for transparency
-        overlay = output.copy()
-        
-        # Render grid (if enabled)
-        if self.show_grid:
-            self._render_grid(overlay, grid_world)
+        self._ensure_static_layers(frame.shape)
+        
+        with self._span('render.copy'):
+            if out is None:
+                if self.output is None or self.output.shape != frame.shape:
+                    self.output = np.empty_like(frame)
+                out = self.output
+            if out is not frame:
+                np.copyto(out, frame)
+            output = out
+        
+        # Keep the camera pixels under everything the overlay will draw
+        with self._span('render.regions'):
+            regions = self._overlay_regions(grid_world)
+            bases = [output[region].copy() for region in regions]
+        
+        # Render grid (if enabled), the projected view draws its ground with the blocks
+        if self.show_grid and self.view_mode == 'flat':
+            with self._span('render.grid'):
+                self._render_grid(output, grid_world)
         
         # Render cursor
-        self._render_cursor(overlay, grid_world)
+        with self._span('render.cursor'):
+            self._render_cursor(output, grid_world)
         
         # Render all blocks
-        self._render_blocks(overlay, grid_world)
+        with self._span('render.blocks'):
+            self._render_blocks(output, grid_world)
         
-        # Blend overlay with original frame (alpha blending)
-        cv2.addWeighted(overlay, 0.7, output, 0.3, 0, output)
+        # Blend overlay with original frame (alpha blending), region by region.
+        # Regions may overlap, so every blend is computed before any is written.
+        with self._span('render.blend'):
+            blended = [cv2.addWeighted(output[region], 0.7, base, 0.3, 0)
+                       for region, base in zip(regions, bases)]
+            for region, pixels in zip(regions, blended):
+                output[region] = pixels
         
         # Render HUD around hand (if hand detected)
-        if self.show_hud and hand_tracker.get_hand_position():
-            self._render_hud(output, hand_tracker)
+        if self.show_hud and hand_tracker.get_hand_position() is not None:
+            with self._span('render.hud'):
+                self._render_hud(output, hand_tracker)
         
         # Render UI info
-        self._render_ui_info(output, grid_world, hand_tracker)
+        with self._span('render.ui'):
+            self._render_ui_info(output, grid_world, hand_tracker)
         
         return output
     
+    def _overlay_regions(self, grid_world):
+        """
+        Regions the overlay draws into this frame.
+        
+        Returns:
+            List of (row slice, column slice) covering grid, cursor and blocks
+        """
+        regions = []
+        if self.show_grid and self.view_mode == 'flat':
+            regions.extend(self.grid_layer.regions)
+        
+        x0, y0, x1, y1 = self._cursor_layout(grid_world)[-1]
+        regions.append((slice(max(0, y0), max(0, min(self.frame_height, y1 + 1))),
+                        slice(max(0, x0), max(0, min(self.frame_width, x1 + 1)))))
+        
+        self._update_block_layer(grid_world)
+        if self.block_bounds is not None:
+            y0, y1, x0, x1 = self.block_bounds
+            regions.append((slice(y0, y1), slice(x0, x1)))
+        return regions
+    
+    def _span(self, name):
+        """Timing span for a render step (no-op without a monitor)."""
+        if self.monitor is None:
+            return NULL_SPAN
+        return self.monitor.span(name)
+    
+    def _ensure_static_layers(self, shape):
+        """(Re)build the cached static layers for this frame size."""
+        if shape[1] != self.frame_width or shape[0] != self.frame_height:
+            self.frame_width = shape[1]
+            self.frame_height = shape[0]
+            self.invalidate_static_layers()
+            self.block_color = None
+        
+        if self.grid_layer is None and self.show_grid:
+            self.grid_layer = StaticLayer(shape, self._draw_grid)
+        if self.chrome_layer is None:
+            self.chrome_layer = StaticLayer(shape, self._draw_ui_chrome)
+    
+    def invalidate_static_layers(self):
+        """Drop the cached static layers, they are rebuilt on the next frame."""
+        self.grid_layer = None
+        self.chrome_layer = None
+    
     def _render_grid(self, frame, grid_world):
         """Render futuristic grid ground."""
+        self.grid_layer.composite(frame)
+    
+    def _draw_grid(self, frame):
+        """Draw the grid lines, returning the boxes they cover."""
         grid_color = (0, 100, 150)
         grid_spacing = self.frame_width // 15
+        boxes = []
         
         # Vertical lines
         for i in range(0, self.frame_width, grid_spacing):
             cv2.line(frame, (i, 0), (i, self.frame_height), grid_color, 1)
+            boxes.append((i, 0, i, self.frame_height))
         
         # Horizontal lines
         for i in range(0, self.frame_height, grid_spacing):
             cv2.line(frame, (0, i), (self.frame_width, i), grid_color, 1)
+            boxes.append((0, i, self.frame_width, i))
+        
+        return boxes
     
     def _render_cursor(self, frame, grid_world):
         """Render placement cursor."""
-        cursor_pos = grid_world.get_cursor_position()
-        
-        # Map grid position to screen position
-        screen_x = int((cursor_pos[0] / grid_world.grid_size) * self.frame_width)
-        screen_y = int((cursor_pos[2] / grid_world.grid_size) * self.frame_height)
+        if self.view_mode == 'projected':
+            self._render_projected_cursor(frame, grid_world)
+            return
+        screen_x, screen_y, text, _ = self._cursor_layout(grid_world)
         
         # Pulsing animation
         pulse = int(20 + 15 * math.sin(self.frame_count * 0.15))
@@ -98,55 +283,481 @@ class HologramRenderer:
         cv2.line(frame, (screen_x, screen_y - 20), (screen_x, screen_y + 20), color, 2)
         
         # Cursor coordinates text
-        cv2.putText(frame, f"({cursor_pos[0]}, {cursor_pos[1]}, {cursor_pos[2]})",
-                   (screen_x + 30, screen_y - 30), cv2.FONT_HERSHEY_SIMPLEX, 
+        cv2.putText(frame, text, (screen_x + 30, screen_y - 30), cv2.FONT_HERSHEY_SIMPLEX,
                    0.5, color, 1)
     
+    def _cursor_layout(self, grid_world):
+        """
+        Screen position, label and extent of the placement cursor.
+        
+        Returns:
+            (screen_x, screen_y, text, (x0, y0, x1, y1) inclusive box), or
+            the _projected_cursor_layout tuple in the projected view
+        """
+        if self.view_mode == 'projected':
+            return self._projected_cursor_layout(grid_world)
+        cursor_pos = grid_world.get_cursor_position()
+        
+        # Map grid position to screen position
+        screen_x = int((cursor_pos[0] / grid_world.grid_size) * self.frame_width)
+        screen_y = int((cursor_pos[2] / grid_world.grid_size) * self.frame_height)
+        text = f"({cursor_pos[0]}, {cursor_pos[1]}, {cursor_pos[2]})"
+        
+        # Largest pulse (35) plus line width, and the label
+        (text_width, text_height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+        box = (screen_x - 37, min(screen_y - 37, screen_y - 31 - text_height),
+               max(screen_x + 37, screen_x + 31 + text_width), screen_y + 37)
+        return screen_x, screen_y, text, box
+    
+    def _projected_cursor_layout(self, grid_world):
+        """
+        Projected wireframe cube of the cursor cell.
+        
+        Returns:
+            ((12, 2, 2) int32 edge endpoints, text, text origin,
+            (x0, y0, x1, y1) inclusive box)
+        """
+        cursor_pos = grid_world.get_cursor_position()
+        camera = self._camera_for(grid_world)
+        screen, depth = camera.project(CUBE_CORNERS + cursor_pos, self.frame_width, self.frame_height)
+        text = f"({cursor_pos[0]}, {cursor_pos[1]}, {cursor_pos[2]})"
+        if (depth < camera.near).any():
+            return np.zeros((0, 2, 2), dtype=np.int32), text, None, (0, 0, -1, -1)
+        
+        screen = np.rint(screen).astype(np.int32)
+        x0, y0 = screen.min(axis=0).tolist()
+        x1, y1 = screen.max(axis=0).tolist()
+        
+        # Label above the cube's top-right corner, like the flat cursor
+        origin = (x1 + 10, y0 - 10)
+        (text_width, text_height), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+        box = (x0 - 2, origin[1] - text_height - 1, max(x1 + 2, origin[0] + text_width + 1), y1 + 2)
+        return screen[CUBE_EDGES], text, origin, box
+    
+    def _render_projected_cursor(self, frame, grid_world):
+        """Render the placement cursor as a projected wireframe cube."""
+        edges, text, origin, _ = self._projected_cursor_layout(grid_world)
+        if origin is None:
+            return
+        color = (0, 255, 255)  # Cyan
+        cv2.polylines(frame, edges, False, color, 2)
+        cv2.putText(frame, text, origin, cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+    
     def _render_blocks(self, frame, grid_world):
-        """Render all hologram blocks."""
-        for (gx, gy, gz), color in grid_world.get_all_blocks():
-            self._render_block(frame, gx, gy, gz, color, grid_world)
-    
-    def _render_block(self, frame, gx, gy, gz, color, grid_world):
-        """Render a single hologram block."""
-        # Map grid to screen coordinates
-        screen_x = int((gx / grid_world.grid_size) * self.frame_width)
-        screen_y = int((gz / grid_world.grid_size) * self.frame_height)
-        
-        # Block size varies with Y position (height)
-        base_size = 40
-        size_scale = 1.0 + (gy * 0.1)  # Blocks higher up appear larger
-        block_size = int(base_size * size_scale)
-        
-        # Convert color to BGR (0-255)
-        bgr_color = (int(color[2] * 255), int(color[1] * 255), int(color[0] * 255))
-        
-        # Draw block as rectangle with glow
-        top_left = (screen_x - block_size // 2, screen_y - block_size // 2)
-        bottom_right = (screen_x + block_size // 2, screen_y + block_size // 2)
-        
-        # Glow effect (multiple rectangles with decreasing alpha)
-        for i in range(3, 0, -1):
-            glow_size = block_size + i * 5
-            glow_top_left = (screen_x - glow_size // 2, screen_y - glow_size // 2)
-            glow_bottom_right = (screen_x + glow_size // 2, screen_y + glow_size // 2)
-            cv2.rectangle(frame, glow_top_left, glow_bottom_right, bgr_color, -1)
-        
-        # Main block
-        cv2.rectangle(frame, top_left, bottom_right, bgr_color, -1)
-        
-        # Border
-        cv2.rectangle(frame, top_left, bottom_right, (255, 255, 255), 2)
-        
-        # Height indicator line
-        if gy > 0:
-            line_y = screen_y + block_size // 2
-            cv2.line(frame, (screen_x, line_y), (screen_x, line_y + gy * 15), bgr_color, 2)
+        """Render all hologram blocks from the cached block layer."""
+        self._update_block_layer(grid_world)
+        if self.block_bounds is None:
+            return
+        y0, y1, x0, x1 = self.block_bounds
+        cv2.copyTo(self.block_color[y0:y1, x0:x1], self.block_mask[y0:y1, x0:x1],
+                   frame[y0:y1, x0:x1])
+    
+    def _update_block_layer(self, grid_world):
+        """
+        Bring the cached block layer up to date with the world.
+        
+        Only the screen rectangles covered by world changes since the last
+        update are cleared and redrawn, so an unchanged world costs nothing.
+        """
+        if self.view_mode == 'projected':
+            self._update_projected_layer(grid_world)
+            return
+        
+        if self.block_color is None or grid_world is not self.block_world:
+            regions = None
+        elif grid_world.version == self.block_version:
+            return
+        else:
+            regions = grid_world.dirty_regions_since(self.block_version)
+        
+        if regions is None:
+            shape = (self.frame_height, self.frame_width)
+            self.block_color = np.zeros(shape + (3,), dtype=np.uint8)
+            self.block_mask = np.zeros(shape, dtype=np.uint8)
+            rects = [(0, 0, self.frame_width - 1, self.frame_height - 1)]
+        else:
+            rects = [self._region_rect(lo, hi, grid_world.grid_size) for lo, hi in regions]
+        self.block_world = grid_world
+        self.block_version = grid_world.version
+        
+        coords, indices = grid_world.get_block_arrays()
+        footprints = self._block_footprints(coords, grid_world.grid_size)
+        rgb = grid_world.color_table.rgb
+        for rect in rects:
+            self._redraw_rect(rect, coords, indices, footprints, rgb, grid_world.grid_size)
+        self._update_block_bounds()
+    
+    def _update_block_bounds(self):
+        """Recompute the bounding box of the block layer's mask."""
+        rows = np.flatnonzero(self.block_mask.any(axis=1))
+        if len(rows) == 0:
+            self.block_bounds = None
+            return
+        cols = np.flatnonzero(self.block_mask[rows[0]:rows[-1] + 1].any(axis=0))
+        self.block_bounds = (int(rows[0]), int(rows[-1]) + 1, int(cols[0]), int(cols[-1]) + 1)
+    
+    def _camera_for(self, grid_world):
+        """Orbit camera of the projected view, created to frame the world."""
+        if self.camera is None:
+            size = grid_world.grid_size
+            self.camera = OrbitCamera((size / 2, 0.0, size / 2), distance=size * 1.6)
+            self.camera_limit = size * 6.0  # farthest zoom-out
+        return self.camera
+    
+    def set_view_mode(self, view_mode):
+        """Switch between the 'flat' and 'projected' views."""
+        if view_mode not in self.VIEW_MODES:
+            raise ValueError(f"Unknown view mode: {view_mode}")
+        self.view_mode = view_mode
+        # Both views share the block layer, make the next frame redraw it
+        self.block_world = None
+        self.projected_key = None
+    
+    def toggle_view(self):
+        """Toggle between the flat and the projected 3D view."""
+        self.set_view_mode('flat' if self.view_mode == 'projected' else 'projected')
+        print(f"View: {self.view_mode.upper()}")
+    
+    def orbit(self, d_yaw, d_pitch):
+        """Turn the projected view's camera by the given angles in degrees."""
+        if self.camera is not None:
+            self.camera.orbit(d_yaw, d_pitch)
+    
+    def zoom(self, factor):
+        """Scale the projected view (factor > 1 moves the camera closer)."""
+        if self.camera is not None:
+            self.camera.zoom(factor, max_distance=self.camera_limit)
+    
+    def pick_ray(self, x, y, grid_world):
+        """
+        Ray through a screen point into the grid, for pointing at blocks.
+        
+        The flat view looks straight down, so its ray drops vertically
+        through the cell under the point (the same mapping as
+        GridWorld.update_cursor). The projected view casts the ray from
+        the camera through the pixel.
+        
+        Args:
+            x, y: Screen position in pixels
+            grid_world: World the ray is cast into
+        
+        Returns:
+            ((x, y, z) origin, (x, y, z) direction) in grid units
+        """
+        size = grid_world.grid_size
+        if self.view_mode == 'projected':
+            return self._camera_for(grid_world).unproject(x, y, self.frame_width, self.frame_height)
+        origin = (x / self.frame_width * size, size, y / self.frame_height * size)
+        return origin, (0.0, -1.0, 0.0)
+    
+    def _update_projected_layer(self, grid_world):
+        """
+        Redraw the block layer for the projected view when the world, the
+        camera or the grid toggle changed since it was last drawn.
+        """
+        camera = self._camera_for(grid_world)
+        key = (id(grid_world), grid_world.version, camera.version, self.show_grid)
+        if self.block_color is not None and key == self.projected_key:
+            return
+        self.projected_key = key
+        self.block_world = None
+        
+        shape = (self.frame_height, self.frame_width)
+        if self.block_color is None:
+            self.block_color = np.zeros(shape + (3,), dtype=np.uint8)
+            self.block_mask = np.zeros(shape, dtype=np.uint8)
+        else:
+            self.block_color[...] = 0
+        
+        if self.show_grid:
+            self._draw_projected_ground(self.block_color, grid_world.grid_size, camera)
+        self._draw_projected_faces(self.block_color, grid_world, camera)
+        
+        # Drawn pixels are never black, so the mask is just the gray level
+        cv2.cvtColor(self.block_color, cv2.COLOR_BGR2GRAY, dst=self.block_mask)
+        self._update_block_bounds()
+    
+    def _draw_projected_ground(self, frame, grid_size, camera):
+        """Draw the ground grid (y = 0) of the projected view."""
+        step = max(1, grid_size // 10)
+        ticks = np.unique(np.append(np.arange(0, grid_size + 1, step), grid_size)).astype(np.float64)
+        zeros = np.zeros_like(ticks)
+        full = np.full_like(ticks, grid_size)
+        # Lines along z at every x tick, then along x at every z tick
+        starts = np.concatenate([np.stack([ticks, zeros, zeros], axis=1),
+                                 np.stack([zeros, zeros, ticks], axis=1)])
+        ends = np.concatenate([np.stack([ticks, zeros, full], axis=1),
+                               np.stack([full, zeros, ticks], axis=1)])
+        screen, depth = camera.project(np.stack([starts, ends], axis=1), self.frame_width, self.frame_height)
+        in_front = (depth >= camera.near).all(axis=1)
+        cv2.polylines(frame, np.rint(screen[in_front]).astype(np.int32), False, (0, 100, 150), 1)
+    
+    def _draw_projected_faces(self, frame, grid_world, camera):
+        """
+        Draw the visible block faces of the projected view, back to front.
+        
+        Only exposed faces are considered (the world's incrementally kept
+        face index, copied once per world version), minus faces pointing
+        away from the eye and faces crossing the near plane. All corners
+        of the rest are projected in one batched matrix multiply.
+        """
+        key = (id(grid_world), grid_world.version)
+        if key != self.faces_key:
+            self.faces = grid_world.get_exposed_faces()
+            self.faces_key = key
+        cells, directions, indices = self.faces
+        if len(cells) == 0:
+            return
+        
+        # Back-face culling against the vector from the face center to the eye
+        normals = FACE_NORMALS[directions]
+        centers = cells + 0.5 + 0.5 * normals
+        facing = np.einsum('ij,ij->i', normals, camera.eye() - centers) > 0
+        cells, directions, indices = cells[facing], directions[facing], indices[facing]
+        
+        corners = cells[:, None, :] + FACE_CORNERS[directions]
+        screen, depth = camera.project(corners, self.frame_width, self.frame_height)
+        in_front = (depth >= camera.near).all(axis=1)
+        screen, depth = screen[in_front], depth[in_front]
+        directions, indices = directions[in_front], indices[in_front]
+        
+        # Painter's order: farthest face first
+        order = np.argsort(-depth.mean(axis=1), kind='stable')
+        polys = np.rint(screen[order]).astype(np.int32)
+        rgb = grid_world.color_table.rgb
+        shaded = rgb[indices[order]][:, ::-1] * 255 * FACE_SHADE[directions[order]][:, None]
+        colors = np.maximum(shaded.astype(np.int64), 1).tolist()
+        
+        edge_color = (255, 255, 255)
+        for poly, color in zip(polys, colors):
+            cv2.fillConvexPoly(frame, poly, color)
+            cv2.polylines(frame, [poly], True, edge_color, 1)
+    
+    def _redraw_rect(self, rect, coords, indices, footprints, rgb, grid_size):
+        """Clear one screen rectangle of the block layer and redraw the blocks touching it."""
+        x0 = max(0, rect[0])
+        y0 = max(0, rect[1])
+        x1 = min(self.frame_width - 1, rect[2])
+        y1 = min(self.frame_height - 1, rect[3])
+        if x1 < x0 or y1 < y0:
+            return
+        
+        color_view = self.block_color[y0:y1 + 1, x0:x1 + 1]
+        color_view[...] = 0
+        
+        touching = np.flatnonzero((footprints[:, 0] <= x1) & (footprints[:, 2] >= x0) &
+                                  (footprints[:, 1] <= y1) & (footprints[:, 3] >= y0))
+        # Draw in view coordinates, OpenCV clips to the view
+        self._rasterize_blocks(color_view, coords[touching], indices[touching],
+                               footprints[touching] - [x0, y0, x0, y0], rgb, grid_size, (x0, y0))
+        
+        # Drawn pixels are never black, so the mask is just the gray level
+        self.block_mask[y0:y1 + 1, x0:x1 + 1] = cv2.cvtColor(color_view, cv2.COLOR_BGR2GRAY)
+    
+    def _block_footprints(self, coords, grid_size):
+        """
+        Screen rectangles covered by blocks, glow, border and height line.
+        
+        Args:
+            coords: (N, 3) grid coordinates
+            grid_size: Blocks per world dimension
+        
+        Returns:
+            (N, 4) int array of inclusive (x0, y0, x1, y1)
+        """
+        coords = np.asarray(coords).reshape(-1, 3)
+        gx, gy, gz = coords[:, 0], coords[:, 1], coords[:, 2]
+        screen_x = (gx * self.frame_width // grid_size).astype(np.int64)
+        screen_y = (gz * self.frame_height // grid_size).astype(np.int64)
+        block_size = (40 * (1.0 + gy * 0.1)).astype(np.int64)
+        half = (block_size + 15) // 2 + 1  # outer glow plus the border's overhang
+        bottom = np.maximum(screen_y + half, screen_y + block_size // 2 + gy * 15 + 1)
+        return np.stack([screen_x - half, screen_y - half, screen_x + half, bottom], axis=1)
+    
+    def _region_rect(self, lo, hi, grid_size):
+        """Screen rectangle covering every block footprint in the grid box [lo, hi)."""
+        corners = np.array([[x, y, z]
+                            for x in (lo[0], hi[0] - 1)
+                            for y in (lo[1], hi[1] - 1)
+                            for z in (lo[2], hi[2] - 1)])
+        # Footprints grow monotonically with every coordinate, the corners bound the box
+        footprints = self._block_footprints(corners, grid_size)
+        return (int(footprints[:, 0].min()), int(footprints[:, 1].min()),
+                int(footprints[:, 2].max()), int(footprints[:, 3].max()))
+    
+    def _rasterize_blocks(self, frame, coords, indices, footprints, rgb, grid_size, origin=(0, 0)):
+        """
+        Paint hologram blocks back to front in a few batched OpenCV calls.
+        
+        Layers are drawn from the lowest gy up, so higher (larger) blocks
+        always cover lower ones, after culling blocks already hidden under
+        higher layers. Each layer is split into (gx, gz) residue classes
+        whose members' footprints cannot overlap, and a class draws its glow
+        squares, then its borders, then its height lines. That matches
+        drawing every block's glow, border and line before the next block,
+        and keeps fillPoly's even-odd rule away from overlapping squares.
+        Colors are clamped to at least 1 per channel so drawn pixels are
+        never black.
+        
+        Args:
+            frame: Color layer (or a view of it) to draw on
+            coords: (N, 3) grid coordinates
+            indices: (N,) palette indices
+            footprints: (N, 4) block footprints in view coordinates
+            rgb: Palette colors (RGB, 0-1) indexed by palette index
+            grid_size: Blocks per world dimension
+            origin: Screen position of the view's top-left pixel
+        """
+        if len(coords) == 0:
+            return
+        coords = np.asarray(coords, dtype=np.int64)
+        gx, gy, gz = coords[:, 0], coords[:, 1], coords[:, 2]
+        
+        # Map grid to screen coordinates, blocks higher up appear larger
+        screen_x = gx * self.frame_width // grid_size - origin[0]
+        screen_y = gz * self.frame_height // grid_size - origin[1]
+        block_size = (40 * (1.0 + gy * 0.1)).astype(np.int64)
+        half = block_size // 2
+        glow_half = (block_size + 15) // 2
+        
+        glow_rects = np.stack([screen_x - glow_half, screen_y - glow_half,
+                               screen_x + glow_half, screen_y + glow_half], axis=1)
+        visible = self._cull_hidden(frame.shape, gy, footprints, glow_rects)
+        gx, gy, gz, indices = gx[visible], gy[visible], gz[visible], indices[visible]
+        screen_x, screen_y = screen_x[visible], screen_y[visible]
+        half, glow_half = half[visible], glow_half[visible]
+        footprints = footprints[visible]
+        
+        # Smallest cell step in each direction at which two footprints are disjoint
+        step_x = max(1, self.frame_width // grid_size)
+        step_z = max(1, self.frame_height // grid_size)
+        class_x = gx % -(-(footprints[:, 2] - footprints[:, 0] + 1) // step_x)
+        class_z = gz % -(-(footprints[:, 3] - footprints[:, 1] + 1) // step_z)
+        
+        glows = self._rect_polys(screen_x, screen_y, glow_half)
+        # 3 px border and height line as three 1 px outlines each
+        borders = np.stack([self._rect_polys(screen_x, screen_y, half + d) for d in (-1, 0, 1)], axis=1)
+        line_top = screen_y + half - 1
+        line_bottom = line_top + gy * 15 + 2
+        lines = np.stack([np.stack([np.stack([screen_x + d, line_top], axis=1),
+                                    np.stack([screen_x + d, line_bottom], axis=1)], axis=1)
+                          for d in (-1, 0, 1)], axis=1).astype(np.int32)
+        bgr = np.maximum((rgb[:, ::-1] * 255).astype(np.int64), 1)
+        
+        # Depth order first, then one residue class at a time, colors contiguous
+        order = np.lexsort((indices, class_z, class_x, gy))
+        waves = (gy[order] * 4096 + class_x[order]) * 4096 + class_z[order]
+        for wave in self._runs(waves):
+            members = order[wave]
+            
+            # Glow and main block, one fillPoly per color
+            for run in self._runs(indices[members]):
+                batch = members[run]
+                cv2.fillPoly(frame, glows[batch], tuple(bgr[indices[batch[0]]].tolist()))
+            
+            cv2.polylines(frame, borders[members].reshape(-1, 4, 2), True, (255, 255, 255), 1)
+            
+            # Height indicator lines
+            if gy[members[0]] > 0:
+                for run in self._runs(indices[members]):
+                    batch = members[run]
+                    cv2.polylines(frame, lines[batch].reshape(-1, 2, 2), False,
+                                  tuple(bgr[indices[batch[0]]].tolist()), 1)
+    
+    def _cull_hidden(self, shape, gy, footprints, glow_rects):
+        """
+        Find blocks that are not fully hidden under the glow squares of
+        higher layers (which are drawn later and are opaque).
+        
+        Coverage is kept on a grid of CULL_TILE pixel tiles, where a tile
+        only counts as covered when one glow square covers all of it, so
+        the test never culls a block that would show.
+        
+        Args:
+            shape: Shape of the view being drawn
+            gy: (N,) layer of every block
+            footprints: (N, 4) inclusive view rectangles of everything a block draws
+            glow_rects: (N, 4) inclusive view rectangles of the glow squares
+        
+        Returns:
+            (N,) bool array, True for blocks that have to be drawn
+        """
+        height, width = shape[:2]
+        tiles_y = -(-height // CULL_TILE)
+        tiles_x = -(-width // CULL_TILE)
+        
+        # Tiles each footprint touches
+        touch_x0 = np.clip(footprints[:, 0], 0, width - 1) // CULL_TILE
+        touch_y0 = np.clip(footprints[:, 1], 0, height - 1) // CULL_TILE
+        touch_x1 = np.clip(footprints[:, 2], 0, width - 1) // CULL_TILE
+        touch_y1 = np.clip(footprints[:, 3], 0, height - 1) // CULL_TILE
+        area = (touch_x1 - touch_x0 + 1) * (touch_y1 - touch_y0 + 1)
+        
+        # Tiles each glow square covers completely (tiles cut by the view edge count whole)
+        x0 = np.maximum(glow_rects[:, 0], 0)
+        y0 = np.maximum(glow_rects[:, 1], 0)
+        x1 = np.minimum(glow_rects[:, 2], width - 1)
+        y1 = np.minimum(glow_rects[:, 3], height - 1)
+        cover_x0 = -(-x0 // CULL_TILE)
+        cover_y0 = -(-y0 // CULL_TILE)
+        cover_x1 = np.where(x1 >= width - 1, tiles_x - 1, (x1 + 1) // CULL_TILE - 1)
+        cover_y1 = np.where(y1 >= height - 1, tiles_y - 1, (y1 + 1) // CULL_TILE - 1)
+        covers = (cover_x1 >= cover_x0) & (cover_y1 >= cover_y0)
+        
+        visible = np.ones(len(gy), dtype=bool)
+        covered = np.zeros((tiles_y, tiles_x), dtype=bool)
+        table = np.zeros((tiles_y + 1, tiles_x + 1), dtype=np.int32)  # summed-area table of covered
+        order = np.argsort(-gy, kind='stable')
+        for layer in self._runs(gy[order]):
+            members = order[layer]
+            if table[-1, -1]:
+                inside = (table[touch_y1[members] + 1, touch_x1[members] + 1]
+                          - table[touch_y0[members], touch_x1[members] + 1]
+                          - table[touch_y1[members] + 1, touch_x0[members]]
+                          + table[touch_y0[members], touch_x0[members]])
+                visible[members] = inside < area[members]
+            
+            # Add this layer's glow squares for the layers below
+            members = members[covers[members]]
+            if len(members) == 0:
+                continue
+            stride = tiles_x + 1
+            corners = np.concatenate([cover_y0[members] * stride + cover_x0[members],
+                                      cover_y0[members] * stride + cover_x1[members] + 1,
+                                      (cover_y1[members] + 1) * stride + cover_x0[members],
+                                      (cover_y1[members] + 1) * stride + cover_x1[members] + 1])
+            signs = np.repeat(np.array([1, -1, -1, 1]), len(members))
+            diff = np.bincount(corners, signs, (tiles_y + 1) * stride).reshape(tiles_y + 1, stride)
+            # The summed-area table of the corner marks is the per-tile cover count
+            covered |= cv2.integral(diff, sdepth=cv2.CV_64F)[1:-1, 1:-1] > 0
+            if covered.all():
+                # Everything further down is hidden
+                remaining = order[layer.stop:]
+                visible[remaining] = False
+                break
+            table = cv2.integral(covered.view(np.uint8))
+        return visible
+    
+    @staticmethod
+    def _rect_polys(center_x, center_y, half):
+        """(N, 4, 2) int32 corner polygons of squares with inclusive half extents."""
+        x0, x1 = center_x - half, center_x + half
+        y0, y1 = center_y - half, center_y + half
+        return np.stack([np.stack([x0, y0], axis=1), np.stack([x1, y0], axis=1),
+                         np.stack([x1, y1], axis=1), np.stack([x0, y1], axis=1)],
+                        axis=1).astype(np.int32)
+    
+    @staticmethod
+    def _runs(keys):
+        """Slices of the runs of equal values in a sorted key array."""
+        starts = np.flatnonzero(np.diff(keys)) + 1
+        bounds = [0] + starts.tolist() + [len(keys)]
+        return [slice(a, b) for a, b in zip(bounds[:-1], bounds[1:])]
     
     def _render_hud(self, frame, hand_tracker):
         """Render Iron Man style HUD around hand."""
         hand_pos = hand_tracker.get_hand_position()
-        if not hand_pos:
+        if hand_pos is None:
             return
         
         hx, hy = int(hand_pos[0]), int(hand_pos[1])
@@ -206,13 +817,8 @@ class HologramRenderer:
     
     def _render_ui_info(self, frame, grid_world, hand_tracker):
         """Render UI information overlay."""
-        # Background panel
-        cv2.rectangle(frame, (10, 10), (300, 150), (0, 0, 0), -1)
-        cv2.rectangle(frame, (10, 10), (300, 150), (0, 200, 255), 2)
-        
-        # Title
-        cv2.putText(frame, "BlocksByPi", (20, 35),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        # Panels, title and control hints come from the cached layer
+        self.chrome_layer.composite(frame)
         
         # Info text
         y_offset = 60
@@ -226,6 +832,16 @@ class HologramRenderer:
             cv2.putText(frame, text, (20, y_offset),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
             y_offset += 25
+    
+    def _draw_ui_chrome(self, frame):
+        """Draw the static UI panels and texts, returning the boxes they cover."""
+        # Background panel
+        cv2.rectangle(frame, (10, 10), (300, 150), (0, 0, 0), -1)
+        cv2.rectangle(frame, (10, 10), (300, 150), (0, 200, 255), 2)
+        
+        # Title
+        cv2.putText(frame, "BlocksByPi", (20, 35),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
         
         # Controls hint
         cv2.rectangle(frame, (10, self.frame_height - 100), (350, self.frame_height - 10), (0, 0, 0), -1)
@@ -234,7 +850,8 @@ class HologramRenderer:
         controls = [
             "ESC: Exit | R: Reset | G: Grid | H: HUD",
             "Open Palm: Place | Fist: Delete",
-            "Index: Move | Thumb Up: Color"
+            "Index: Move | Thumb Up: Color",
+            "Two Fingers: Orbit | O: 3D View"
         ]
         
         y_offset = self.frame_height - 80
@@ -243,9 +860,13 @@ class HologramRenderer:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
             y_offset += 20
     
+        # Border lines are 2 px wide and reach one pixel outside the rectangles
+        return [(9, 9, 301, 151), (9, self.frame_height - 101, 351, self.frame_height - 9)]
+    
     def toggle_grid(self):
         """Toggle grid visibility."""
         self.show_grid = not self.show_grid
+        self.invalidate_static_layers()
         print(f"Grid: {'ON' if self.show_grid else 'OFF'}")
     
     def toggle_hud(self):
@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import threading
+from contextlib import nullcontext
+
+import cv2
+import numpy as np
+
+# Shared no-op context for code paths running without a monitor
+NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """Context manager timing one stage with perf_counter_ns."""
+    
+    __slots__ = ('monitor', 'name', 'start')
+    
+    def __init__(self, monitor, name):
+        self.monitor = monitor
+        self.name = name
+        self.start = 0
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.monitor.record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class LatencyMonitor:
+    """
+    Per-stage latency instrumentation.
+    
+    Every stage keeps a rolling window of its last samples in a preallocated
+    array, so p50/p95/p99 reflect recent behaviour at constant memory. The
+    summary can be drawn as an overlay and dumped periodically to CSV or
+    JSON lines for long-session charts.
+    """
+    
+    def __init__(self, window=600, dump_path=None, dump_interval=10.0):
+        """
+        Initialize the monitor.
+        
+        Args:
+            window: Samples kept per stage
+            dump_path: File to append summaries to (.csv, otherwise JSON lines)
+            dump_interval: Seconds between periodic dumps
+        """
+        self.window = window
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.show_overlay = False
+        
+        self.samples = {}   # stage -> int64 ring of durations in ns
+        self.counts = {}    # stage -> total samples recorded
+        self.order = []     # stages in first-seen order
+        self.lock = threading.Lock()
+        self.last_dump = time.perf_counter()
+    
+    def span(self, name):
+        """Return a context manager that records the duration of its block."""
+        return _Span(self, name)
+    
+    def record(self, name, duration_ns):
+        """Record one sample for a stage."""
+        ring = self.samples.get(name)
+        if ring is None:
+            with self.lock:
+                ring = self.samples.get(name)
+                if ring is None:
+                    ring = np.zeros(self.window, dtype=np.int64)
+                    self.samples[name] = ring
+                    self.counts[name] = 0
+                    self.order.append(name)
+        
+        count = self.counts[name]
+        ring[count % self.window] = duration_ns
+        self.counts[name] = count + 1
+    
+    def record_since(self, name, start_seconds):
+        """Record the time elapsed since a time.perf_counter() timestamp."""
+        self.record(name, int((time.perf_counter() - start_seconds) * 1e9))
+    
+    def stats(self, name):
+        """
+        Summary of a stage's rolling window.
+        
+        Returns:
+            Dict with count, mean, p50, p95 and p99 in milliseconds
+        """
+        count = self.counts.get(name, 0)
+        if count == 0:
+            return None
+        window = self.samples[name][:min(count, self.window)] / 1e6
+        p50, p95, p99 = np.percentile(window, (50, 95, 99))
+        return {
+            'count': count,
+            'mean': float(window.mean()),
+            'p50': float(p50),
+            'p95': float(p95),
+            'p99': float(p99),
+        }
+    
+    def summary(self):
+        """Stats of every stage, in first-seen order."""
+        return {name: self.stats(name) for name in list(self.order)}
+    
+    def toggle_overlay(self):
+        """Toggle the on-screen latency table."""
+        self.show_overlay = not self.show_overlay
+        print(f"Latency overlay: {'ON' if self.show_overlay else 'OFF'}")
+    
+    def draw_overlay(self, frame):
+        """Draw the p50/p95/p99 table in the top-right corner of the frame."""
+        if not self.show_overlay:
+            return
+        
+        rows = [(name, stats) for name, stats in self.summary().items() if stats]
+        width = 360
+        height = 30 + 18 * len(rows)
+        x0 = frame.shape[1] - width - 10
+        y0 = 10
+        
+        cv2.rectangle(frame, (x0, y0), (x0 + width, y0 + height), (0, 0, 0), -1)
+        cv2.rectangle(frame, (x0, y0), (x0 + width, y0 + height), (0, 200, 255), 1)
+        cv2.putText(frame, "stage               p50    p95    p99 ms", (x0 + 8, y0 + 18),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.42, (0, 255, 255), 1)
+        
+        y = y0 + 36
+        for name, stats in rows:
+            text = f"{name[:18]:<18} {stats['p50']:6.1f} {stats['p95']:6.1f} {stats['p99']:6.1f}"
+            cv2.putText(frame, text, (x0 + 8, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (255, 255, 255), 1)
+            y += 18
+    
+    def maybe_dump(self):
+        """Dump the summary if a dump path is set and the interval has elapsed."""
+        if not self.dump_path:
+            return
+        now = time.perf_counter()
+        if now - self.last_dump >= self.dump_interval:
+            self.last_dump = now
+            self.dump(self.dump_path)
+    
+    def dump(self, path):
+        """Append the current summary to a CSV or JSON-lines file."""
+        timestamp = time.time()
+        summary = self.summary()
+        
+        if path.endswith('.csv'):
+            new_file = not os.path.exists(path)
+            with open(path, 'a') as f:
+                if new_file:
+                    f.write("timestamp,stage,count,mean_ms,p50_ms,p95_ms,p99_ms\n")
+                for name, stats in summary.items():
+                    if stats:
+                        f.write(f"{timestamp:.3f},{name},{stats['count']},{stats['mean']:.4f},"
+                                f"{stats['p50']:.4f},{stats['p95']:.4f},{stats['p99']:.4f}\n")
+        else:
+            with open(path, 'a') as f:
+                f.write(json.dumps({'timestamp': timestamp, 'stages': summary}) + "\n")
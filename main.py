@@ -1,100 +1,147 @@
 #build by Piyushimp
 import cv2
+import os
 import sys
 import time
+import queue
+import argparse
 from camera import CameraFeed
+from frame_sources import create_source
 from hand_tracking import HandTracker
 from grid_world import GridWorld
 from hologram_renderer import HologramRenderer
+from pipeline import FramePacket, LatestQueue, StageFinished, StageWorker
+from gestures import GestureEngine, TwoHandGestures
+from gesture_classifier import GestureRecorder, load_classifier
+from instrumentation import LatencyMonitor
+from edit_journal import EditJournal
+from world_io import AutosaveWorker, load_world
+from output_sinks import create_sinks
 
 class IronManARBuilder:
     """
     Main application class that orchestrates all modules.
     """
     
-    def __init__(self):
-        """Initialize all system components."""
+    def __init__(self, source=None, run_mode='serial', inference_workers=0,
+                 inference_mode='full', keyframe_interval=1, profile=False,
+                 profile_dump=None, grid_size=20, storage='auto', world_path=None,
+                 view_mode='flat', max_hands=1, gesture_model=None, record_gestures=None,
+                 headless=False, save_video=None, save_frames=None):
+        """
+        Initialize all system components.
+        
+        Args:
+            source: Optional FrameSource to use instead of the default webcam
+            run_mode: 'serial' runs every stage in turn on one thread,
+                      'pipelined' overlaps tracking, rendering and display
+            inference_workers: Number of hand inference processes (0 = in-process)
+            inference_mode: 'full', 'downscale' or 'roi' (see HandTracker)
+            keyframe_interval: Run hand inference every N frames and use
+                               optical flow in between (1 = every frame)
+            profile: Show the per-stage latency overlay from the start
+            profile_dump: Append latency summaries to this .csv/.jsonl file
+            grid_size: Blocks per world dimension (up to 1024 with chunked storage)
+            storage: GridWorld storage backend ('auto', 'dense', 'chunked', 'dict')
+            world_path: World file to load (if it exists) and autosave to
+            view_mode: 'flat' top-down view or 'projected' 3D view (toggle with O)
+            max_hands: Hands to track; two enable the two-hand gestures
+            gesture_model: Trained gesture classifier file (see train_gestures.py),
+                           the built-in rules when None
+            record_gestures: Record labelled landmark traces to this .npz file
+                             (digit keys 0-5 pick the gesture code being shown)
+            headless: Run without a window (stop with Ctrl+C or when the source ends)
+            save_video: Also encode the output into this video file
+            save_frames: Also write the output to this .mjpeg (or raw bgr24) file
+        """
+        if run_mode not in ('serial', 'pipelined'):
+            raise ValueError(f"Unknown run mode: {run_mode}")
+        self.run_mode = run_mode
+        
         print("="*60)
         print("BlocksByPi")
         print("="*60)
         
         # Initialize camera
         print("\n[1/4] Initializing camera...")
-        self.camera = CameraFeed(camera_id=0, width=1280, height=720)
+        # Pipelined mode keeps up to five frames in flight, rendered frames
+        # included (plus one per inference worker), give the ring headroom
+        buffer_size = 8 + inference_workers if run_mode == 'pipelined' else 4
+        self.camera = CameraFeed(camera_id=0, width=1280, height=720, source=source,
+                                 buffer_size=buffer_size)
         self.camera.start()
         time.sleep(1)  # Wait for camera to warm up
         
         # Initialize hand tracking
         print("[2/4] Loading hand tracking model...")
-        self.hand_tracker = HandTracker(max_hands=1)
+        classifier = load_classifier(gesture_model) if gesture_model else None
+        self.hand_tracker = HandTracker(max_hands=max_hands, inference_workers=inference_workers,
+                                        inference_mode=inference_mode,
+                                        keyframe_interval=keyframe_interval,
+                                        classifier=classifier)
+        self.recorder = GestureRecorder(record_gestures) if record_gestures else None
         
         # Initialize grid world
         print("[3/4] Creating 3D grid world...")
-        self.grid_world = GridWorld(grid_size=20, block_size=0.5)
+        if world_path and os.path.exists(world_path):
+            self.grid_world = load_world(world_path, storage=storage)
+            print(f"Loaded {self.grid_world.get_block_count()} blocks from {world_path}")
+        else:
+            self.grid_world = GridWorld(grid_size=grid_size, block_size=0.5, storage=storage)
+        self.journal = EditJournal(self.grid_world)
+        self.autosave = AutosaveWorker(self.grid_world, world_path).start() if world_path else None
         
         # Initialize renderer
         print("[4/4] Setting up hologram renderer...")
         width, height = self.camera.get_dimensions()
-        self.renderer = HologramRenderer(width, height)
+        self.renderer = HologramRenderer(width, height, view_mode=view_mode)
+        
+        # Per-stage latency instrumentation
+        self.monitor = LatencyMonitor(dump_path=profile_dump)
+        self.monitor.show_overlay = profile
+        self.renderer.monitor = self.monitor
+        
+        # Window and file outputs on their own threads; window keys arrive on input_events
+        self.input_events = queue.Queue()
+        self.sinks = create_sinks(self.input_events, headless=headless, video_path=save_video,
+                                  frames_path=save_frames, monitor=self.monitor)
         
         print("\n✓ System ready!\n")
         
         # State variables
         self.running = False
-        self.last_gesture = None
-        self.gesture_cooldown = 0
+        self.gesture_engine = GestureEngine()
+        self.two_hands = TwoHandGestures()
+        self.primary_track = None  # track ID of the hand driving the cursor
+        self.rotate_anchor = None  # hand position the current orbit step started from
         self.fps_counter = FPSCounter()
         
     def run(self):
         """Main application loop."""
         self.running = True
         
-        print("Starting AR Builder...")
+        print(f"Starting AR Builder ({self.run_mode} mode)...")
         print("\nControls:")
         print("  ESC - Exit")
         print("  R - Reset world")
         print("  G - Toggle grid")
         print("  H - Toggle HUD")
-        print("  Q/E - Move cursor up/down\n")
+        print("  Q/E - Move cursor up/down")
+        print("  P - Toggle latency overlay")
+        print("  O - Toggle 3D view (two fingers + move hand: orbit)")
+        print("  Two hands: pinch both to zoom, open both palms to rotate, point both to select a box")
+        print("  M - Set anchor | F/X - Fill/clear box | L - Line (anchor to cursor)")
+        print("  C - Copy box | T - Rotate copy | V - Paste at cursor")
+        print("  Z/Y - Undo/redo (including R)")
+        if self.recorder is not None:
+            print("  0-5 - Record the gesture code being shown (see GESTURES)")
+        print()
         
         try:
-            while self.running:
-                # Get camera frame
-                frame = self.camera.read()
-                if frame is None:
-                    continue
-                
-                # Process hand tracking
-                frame = self.hand_tracker.process_frame(frame)
-                
-                # Update cursor based on hand position
-                hand_pos = self.hand_tracker.get_hand_position()
-                if hand_pos:
-                    self.grid_world.update_cursor(hand_pos[0], hand_pos[1], 
-                                                  frame.shape[1], frame.shape[0])
-                
-                # Handle gestures
-                self._handle_gestures()
-                
-                # Render holograms
-                output = self.renderer.render_frame(frame, self.grid_world, self.hand_tracker)
-                
-                # Add FPS counter
-                fps = self.fps_counter.update()
-                cv2.putText(output, f"FPS: {fps:.1f}", (10, self.renderer.frame_height - 110),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                
-                # Display
-                cv2.imshow('Iron Man AR Builder', output)
-                
-                # Handle keyboard input
-                key = cv2.waitKey(1) & 0xFF
-                if not self._handle_keyboard(key):
-                    break
-                
-                # Gesture cooldown
-                if self.gesture_cooldown > 0:
-                    self.gesture_cooldown -= 1
+            if self.run_mode == 'pipelined':
+                self._run_pipelined()
+            else:
+                self._run_serial()
                     
         except KeyboardInterrupt:
             print("\nInterrupted by user")
@@ -105,36 +152,316 @@ class IronManARBuilder:
         finally:
             self.cleanup()
     
-    def _handle_gestures(self):
+    def _run_serial(self):
+        """Run every stage one after another on the main thread."""
+        last_seq = -1
+        while self.running:
+            # Wait for a frame we have not processed yet
+            with self.monitor.span('capture_wait'):
+                packet = self.camera.read_next(last_seq, timeout=1.0)
+            if packet is None:
+                if not self.camera.is_running():
+                    print("Frame source finished")
+                    break
+                continue
+            seq, frame, timestamp = packet
+            last_seq = seq
+            
+            # Process hand tracking
+            with self.monitor.span('tracking'):
+                frame = self.hand_tracker.process_frame(frame)
+            
+            # Update cursor and handle gestures
+            with self.monitor.span('gestures'):
+                self._update_world(self.hand_tracker, timestamp)
+            
+            # Render holograms in place, the camera slot is ours until released
+            with self.monitor.span('render'):
+                output = self.renderer.render_frame(frame, self.grid_world, self.hand_tracker,
+                                                    out=frame)
+            
+            # Display with FPS counter
+            fps = self.fps_counter.update()
+            keys = self._display(output, f"FPS: {fps:.1f}", timestamp)
+            
+            # Hand the frame slot back to the camera
+            self.camera.release(seq)
+            
+            # Handle keyboard input
+            if not all(self._handle_keyboard(key) for key in keys):
+                break
+    
+    def _run_pipelined(self):
+        """
+        Run tracking and rendering on their own threads, display on the main one.
+        
+        Stages are connected by latest-wins queues, so MediaPipe inference on
+        frame N+1 overlaps with drawing frame N at the cost of about one frame
+        of extra latency.
+        """
+        self.track_queue = LatestQueue(maxsize=1, on_drop=self._drop_packet)
+        self.display_queue = LatestQueue(maxsize=1, on_drop=self._drop_packet)
+        self.key_events = queue.Queue()
+        self.last_seq = -1
+        
+        workers = [
+            StageWorker('tracking', self._tracking_stage, on_error=self._stage_failed),
+            StageWorker('render', self._render_stage, on_error=self._stage_failed),
+        ]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            while self.running:
+                packet = self.display_queue.get(timeout=0.1)
+                if packet is None:
+                    continue
+                
+                # Capture-to-display latency of this frame
+                latency_ms = (time.perf_counter() - packet.timestamp) * 1000
+                fps = self.fps_counter.update()
+                keys = self._display(packet.output, f"FPS: {fps:.1f}  Latency: {latency_ms:.0f} ms",
+                                     packet.timestamp)
+                # Output was copied for the sinks, return the camera slot
+                self.camera.release(packet.seq)
+                
+                if 27 in keys:  # ESC
+                    break
+                for key in keys:
+                    # World and renderer belong to the render stage, apply keys there
+                    self.key_events.put(key)
+        finally:
+            self.running = False
+            self.track_queue.close()
+            self.display_queue.close()
+            for worker in workers:
+                worker.stop()
+    
+    def _tracking_stage(self):
+        """Pipeline stage: wait for a new camera frame and run hand tracking."""
+        if self.hand_tracker.inference_workers:
+            self._pooled_tracking_stage()
+            return
+        
+        captured = self.camera.read_next(self.last_seq, timeout=0.5)
+        if captured is None:
+            if not self.camera.is_running():
+                self._source_finished()
+            return
+        
+        seq, frame, timestamp = captured
+        self.last_seq = seq
+        
+        packet = FramePacket(seq, frame, timestamp)
+        with self.monitor.span('tracking'):
+            packet.frame = self.hand_tracker.process_frame(frame)
+        packet.hand_state = self.hand_tracker.snapshot()
+        self.track_queue.put(packet)
+    
+    def _pooled_tracking_stage(self):
+        """
+        Pipeline stage for out-of-process inference: keep one frame in flight
+        per worker and forward results in capture order.
+        """
+        if self.hand_tracker.pending_frames() < self.hand_tracker.inference_workers:
+            captured = self.camera.read_next(self.last_seq, timeout=0.5)
+            if captured is None:
+                if not self.camera.is_running():
+                    self._source_finished()
+                return
+            
+            seq, frame, timestamp = captured
+            self.last_seq = seq
+            packet = FramePacket(seq, frame, timestamp)
+            if not self.hand_tracker.submit_frame(frame, packet):
+                self.camera.release(seq)
+            return
+        
+        with self.monitor.span('tracking'):
+            collected = self.hand_tracker.collect_frame(timeout=0.5)
+        if collected is None:
+            return
+        frame, packet = collected
+        packet.frame = frame
+        packet.hand_state = self.hand_tracker.snapshot()
+        self.track_queue.put(packet)
+    
+    def _render_stage(self):
+        """Pipeline stage: apply gestures and keys, then render the frame."""
+        packet = self.track_queue.get(timeout=0.1)
+        if packet is None:
+            return
+        
+        self._drain_key_events()
+        with self.monitor.span('gestures'):
+            self._update_world(packet.hand_state, packet.timestamp)
+        with self.monitor.span('render'):
+            packet.output = self.renderer.render_frame(packet.frame, self.grid_world, packet.hand_state,
+                                                       out=packet.frame)
+        
+        # The display loop releases the camera slot after showing it
+        packet.frame = None
+        self.display_queue.put(packet)
+    
+    def _source_finished(self):
+        """End the tracking stage and the application once the frame source is exhausted."""
+        print("Frame source finished")
+        self.running = False
+        raise StageFinished()
+    
+    def _drop_packet(self, packet):
+        """Return the camera buffer of a packet a faster stage overwrote."""
+        self.camera.release(packet.seq)
+    
+    def _stage_failed(self, error):
+        """Stop the application when a pipeline stage raises."""
+        self.running = False
+    
+    def _drain_key_events(self):
+        """Apply keys queued by the display thread."""
+        while True:
+            try:
+                key = self.key_events.get_nowait()
+            except queue.Empty:
+                return
+            self._handle_keyboard(key)
+    
+    def _update_world(self, hand, timestamp):
+        """
+        Move the cursor and apply gestures for one tracked frame.
+        
+        Args:
+            hand: HandTracker or HandState with this frame's results
+            timestamp: Capture time of the frame (time.perf_counter() seconds)
+        """
+        if self.recorder is not None:
+            self.recorder.add(hand.state if hasattr(hand, 'state') else hand)
+        
+        # Debounced gestures belong to one hand, start over when it changes
+        track = hand.get_primary_track()
+        if track != self.primary_track:
+            self.primary_track = track
+            self.gesture_engine.reset()
+        
+        # Two-hand gestures take over from single-hand ones while active
+        two_hand = self.two_hands.update(hand, timestamp)
+        if two_hand is not None:
+            self.gesture_engine.update(None, timestamp)
+            self.rotate_anchor = None
+            self._apply_two_hand(*two_hand)
+            return
+        
+        # Aim the cursor with a ray through the index fingertip (held still while orbiting)
+        tip = hand.get_index_position()
+        if tip is not None and self.gesture_engine.get_active() != 'rotate':
+            self._aim(tip)
+        
+        # Handle gestures
+        self._handle_gestures(hand, timestamp)
+    
+    def _aim(self, point):
+        """Point the cursor along the view ray through a screen position."""
+        origin, direction = self.renderer.pick_ray(float(point[0]), float(point[1]), self.grid_world)
+        self.grid_world.aim_cursor(origin, direction)
+    
+    def _apply_two_hand(self, gesture, value):
+        """
+        Apply one frame of a two-hand gesture.
+        
+        Args:
+            gesture: 'zoom', 'rotate' or 'select' (see TwoHandGestures)
+            value: Scale factor, angle in degrees or two fingertip positions
+        """
+        if gesture == 'zoom':
+            self.renderer.zoom(value)
+        elif gesture == 'rotate':
+            self.renderer.orbit(value, 0.0)
+        elif gesture == 'select':
+            # First fingertip marks the anchor, the second the cursor (F/X/C act on the box)
+            first, second = value
+            self._aim(first)
+            self.grid_world.anchor_pos = self.grid_world.get_cursor_position()
+            self._aim(second)
+    
+    def _display(self, output, status, timestamp):
+        """
+        Hand a rendered frame to the output sinks and collect key presses.
+        
+        The sinks show and encode on their own threads, so this only copies
+        the frame (the camera slot it lives in is released right after).
+        
+        Args:
+            output: Rendered frame
+            status: Status line drawn above the controls panel
+            timestamp: Capture time of the frame, for motion-to-photon latency
+        
+        Returns:
+            List of key codes pressed since the last call
+        """
+        cv2.putText(output, status, (10, self.renderer.frame_height - 110),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        self.monitor.draw_overlay(output)
+        
+        # One copy shared by every sink, none of them modifies it
+        if self.sinks:
+            with self.monitor.span('output'):
+                shown = output.copy()
+                for sink in self.sinks:
+                    sink.write(shown, timestamp)
+        
+        self.monitor.maybe_dump()
+        
+        keys = []
+        while True:
+            try:
+                keys.append(self.input_events.get_nowait())
+            except queue.Empty:
+                return keys
+    
+    def _handle_gestures(self, hand=None, timestamp=None):
         """Process hand gestures for block building."""
-        gesture = self.hand_tracker.get_gesture()
+        if hand is None:
+            hand = self.hand_tracker
+        if timestamp is None:
+            timestamp = time.perf_counter()
         
-        # Only process new gestures after cooldown
-        if gesture and gesture != self.last_gesture and self.gesture_cooldown == 0:
-            cursor = self.grid_world.get_cursor_position()
+        # Debounce on frame time: hold, repeat and cooldown are in milliseconds
+        gesture = self.gesture_engine.update(hand.get_gesture(), timestamp, hand.get_confidence())
+        self._orbit_view(hand)
+        if gesture is None:
+            return
             
-            if gesture == 'place':
-                # Place block at cursor
-                if self.grid_world.place_block(*cursor):
-                    print(f"Block placed at {cursor}")
-                    self.gesture_cooldown = 15  # Prevent spam
+        cursor = self.grid_world.get_cursor_position()
                     
-            elif gesture == 'delete':
-                # Remove block at cursor
-                if self.grid_world.remove_block(*cursor):
-                    print(f"Block removed from {cursor}")
-                    self.gesture_cooldown = 15
+        if gesture == 'place':
+            # Place block at cursor, in front of the face pointed at
+            if self.grid_world.place_block(*cursor):
+                print(f"Block placed at {cursor}")
                     
-            elif gesture == 'change_color':
-                # Cycle color palette
-                self.grid_world.cycle_color()
-                self.gesture_cooldown = 30  # Longer cooldown for color change
+        elif gesture == 'delete':
+            # Remove the block pointed at, or the one at the cursor
+            target = self.grid_world.target_pos or cursor
+            if self.grid_world.remove_block(*target):
+                print(f"Block removed from {target}")
             
-            self.last_gesture = gesture
+        elif gesture == 'change_color':
+            # Cycle color palette
+            self.grid_world.cycle_color()
+    
+    def _orbit_view(self, hand):
+        """Turn the 3D view with the hand's motion while the rotate gesture is held."""
+        hand_pos = hand.get_hand_position()
+        if self.gesture_engine.get_active() != 'rotate' or hand_pos is None:
+            self.rotate_anchor = None
+            return
         
-        # Reset last gesture if hand is idle
-        if gesture is None:
-            self.last_gesture = None
+        position = (float(hand_pos[0]), float(hand_pos[1]))
+        if self.rotate_anchor is not None:
+            # Half a turn across the frame width, a quarter across its height
+            d_yaw = (position[0] - self.rotate_anchor[0]) / self.renderer.frame_width * 180.0
+            d_pitch = (position[1] - self.rotate_anchor[1]) / self.renderer.frame_height * 90.0
+            self.renderer.orbit(-d_yaw, d_pitch)
+        self.rotate_anchor = position
     
     def _handle_keyboard(self, key):
         """Handle keyboard input.
@@ -165,15 +492,87 @@ class IronManARBuilder:
             # Move cursor up
             self.grid_world.move_cursor_up()
         
+        elif key == ord('p') or key == ord('P'):
+            # Toggle latency overlay
+            self.monitor.toggle_overlay()
+        
+        elif key == ord('o') or key == ord('O'):
+            # Toggle the projected 3D view
+            self.renderer.toggle_view()
+        
+        elif key == ord('m') or key == ord('M'):
+            # Mark the second corner for box and line edits
+            self.grid_world.set_anchor()
+        
+        elif key == ord('f') or key == ord('F'):
+            self._anchor_edit(self.grid_world.fill_box)
+        
+        elif key == ord('x') or key == ord('X'):
+            self._anchor_edit(self.grid_world.clear_box)
+        
+        elif key == ord('l') or key == ord('L'):
+            self._anchor_edit(self.grid_world.fill_line)
+        
+        elif key == ord('c') or key == ord('C'):
+            self._anchor_edit(self.grid_world.copy_region)
+        
+        elif key == ord('t') or key == ord('T'):
+            # Quarter turn of the clipboard around the vertical axis
+            self.grid_world.rotate_region()
+        
+        elif key == ord('v') or key == ord('V'):
+            changed = self.grid_world.paste_region(self.grid_world.get_cursor_position())
+            print(f"Pasted: {len(changed)} blocks changed")
+        
+        elif self.recorder is not None and ord('0') <= key <= ord('5'):
+            # Label the following frames with this gesture code
+            self.recorder.label = key - ord('0')
+            print(f"Recording gesture code {self.recorder.label} ({len(self.recorder)} samples so far)")
+        
+        elif key == ord('z') or key == ord('Z'):
+            if not self.journal.undo():
+                print("Nothing to undo")
+        
+        elif key == ord('y') or key == ord('Y'):
+            if not self.journal.redo():
+                print("Nothing to redo")
+        
         return True
     
+    def _anchor_edit(self, operation):
+        """Run a two-corner world edit between the anchor and the cursor."""
+        anchor = self.grid_world.anchor_pos
+        if anchor is None:
+            print("Set an anchor first (M)")
+            return
+        result = operation(anchor, self.grid_world.get_cursor_position())
+        if result is None:
+            return
+        if result.ndim == 3:
+            # copy_region returns the copied block of cells
+            print(f"{operation.__name__}: {result.size} cells copied")
+        else:
+            # Edits return the (N, 3) coordinates of the cells they changed
+            print(f"{operation.__name__}: {len(result)} cells changed")
+    
     def cleanup(self):
         """Clean up resources."""
         print("\nShutting down...")
         self.running = False
+        if self.monitor.dump_path:
+            self.monitor.dump(self.monitor.dump_path)
+        if self.autosave is not None:
+            self.autosave.stop()
+        if self.recorder is not None:
+            self.recorder.save()
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                # Keep shutting down the camera and tracker
+                print(f"Could not close output '{sink.name}': {e}")
         self.camera.stop()
         self.hand_tracker.close()
-        cv2.destroyAllWindows()
         print("Goodbye!")
 
 class FPSCounter:
@@ -195,10 +594,69 @@ class FPSCounter:
         
         return self.fps
 
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="BlocksByPi hand-gesture block builder")
+    parser.add_argument('--source', default='webcam',
+                        help="Frame source: webcam[:id], video:<path>, images:<dir>, synthetic[:frames]")
+    parser.add_argument('--unpaced', action='store_true',
+                        help="Deliver source frames as fast as possible instead of in real time")
+    parser.add_argument('--loop', action=argparse.BooleanOptionalAction, default=None,
+                        help="Restart video/image sources when they run out "
+                             "(default: image folders loop, videos stop)")
+    parser.add_argument('--source-fps', type=float, default=None,
+                        help="Delivery rate of images/synthetic sources (default: 30)")
+    parser.add_argument('--mode', choices=('serial', 'pipelined'), default='serial',
+                        help="Run stages one after another or overlapped on worker threads")
+    parser.add_argument('--inference-workers', type=int, default=0,
+                        help="Run hand inference in this many worker processes (0 = in-process)")
+    parser.add_argument('--inference-mode', choices=HandTracker.INFERENCE_MODES, default='full',
+                        help="Feed MediaPipe the full frame, a downscaled frame or a crop around the hand")
+    parser.add_argument('--keyframe-interval', type=int, default=1,
+                        help="Initial frames per hand inference, optical flow in between (1 = off)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Show the per-stage latency overlay (toggle with P)")
+    parser.add_argument('--profile-dump', default=None,
+                        help="Periodically append latency percentiles to this .csv or .jsonl file")
+    parser.add_argument('--grid-size', type=int, default=20,
+                        help="Blocks per world dimension")
+    parser.add_argument('--storage', choices=('auto', 'dense', 'chunked', 'dict'), default='auto',
+                        help="World storage: dense volume, 16^3 chunks on demand, or a dict")
+    parser.add_argument('--world', default=None,
+                        help="World file to load on start and autosave in the background")
+    parser.add_argument('--view', choices=HologramRenderer.VIEW_MODES, default='flat',
+                        help="Top-down flat view or projected 3D view (toggle with O)")
+    parser.add_argument('--max-hands', type=int, default=1,
+                        help="Hands to track (2 enables pinch-zoom, two-hand rotate and box select, "
+                             "at the cost of palm detection on every frame with one hand in view)")
+    parser.add_argument('--gesture-model', default=None,
+                        help="Gesture classifier trained with train_gestures.py (default: built-in rules)")
+    parser.add_argument('--record-gestures', default=None,
+                        help="Record labelled landmark traces to this .npz file for train_gestures.py")
+    parser.add_argument('--headless', action='store_true',
+                        help="Run without a window (stop with Ctrl+C or when the source ends)")
+    parser.add_argument('--save-video', default=None,
+                        help="Also encode the output into this video file (.mp4 or .avi)")
+    parser.add_argument('--save-frames', default=None,
+                        help="Also write the output to this .mjpeg file (other extensions: raw bgr24)")
+    return parser.parse_args(argv)
+
 def main():
     """Entry point of the application."""
+    args = parse_args()
     try:
-        app = IronManARBuilder()
+        source = create_source(args.source, paced=not args.unpaced, loop=args.loop,
+                               fps=args.source_fps)
+        app = IronManARBuilder(source=source, run_mode=args.mode,
+                               inference_workers=args.inference_workers,
+                               inference_mode=args.inference_mode,
+                               keyframe_interval=args.keyframe_interval,
+                               profile=args.profile, profile_dump=args.profile_dump,
+                               grid_size=args.grid_size, storage=args.storage,
+                               world_path=args.world, view_mode=args.view,
+                               max_hands=args.max_hands, gesture_model=args.gesture_model,
+                               record_gestures=args.record_gestures, headless=args.headless,
+                               save_video=args.save_video, save_frames=args.save_frames)
         app.run()
     except Exception as e:
         print(f"Failed to start application: {e}")
@@ -0,0 +1,257 @@
+import os
+import time
+
+import cv2
+
+from pipeline import LatestQueue, StageFinished, StageWorker
+
+
+class OutputSink:
+    """
+    Consumer of rendered frames running on its own thread.
+
+    write() never blocks the render loop: frames go through a bounded
+    latest-wins queue that drops the oldest frame when the sink falls
+    behind. Subclasses implement _consume (and optionally _idle/_release).
+
+    On close the sink thread itself flushes the frames still queued (sinks
+    bound to their thread, thread_bound, drop them instead) and releases
+    the sink, so no sink is ever used from two threads.
+    """
+
+    thread_bound = False
+
+    def __init__(self, name, queue_size=2, monitor=None):
+        """
+        Initialize the sink.
+
+        Args:
+            name: Sink name (thread name and latency stage)
+            queue_size: Frames that may wait for the sink before the oldest is dropped
+            monitor: Optional LatencyMonitor for per-frame sink timings
+        """
+        self.name = name
+        self.queue = LatestQueue(maxsize=queue_size)
+        self.worker = StageWorker(name, self._step)
+        self.monitor = monitor
+        self.written = 0
+        self.closing = False
+
+    def start(self):
+        """Start the sink thread."""
+        self.worker.start()
+        return self
+
+    def write(self, frame, timestamp):
+        """
+        Queue a frame for the sink.
+
+        Args:
+            frame: BGR frame the sink may keep (it is not copied again)
+            timestamp: Capture time of the frame (time.perf_counter() seconds)
+        """
+        self.queue.put((frame, timestamp))
+
+    @property
+    def dropped(self):
+        """Frames dropped because the sink fell behind."""
+        return self.queue.dropped
+
+    def _step(self):
+        """Sink thread body: consume the next frame, or idle briefly."""
+        if self.closing:
+            self._finish()
+            raise StageFinished()
+        item = self.queue.get(timeout=0.02)
+        if item is None:
+            self._idle()
+            return
+        self._process(*item)
+
+    def _process(self, frame, timestamp):
+        """Consume one frame and time it."""
+        start = time.perf_counter_ns()
+        self._consume(frame, timestamp)
+        self.written += 1
+        if self.monitor is not None:
+            self.monitor.record(self.name, time.perf_counter_ns() - start)
+
+    def _consume(self, frame, timestamp):
+        raise NotImplementedError
+
+    def _idle(self):
+        """Called when no frame arrived for a while."""
+
+    def _release(self):
+        """Free the sink's resources (called on the sink thread)."""
+
+    def _finish(self):
+        """Flush (or drop, when thread-bound) the queued frames and release."""
+        while True:
+            item = self.queue.get(timeout=0)
+            if item is None:
+                break
+            if not self.thread_bound:
+                self._process(*item)
+        self._release()
+
+    def close(self):
+        """Have the sink thread flush and release the sink, and wait for it."""
+        self.closing = True
+        self.worker.join()
+        self.queue.close()
+        if self.worker.error is not None and not self.thread_bound:
+            # The sink thread died, nothing else touches the sink any more
+            self._release()
+
+
+class WindowSink(OutputSink):
+    """
+    On-screen window. imshow and waitKey run on the sink thread, so a slow
+    window system never stalls tracking or rendering. Key presses are put
+    on an event queue for the application to handle. The window is created
+    and destroyed on that same thread, as HighGUI backends require.
+    """
+
+    thread_bound = True
+
+    def __init__(self, title, key_events, monitor=None):
+        """
+        Initialize the window sink.
+
+        Args:
+            title: Window title
+            key_events: queue.Queue receiving the key codes pressed in the window
+            monitor: Optional LatencyMonitor, also records motion-to-photon latency
+        """
+        super().__init__('display', queue_size=1, monitor=monitor)
+        self.title = title
+        self.key_events = key_events
+        self.shown = False
+
+    def _consume(self, frame, timestamp):
+        cv2.imshow(self.title, frame)
+        self.shown = True
+        self._poll_keys()
+        if self.monitor is not None:
+            self.monitor.record_since('motion_to_photon', timestamp)
+
+    def _idle(self):
+        # Keep the window responsive between frames
+        if self.shown:
+            self._poll_keys()
+
+    def _poll_keys(self):
+        key = cv2.waitKey(1) & 0xFF
+        if key != 255:
+            self.key_events.put(key)
+
+    def _release(self):
+        if self.shown:
+            cv2.destroyWindow(self.title)
+            cv2.waitKey(1)
+
+
+class VideoFileSink(OutputSink):
+    """Encodes frames into a video file with cv2.VideoWriter on the sink thread."""
+
+    def __init__(self, path, fps=30.0, fourcc=None, queue_size=8, monitor=None):
+        """
+        Initialize the video sink (the file is opened on the first frame).
+
+        Args:
+            path: Output video path (.mp4, .avi, ...)
+            fps: Frame rate stored in the file
+            fourcc: Four-character codec code (default: mp4v, MJPG for .avi)
+            queue_size: Frames buffered before the oldest is dropped
+            monitor: Optional LatencyMonitor
+        """
+        super().__init__('video_sink', queue_size=queue_size, monitor=monitor)
+        self.path = path
+        self.fps = fps
+        if fourcc is None:
+            fourcc = 'MJPG' if path.lower().endswith('.avi') else 'mp4v'
+        self.fourcc = fourcc
+        self.writer = None
+
+    def _consume(self, frame, timestamp):
+        if self.writer is None:
+            h, w = frame.shape[:2]
+            writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc),
+                                     self.fps, (w, h))
+            if not writer.isOpened():
+                raise Exception(f"Could not open video file: {self.path}")
+            self.writer = writer
+        self.writer.write(frame)
+
+    def _release(self):
+        if self.writer is not None:
+            self.writer.release()
+            print(f"Video saved: {self.path} ({self.written} frames, {self.dropped} dropped)")
+
+
+class FrameFileSink(OutputSink):
+    """
+    Appends frames to a file on the sink thread: back-to-back JPEGs (an
+    MJPEG stream, for .mjpeg/.mjpg paths) or raw BGR bytes (anything
+    else, readable as rawvideo bgr24 at the output frame size).
+    """
+
+    def __init__(self, path, quality=85, queue_size=8, monitor=None):
+        """
+        Initialize the frame file sink.
+
+        Args:
+            path: Output file path
+            quality: JPEG quality for MJPEG output (0-100)
+            queue_size: Frames buffered before the oldest is dropped
+            monitor: Optional LatencyMonitor
+        """
+        super().__init__('frame_sink', queue_size=queue_size, monitor=monitor)
+        self.path = path
+        self.mjpeg = os.path.splitext(path)[1].lower() in ('.mjpeg', '.mjpg')
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        self.file = open(path, 'wb')
+        self.shape = None
+
+    def _consume(self, frame, timestamp):
+        if self.mjpeg:
+            ok, encoded = cv2.imencode('.jpg', frame, self.params)
+            if not ok:
+                raise Exception("JPEG encoding failed")
+            self.file.write(encoded.tobytes())
+        else:
+            self.shape = frame.shape
+            self.file.write(frame.tobytes())
+
+    def _release(self):
+        self.file.close()
+        size = f" of {self.shape[1]}x{self.shape[0]} bgr24" if self.shape else ""
+        print(f"Frames saved: {self.path} ({self.written} frames{size}, {self.dropped} dropped)")
+
+
+def create_sinks(key_events, headless=False, video_path=None, frames_path=None,
+                 fps=30.0, title='Iron Man AR Builder', monitor=None):
+    """
+    Build and start the output sinks for the application.
+
+    Args:
+        key_events: queue.Queue receiving window key presses
+        headless: Skip the on-screen window
+        video_path: Also encode the output into this video file
+        frames_path: Also write the output to this MJPEG/raw frame file
+        fps: Frame rate of the video file
+        title: Window title
+        monitor: Optional LatencyMonitor
+
+    Returns:
+        List of started sinks (empty when headless without files)
+    """
+    sinks = []
+    if not headless:
+        sinks.append(WindowSink(title, key_events, monitor=monitor))
+    if video_path:
+        sinks.append(VideoFileSink(video_path, fps=fps, monitor=monitor))
+    if frames_path:
+        sinks.append(FrameFileSink(frames_path, monitor=monitor))
+    return [sink.start() for sink in sinks]
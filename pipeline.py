@@ -0,0 +1,151 @@
+import threading
+import traceback
+from collections import deque
+
+
+class FramePacket:
+    """
+    A frame travelling through the pipeline.
+    Carries its capture sequence number and timestamp so later stages
+    can measure latency and hand the camera buffer back.
+    """
+    
+    __slots__ = ('seq', 'frame', 'timestamp', 'hand_state', 'output')
+    
+    def __init__(self, seq, frame, timestamp):
+        """
+        Initialize a packet.
+        
+        Args:
+            seq: Camera sequence number
+            frame: BGR frame (view into the camera ring)
+            timestamp: time.perf_counter() value at capture
+        """
+        self.seq = seq
+        self.frame = frame
+        self.timestamp = timestamp
+        self.hand_state = None
+        self.output = None
+
+
+class LatestQueue:
+    """
+    Bounded queue with latest-wins semantics.
+    When full, put() evicts the oldest item instead of blocking the producer,
+    so a slow consumer always sees the freshest data.
+    """
+    
+    def __init__(self, maxsize=1, on_drop=None):
+        """
+        Initialize the queue.
+        
+        Args:
+            maxsize: Maximum number of queued items
+            on_drop: Optional callback invoked with each evicted item
+        """
+        self.maxsize = max(1, maxsize)
+        self.on_drop = on_drop
+        self.items = deque()
+        self.closed = False
+        self.dropped = 0
+        self.cond = threading.Condition()
+    
+    def put(self, item):
+        """Add an item, evicting the oldest one if the queue is full."""
+        evicted = None
+        with self.cond:
+            if len(self.items) >= self.maxsize:
+                evicted = self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self.cond.notify()
+        
+        if evicted is not None and self.on_drop:
+            self.on_drop(evicted)
+    
+    def get(self, timeout=None):
+        """
+        Take the oldest item, waiting up to timeout seconds.
+        
+        Returns:
+            The item, or None on timeout or when the queue is closed
+        """
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.items or self.closed, timeout):
+                return None
+            if not self.items:
+                return None
+            return self.items.popleft()
+    
+    def close(self):
+        """Wake up all waiters and hand remaining items to on_drop."""
+        with self.cond:
+            self.closed = True
+            remaining = list(self.items)
+            self.items.clear()
+            self.cond.notify_all()
+        
+        if self.on_drop:
+            for item in remaining:
+                self.on_drop(item)
+
+
+class StageFinished(Exception):
+    """Raised by a step function to end its stage normally (e.g. source exhausted)."""
+
+
+class StageWorker:
+    """
+    Runs one pipeline stage on its own thread.
+    The step function is called repeatedly until stop() is requested or it
+    raises StageFinished; any other exception stops the worker and is kept
+    in `error`.
+    """
+    
+    def __init__(self, name, step, on_error=None):
+        """
+        Initialize the worker.
+        
+        Args:
+            name: Stage name (used for the thread name and messages)
+            step: Callable run once per iteration
+            on_error: Optional callback invoked with the exception on failure
+        """
+        self.name = name
+        self.step = step
+        self.on_error = on_error
+        self.error = None
+        self.running = False
+        self.thread = None
+    
+    def start(self):
+        """Start the stage thread."""
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+    
+    def _run(self):
+        """Internal loop calling the step function."""
+        try:
+            while self.running:
+                self.step()
+        except StageFinished:
+            self.running = False
+        except Exception as e:
+            self.error = e
+            self.running = False
+            print(f"\nStage '{self.name}' failed: {e}")
+            traceback.print_exc()
+            if self.on_error:
+                self.on_error(e)
+    
+    def join(self, timeout=None):
+        """Wait for the stage to end on its own (its step raised StageFinished)."""
+        if self.thread:
+            self.thread.join(timeout=timeout)
+    
+    def stop(self, timeout=1.0):
+        """Ask the stage to stop and wait for its thread."""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=timeout)
@@ -0,0 +1,121 @@
+import math
+import numpy as np
+
+# Brightness of each face direction under a fixed light from above
+FACE_SHADE = np.array([0.75, 0.75, 1.0, 0.4, 0.6, 0.6])
+
+# Cube edges as pairs of corner indices into CUBE_CORNERS
+CUBE_CORNERS = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float64)
+CUBE_EDGES = np.array([[0, 1], [2, 3], [4, 5], [6, 7],
+                       [0, 2], [1, 3], [4, 6], [5, 7],
+                       [0, 4], [1, 5], [2, 6], [3, 7]], dtype=np.intp)
+
+
+class OrbitCamera:
+    """
+    Perspective camera orbiting a target point.
+    Yaw turns around the vertical (y) axis, pitch tilts towards the ground.
+    version is bumped on every change so cached renderings can be reused.
+    """
+
+    def __init__(self, target, distance, yaw=0.0, pitch=35.0, fov=50.0, near=0.5):
+        """
+        Initialize the camera.
+
+        Args:
+            target: (x, y, z) point the camera looks at, in grid units
+            distance: Distance from the target, in grid units
+            yaw: Angle around the vertical axis in degrees (0 looks towards -z)
+            pitch: Elevation above the ground plane in degrees
+            fov: Vertical field of view in degrees
+            near: Points closer than this to the eye plane are not drawn
+        """
+        self.target = np.asarray(target, dtype=np.float64)
+        self.distance = distance
+        self.yaw = yaw
+        self.pitch = pitch
+        self.fov = fov
+        self.near = near
+        self.version = 0
+
+    def orbit(self, d_yaw, d_pitch):
+        """Turn the camera by the given angles in degrees (pitch stays within ±85°)."""
+        if not d_yaw and not d_pitch:
+            return
+        self.yaw = (self.yaw + d_yaw) % 360.0
+        self.pitch = max(-85.0, min(85.0, self.pitch + d_pitch))
+        self.version += 1
+
+    def zoom(self, factor, min_distance=2.0, max_distance=None):
+        """Move towards the target by a scale factor (2 halves the distance)."""
+        if factor <= 0 or factor == 1:
+            return
+        distance = max(min_distance, self.distance / factor)
+        if max_distance is not None:
+            distance = min(max_distance, distance)
+        if distance != self.distance:
+            self.distance = distance
+            self.version += 1
+
+    def eye(self):
+        """Camera position in grid units."""
+        yaw = math.radians(self.yaw)
+        pitch = math.radians(self.pitch)
+        offset = np.array([math.sin(yaw) * math.cos(pitch),
+                           math.sin(pitch),
+                           math.cos(yaw) * math.cos(pitch)])
+        return self.target + self.distance * offset
+
+    def view_matrix(self):
+        """4x4 matrix from grid space to camera space (x right, y up, z forward)."""
+        eye = self.eye()
+        forward = self.target - eye
+        forward /= np.linalg.norm(forward)
+        right = np.cross(forward, [0.0, 1.0, 0.0])
+        right /= np.linalg.norm(right)
+        up = np.cross(right, forward)
+
+        view = np.eye(4)
+        view[0, :3], view[1, :3], view[2, :3] = right, up, forward
+        view[:3, 3] = -view[:3, :3] @ eye
+        return view
+
+    def project(self, points, width, height):
+        """
+        Project grid-space points to the screen with one matrix multiply.
+
+        Args:
+            points: (..., 3) array of grid-space points
+            width, height: Screen size in pixels
+
+        Returns:
+            ((..., 2) float screen positions, (...) camera depths). Points
+            with depth below self.near have meaningless screen positions.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        view = self.view_matrix()
+        camera = points @ view[:3, :3].T + view[:3, 3]
+        depth = camera[..., 2]
+        focal = 0.5 * height / math.tan(math.radians(self.fov) / 2)
+        safe = np.maximum(depth, self.near)
+        screen = np.empty(points.shape[:-1] + (2,))
+        screen[..., 0] = width / 2 + focal * camera[..., 0] / safe
+        screen[..., 1] = height / 2 - focal * camera[..., 1] / safe
+        return screen, depth
+
+    def unproject(self, x, y, width, height):
+        """
+        Ray from the eye through a screen point (inverse of project).
+
+        Args:
+            x, y: Screen position in pixels
+            width, height: Screen size in pixels
+
+        Returns:
+            ((3,) eye position, (3,) unit direction) in grid space
+        """
+        view = self.view_matrix()
+        focal = 0.5 * height / math.tan(math.radians(self.fov) / 2)
+        camera = np.array([(x - width / 2) / focal, (height / 2 - y) / focal, 1.0])
+        direction = view[:3, :3].T @ camera
+        return self.eye(), direction / np.linalg.norm(direction)
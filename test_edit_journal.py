@@ -0,0 +1,84 @@
+"""Undo/redo of the edit journal restores every earlier world state."""
+import numpy as np
+
+from edit_journal import EditJournal
+from grid_world import GridWorld
+
+
+def volume(world):
+    return world.blocks.read_box((0, 0, 0), (world.grid_size,) * 3).copy()
+
+
+def random_edit(world, rng):
+    """Apply one edit of a random kind (it may change nothing)."""
+    size = world.grid_size
+    color = world.color_palette[int(rng.integers(0, len(world.color_palette)))]
+    p0 = tuple(rng.integers(0, size, 3).tolist())
+    p1 = tuple(rng.integers(0, size, 3).tolist())
+    kind = int(rng.integers(0, 6))
+    if kind == 0:
+        world.place_block(*p0, color=color)
+    elif kind == 1:
+        world.remove_block(*p0)
+    elif kind == 2:
+        world.fill_box(p0, p1, color)
+    elif kind == 3:
+        world.clear_box(p0, p1)
+    elif kind == 4:
+        world.fill_line(p0, p1, color)
+    else:
+        world.fill_sphere(p0, int(rng.integers(1, 4)), color)
+
+
+def test_undo_redo_restores_every_state():
+    world = GridWorld(grid_size=16)
+    journal = EditJournal(world)
+    rng = np.random.default_rng(0)
+    states = [volume(world)]
+    for _ in range(60):
+        random_edit(world, rng)
+        # Edits that change nothing are not recorded
+        if not np.array_equal(volume(world), states[-1]):
+            states.append(volume(world))
+    assert journal.get_stats()['ops'] == len(states) - 1
+
+    for state in reversed(states[:-1]):
+        assert journal.undo()
+        assert np.array_equal(volume(world), state)
+    assert not journal.can_undo() and not journal.undo()
+
+    for state in states[1:]:
+        assert journal.redo()
+        assert np.array_equal(volume(world), state)
+    assert not journal.can_redo() and not journal.redo()
+
+
+def test_new_edit_discards_redo_tail():
+    world = GridWorld(grid_size=10)
+    journal = EditJournal(world)
+    world.place_block(1, 1, 1)
+    world.place_block(2, 2, 2)
+    journal.undo()
+    world.place_block(3, 3, 3)
+    assert not journal.can_redo()
+    assert journal.get_stats()['ops'] == 2
+
+    journal.undo()
+    journal.undo()
+    assert world.get_block_count() == 0
+
+
+def test_history_is_bounded():
+    world = GridWorld(grid_size=32)
+    journal = EditJournal(world, max_ops=5, max_cells=300)
+    for y in range(10):
+        world.fill_box((0, y, 0), (9, y, 9))  # 100 cells each
+    stats = journal.get_stats()
+    assert stats['ops'] <= 5 and stats['cells'] <= 300
+
+    undone = 0
+    while journal.undo():
+        undone += 1
+    assert undone == stats['ops']
+    # Only the oldest layers stay, the kept history is still consistent
+    assert world.get_block_count() == 100 * (10 - undone)
@@ -0,0 +1,88 @@
+"""FaceIndex kept up to date by edits, and its meshes, against brute force."""
+from collections import Counter
+
+import numpy as np
+
+from face_index import FACE_NORMALS, REBUILD_CELLS
+from grid_world import GridWorld
+
+
+def brute_faces(world):
+    """Set of (cell, direction, color) for every face next to empty or outside space."""
+    grid = world.blocks.read_box((0, 0, 0), (world.grid_size,) * 3)
+    padded = np.pad(grid, 1)
+    faces = set()
+    for cell in zip(*np.nonzero(grid)):
+        for d, normal in enumerate(FACE_NORMALS.tolist()):
+            neighbour = tuple(c + 1 + n for c, n in zip(cell, normal))
+            if padded[neighbour] == 0:
+                faces.add((tuple(int(c) for c in cell), d, int(grid[cell])))
+    return faces
+
+
+def indexed_faces(world):
+    cells, directions, colors = world.get_face_index().get_faces()
+    faces = set(zip(map(tuple, cells.tolist()), directions.tolist(), colors.tolist()))
+    assert len(faces) == len(cells)  # no face is stored twice
+    return faces
+
+
+def unit_faces(vertices, quads, directions, colors):
+    """Counter of the unit faces covered by a mesh, keyed by (lower corner, direction, color)."""
+    covered = Counter()
+    for quad, d, color in zip(quads, directions.tolist(), colors.tolist()):
+        corners = vertices[quad]
+        lo = corners.min(axis=0).astype(int)
+        hi = corners.max(axis=0).astype(int)
+        axis = d // 2
+        hi[axis] = lo[axis] + 1
+        if d % 2 == 0:
+            lo[axis] -= 1
+            hi[axis] -= 1
+        for cell in np.ndindex(*(hi - lo)):
+            covered[(tuple((lo + cell).tolist()), d, color)] += 1
+    return covered
+
+
+def test_incremental_faces_match_brute_force():
+    world = GridWorld(grid_size=16)
+    world.get_face_index()
+    rng = np.random.default_rng(0)
+    for step in range(200):
+        cell = tuple(rng.integers(0, 16, 3).tolist())
+        if rng.random() < 0.6:
+            world.place_block(*cell, color=world.color_palette[int(rng.integers(0, 3))])
+        else:
+            world.remove_block(*cell)
+        if step % 20 == 0:
+            world.fill_sphere(cell, 3, world.color_palette[4])
+        if step % 37 == 0:
+            world.clear_box(cell, tuple(c + 4 for c in cell))
+        assert indexed_faces(world) == brute_faces(world)
+
+
+def test_large_edit_rebuilds_index():
+    world = GridWorld(grid_size=40)
+    world.get_face_index()
+    world.fill_box((0, 0, 0), (19, 19, 19))  # more than REBUILD_CELLS changes
+    assert 20 ** 3 > REBUILD_CELLS
+    assert indexed_faces(world) == brute_faces(world)
+    world.clear_box((5, 5, 5), (30, 30, 30))
+    assert indexed_faces(world) == brute_faces(world)
+
+
+def test_meshes_cover_exposed_faces_once():
+    world = GridWorld(grid_size=16)
+    world.fill_box((1, 1, 1), (10, 3, 8), world.color_palette[0])
+    world.fill_sphere((8, 8, 8), 4, world.color_palette[1])
+    rng = np.random.default_rng(1)
+    for cell in rng.integers(0, 16, (150, 3)).tolist():
+        world.place_block(*cell, color=world.color_palette[int(rng.integers(0, 3))])
+    expected = Counter(brute_faces(world))
+
+    index = world.get_face_index()
+    plain = index.get_mesh()
+    greedy = index.get_mesh(greedy=True)
+    assert unit_faces(*plain) == expected
+    assert unit_faces(*greedy) == expected
+    assert len(greedy[1]) < len(plain[1])
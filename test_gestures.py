@@ -0,0 +1,97 @@
+"""Gesture debouncing timings and the trainable gesture classifiers."""
+import numpy as np
+import pytest
+
+from gesture_classifier import NUM_FEATURES, KNNClassifier, MLPClassifier, load_classifier
+from gestures import GestureEngine, GestureRule
+
+
+def feed(engine, frames, fps=30.0, start=0.0):
+    """Feed (gesture, confidence) frames at a fixed rate; returns the fired (time, gesture) pairs."""
+    fired = []
+    for i, (gesture, confidence) in enumerate(frames):
+        t = start + i / fps
+        action = engine.update(gesture, t, confidence)
+        if action is not None:
+            fired.append((round(t, 6), action))
+    return fired
+
+
+def test_fires_once_after_enter_and_hold():
+    engine = GestureEngine({'place': GestureRule(enter_ms=100, hold_ms=100, cooldown_ms=500)})
+    fired = feed(engine, [('place', 1.0)] * 30)
+    assert [action for _, action in fired] == ['place']
+    # Enter window fully observed at 100 ms, then held for 100 ms
+    assert fired[0][0] == pytest.approx(0.2, abs=1 / 30)
+
+
+def test_same_latency_at_any_frame_rate():
+    times = []
+    for fps in (15.0, 30.0, 60.0):
+        engine = GestureEngine({'place': GestureRule(enter_ms=100, hold_ms=100)})
+        times.append(feed(engine, [('place', 1.0)] * int(fps), fps=fps)[0][0])
+    # Within one frame of the slowest rate
+    assert max(times) - min(times) <= 1 / 15 + 1e-6
+
+
+def test_flicker_does_not_end_active_gesture():
+    engine = GestureEngine({'place': GestureRule(enter_ms=100, exit_ms=150, repeat_ms=None)})
+    frames = [('place', 1.0)] * 10 + [(None, 1.0)] * 2 + [('place', 1.0)] * 10
+    assert len(feed(engine, frames)) == 1
+    assert engine.get_active() == 'place'
+
+
+def test_repeat_rate():
+    engine = GestureEngine({'place': GestureRule(enter_ms=0, hold_ms=0, repeat_ms=200)})
+    fired = feed(engine, [('place', 1.0)] * 30)  # one second
+    assert len(fired) == 5
+
+
+def test_low_confidence_frames_do_not_vote():
+    engine = GestureEngine({'place': GestureRule(enter_ms=100)}, min_confidence=0.5)
+    assert feed(engine, [('place', 0.3)] * 30) == []
+    assert engine.get_active() is None
+
+    # Mostly confident frames with a few unsure ones still enter
+    frames = [('place', 0.9), ('place', 0.9), ('place', 0.9), ('place', 0.3)] * 8
+    assert len(feed(engine, frames, start=5.0)) == 1
+
+
+def test_cooldown_blocks_other_actions():
+    rules = {'place': GestureRule(enter_ms=0, cooldown_ms=500),
+             'delete': GestureRule(enter_ms=0, cooldown_ms=500)}
+    engine = GestureEngine(rules)
+    frames = [('place', 1.0)] * 3 + [(None, 1.0)] * 6 + [('delete', 1.0)] * 12
+    fired = feed(engine, frames)
+    assert [action for _, action in fired] == ['place', 'delete']
+    assert fired[1][0] - fired[0][0] >= 0.5
+
+
+def clusters(n=60, seed=0):
+    """Separable training set: one cluster of features per gesture code."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(3, NUM_FEATURES)) * 3
+    labels = np.repeat(np.arange(1, 4), n)
+    features = centers[labels - 1] + rng.normal(scale=0.3, size=(len(labels), NUM_FEATURES))
+    return features.astype(np.float32), labels
+
+
+def test_unfitted_knn_raises():
+    with pytest.raises(ValueError):
+        KNNClassifier().predict(np.zeros((1, NUM_FEATURES), dtype=np.float32))
+
+
+@pytest.mark.parametrize('make', [lambda: KNNClassifier(k=5), lambda: MLPClassifier(hidden=16)])
+def test_classifier_learns_and_round_trips(tmp_path, make):
+    features, labels = clusters()
+    test_features, test_labels = clusters(seed=0)
+    classifier = make().fit(features, labels)
+    codes, confidence = classifier.predict(test_features)
+    assert np.mean(codes == test_labels) > 0.95
+    assert np.all((confidence >= 0) & (confidence <= 1))
+
+    path = str(tmp_path / 'classifier.npz')
+    classifier.save(path)
+    loaded_codes, loaded_confidence = load_classifier(path).predict(test_features)
+    assert np.array_equal(loaded_codes, codes)
+    assert np.allclose(loaded_confidence, confidence)
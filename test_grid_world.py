@@ -0,0 +1,181 @@
+"""GridWorld edits, flood fill and raycasting checked against brute force."""
+from collections import deque
+
+import numpy as np
+import pytest
+
+from grid_world import GridWorld
+from voxel_storage import EMPTY
+
+NEIGHBOURS = [(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)]
+
+
+def random_world(size=16, count=400, seed=0, storage='auto'):
+    world = GridWorld(grid_size=size, storage=storage)
+    rng = np.random.default_rng(seed)
+    for cell in rng.integers(0, size, (count, 3)).tolist():
+        world.place_block(*cell, color=world.color_palette[int(rng.integers(0, 3))])
+    return world
+
+
+def volume(world):
+    """Dense copy of the world's palette indices."""
+    return world.blocks.read_box((0, 0, 0), (world.grid_size,) * 3).copy()
+
+
+def bfs_component(grid, seed):
+    """Cells 6-connected to seed sharing its value."""
+    target = grid[seed]
+    seen = {seed}
+    todo = deque([seed])
+    while todo:
+        x, y, z = todo.popleft()
+        for dx, dy, dz in NEIGHBOURS:
+            n = (x + dx, y + dy, z + dz)
+            if n not in seen and all(0 <= c < grid.shape[0] for c in n) and grid[n] == target:
+                seen.add(n)
+                todo.append(n)
+    return seen
+
+
+def brute_raycast(world, origin, direction):
+    """Nearest occupied cell along the ray by a slab test against every block."""
+    origin = np.asarray(origin, dtype=np.float64)
+    direction = np.asarray(direction, dtype=np.float64)
+    direction = direction / np.linalg.norm(direction)
+    coords, _ = world.get_block_arrays()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t0 = (coords - origin) / direction
+        t1 = (coords + 1 - origin) / direction
+    near = np.minimum(t0, t1)
+    far = np.maximum(t0, t1)
+    # Axes the ray is parallel to: inside the slab for all t, or never
+    parallel = direction == 0
+    inside = (origin >= coords) & (origin < coords + 1)
+    near = np.where(parallel, np.where(inside, -np.inf, np.inf), near)
+    far = np.where(parallel, np.where(inside, np.inf, -np.inf), far)
+    enter = near.max(axis=1)
+    leave = far.min(axis=1)
+    hit = (leave > np.maximum(enter, 0)) & (enter < np.inf)
+    if not hit.any():
+        return None
+    distance = np.where(hit, np.maximum(enter, 0), np.inf)
+    best = int(distance.argmin())
+    return tuple(coords[best].tolist()), float(distance[best])
+
+
+def test_fill_box_and_clear_box():
+    world = GridWorld(grid_size=12)
+    changed = world.fill_box((2, 3, 4), (5, 3, 8))
+    assert len(changed) == 4 * 1 * 5
+    assert world.get_block_count() == 20
+    assert world.has_block(5, 3, 8) and not world.has_block(6, 3, 8)
+
+    # Corners may be given in any order and are clipped to the world
+    world.clear_box((20, 3, 20), (4, 3, 0))
+    assert world.get_block_count() == 2 * 5
+
+
+def test_fill_shell_is_hollow():
+    world = GridWorld(grid_size=12)
+    world.fill_shell((1, 1, 1), (6, 6, 6))
+    assert world.get_block_count() == 6 ** 3 - 4 ** 3
+    assert not world.has_block(3, 3, 3)
+
+
+@pytest.mark.parametrize('storage', ['dense', 'chunked', 'dict'])
+def test_flood_fill_matches_bfs(storage):
+    world = random_world(storage=storage, seed=1)
+    rng = np.random.default_rng(2)
+    for _ in range(10):
+        seed = tuple(rng.integers(0, world.grid_size, 3).tolist())
+        before = volume(world)
+        expected = bfs_component(before, seed)
+        color = world.color_palette[int(rng.integers(0, len(world.color_palette)))]
+        world.flood_fill(seed, color)
+
+        after = volume(world)
+        index = world.color_table.index_of(color)
+        mask = np.zeros(before.shape, dtype=bool)
+        mask[tuple(np.array(sorted(expected)).T)] = True
+        if before[seed] == index:
+            assert np.array_equal(after, before)
+        else:
+            assert np.all(after[mask] == index)
+            assert np.array_equal(after[~mask], before[~mask])
+
+
+def test_flood_fill_enclosed_space():
+    world = GridWorld(grid_size=24)
+    world.fill_shell((2, 2, 2), (20, 20, 20))
+    changed = world.flood_fill((10, 10, 10), world.color_palette[3])
+    assert len(changed) == 17 ** 3
+    assert world.get_block_count() == 19 ** 3
+
+
+def test_flood_fill_open_space_reaches_world_edges():
+    world = GridWorld(grid_size=24)
+    world.fill_box((10, 10, 10), (12, 12, 12))
+    world.flood_fill((11, 14, 11), world.color_palette[1])
+    assert world.get_block_count() == 24 ** 3
+    assert world.has_block(0, 0, 0) and world.has_block(23, 23, 23)
+
+
+def test_flood_fill_clears_with_empty():
+    world = GridWorld(grid_size=12)
+    world.fill_box((0, 0, 0), (3, 0, 3))
+    world.place_block(8, 8, 8)
+    world.flood_fill((1, 0, 1), EMPTY)
+    assert world.get_block_count() == 1
+
+
+def test_raycast_matches_brute_force():
+    world = random_world(size=20, count=150, seed=3)
+    coords, _ = world.get_block_arrays()
+    rng = np.random.default_rng(4)
+    hits = 0
+    for i in range(300):
+        origin = rng.uniform(-5, 25, 3)
+        direction = rng.normal(size=3)
+        if i % 2:
+            # Aim at a random block so most rays hit something
+            direction = coords[int(rng.integers(0, len(coords)))] + rng.random(3) - origin
+        if rng.random() < 0.2:
+            direction[int(rng.integers(0, 3))] = 0  # axis-parallel component
+        expected = brute_raycast(world, origin, direction)
+        hit = world.raycast(origin, direction)
+        if expected is None:
+            assert hit is None
+        else:
+            assert hit is not None
+            assert hit[0] == expected[0]
+            assert hit[2] == pytest.approx(expected[1], abs=1e-9)
+            hits += 1
+    assert hits > 100
+
+
+def test_raycast_normal_and_max_distance():
+    world = GridWorld(grid_size=10)
+    world.place_block(5, 2, 4)
+    cell, normal, distance = world.raycast((5.5, 9.5, 4.5), (0, -1, 0))
+    assert cell == (5, 2, 4)
+    assert normal == (0, 1, 0)
+    assert distance == pytest.approx(6.5)
+    assert world.raycast((5.5, 9.5, 4.5), (0, -1, 0), max_distance=6.0) is None
+
+    # Starting inside a block hits it with no entry face
+    assert world.raycast((5.5, 2.5, 4.5), (1, 0, 0)) == ((5, 2, 4), (0, 0, 0), 0.0)
+
+
+def test_aim_cursor_places_on_hit_face():
+    world = GridWorld(grid_size=10)
+    world.place_block(3, 0, 3)
+    world.aim_cursor((3.5, 8.5, 3.5), (0, -1, 0))
+    assert world.target_pos == (3, 0, 3)
+    assert world.get_cursor_position() == (3, 1, 3)
+
+    # A hit face on the world boundary leaves the cursor on the block itself
+    world.place_block(3, 9, 3)
+    world.aim_cursor((3.5, 12.0, 3.5), (0, -1, 0))
+    assert world.target_pos == (3, 9, 3)
+    assert world.get_cursor_position() == (3, 9, 3)
@@ -0,0 +1,44 @@
+"""The renderer's incremental block layer against a full redraw."""
+import numpy as np
+
+from grid_world import GridWorld
+from hologram_renderer import HologramRenderer
+
+
+def full_layer(world):
+    """Block layer drawn from scratch by a fresh renderer."""
+    renderer = HologramRenderer(640, 480)
+    renderer._update_block_layer(world)
+    return renderer
+
+
+def test_incremental_block_layer_matches_full_redraw():
+    world = GridWorld(grid_size=20)
+    renderer = HologramRenderer(640, 480)
+    renderer._update_block_layer(world)
+    rng = np.random.default_rng(0)
+    for step in range(40):
+        cell = tuple(rng.integers(0, 20, 3).tolist())
+        if step % 10 == 9:
+            world.fill_box(cell, tuple(c + 3 for c in cell), world.color_palette[2])
+        elif rng.random() < 0.7:
+            world.place_block(*cell, color=world.color_palette[int(rng.integers(0, 5))])
+        else:
+            world.clear_box(cell, tuple(c + 2 for c in cell))
+        renderer._update_block_layer(world)
+
+        expected = full_layer(world)
+        assert np.array_equal(renderer.block_color, expected.block_color)
+        assert np.array_equal(renderer.block_mask, expected.block_mask)
+        assert renderer.block_bounds == expected.block_bounds
+
+
+def test_unchanged_world_keeps_layer():
+    world = GridWorld(grid_size=20)
+    world.fill_box((2, 0, 2), (6, 2, 6))
+    renderer = HologramRenderer(640, 480)
+    renderer._update_block_layer(world)
+    layer = renderer.block_color
+    renderer._update_block_layer(world)
+    assert renderer.block_color is layer
+    assert renderer.block_bounds is not None
@@ -0,0 +1,61 @@
+"""Behavioural checks for the voxel storage backends against a plain dict model."""
+import numpy as np
+import pytest
+
+from voxel_storage import EMPTY, create_storage
+
+SIZE = 40
+STORAGES = ('dense', 'chunked', 'dict')
+
+
+def _contents(storage):
+    """Dict of occupied cell -> palette index."""
+    coords = storage.nonzero()
+    return dict(zip(map(tuple, coords.tolist()), storage.values_at(coords).tolist()))
+
+
+@pytest.mark.parametrize('kind', STORAGES)
+def test_set_many_matches_model(kind):
+    storage = create_storage(kind, SIZE)
+    model = {}
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        coords = rng.integers(0, SIZE, (int(rng.integers(1, 60)), 3))
+        coords = np.concatenate([coords, coords[:5]])  # duplicates, the last write wins
+        indices = rng.integers(0, 4, len(coords)).astype(np.uint8)
+        storage.set_many(coords, indices)
+        for cell, index in zip(map(tuple, coords.tolist()), indices.tolist()):
+            if index == EMPTY:
+                model.pop(cell, None)
+            else:
+                model[cell] = index
+        assert len(storage) == len(model)
+    assert _contents(storage) == model
+
+
+@pytest.mark.parametrize('kind', STORAGES)
+def test_boxes_round_trip(kind):
+    storage = create_storage(kind, SIZE)
+    rng = np.random.default_rng(1)
+    values = rng.integers(0, 3, (7, 9, 5)).astype(np.uint8)
+    mask = rng.random(values.shape) < 0.5
+    storage.write_box((3, 20, 30), values)
+    assert np.array_equal(storage.read_box((3, 20, 30), (10, 29, 35)), values)
+
+    storage.write_box((3, 20, 30), np.zeros_like(values), mask)
+    assert np.array_equal(storage.read_box((3, 20, 30), (10, 29, 35)), np.where(mask, 0, values))
+    assert len(storage) == int(np.count_nonzero(np.where(mask, 0, values)))
+
+
+@pytest.mark.parametrize('kind', STORAGES)
+def test_chunks_round_trip(kind):
+    source = create_storage('dense', SIZE)
+    rng = np.random.default_rng(2)
+    source.set_many(rng.integers(0, SIZE, (500, 3)), rng.integers(1, 5, 500).astype(np.uint8))
+
+    target = create_storage(kind, SIZE)
+    items = list(source.iter_chunks())
+    keys = np.array([origin for origin, _ in items]) >> 4
+    target.write_chunks(keys, np.stack([data for _, data in items]))
+    assert _contents(target) == _contents(source)
+    assert len(target) == len(source)
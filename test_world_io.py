@@ -0,0 +1,74 @@
+"""Save/load round trips of the world file format and the autosave log."""
+import os
+
+import numpy as np
+import pytest
+
+from grid_world import GridWorld
+from world_io import AutosaveWorker, load_world, save_world
+
+
+def blocks_of(world):
+    """Dict of occupied cell -> RGB color."""
+    coords, indices = world.get_block_arrays()
+    rgb = world.color_table.rgb
+    return {tuple(c): tuple(rgb[i].tolist()) for c, i in zip(coords.tolist(), indices)}
+
+
+def build_world(storage='auto', size=40):
+    world = GridWorld(grid_size=size, storage=storage)
+    world.fill_box((0, 0, 0), (size - 1, 0, size - 1), world.color_palette[1])  # spans chunks
+    world.fill_sphere((20, 12, 20), 6, (0.25, 0.5, 0.75))  # color outside the palette
+    rng = np.random.default_rng(0)
+    for cell in rng.integers(0, size, (300, 3)).tolist():
+        world.place_block(*cell, color=world.color_palette[int(rng.integers(0, 5))])
+    return world
+
+
+@pytest.mark.parametrize('storage', ['dense', 'chunked', 'dict'])
+def test_round_trip(tmp_path, storage):
+    world = build_world(storage)
+    path = str(tmp_path / 'world.bbpw')
+    save_world(world, path)
+
+    loaded = load_world(path, storage=storage)
+    assert loaded.grid_size == world.grid_size
+    assert loaded.get_block_count() == world.get_block_count()
+    assert blocks_of(loaded) == blocks_of(world)
+
+
+def test_round_trip_empty_world(tmp_path):
+    path = str(tmp_path / 'empty.bbpw')
+    save_world(GridWorld(grid_size=20), path)
+    loaded = load_world(path)
+    assert loaded.grid_size == 20
+    assert loaded.get_block_count() == 0
+
+
+def test_autosave_log_replays_uncompacted_changes(tmp_path):
+    world = build_world()
+    path = str(tmp_path / 'auto.bbpw')
+    autosave = AutosaveWorker(world, path, flush_interval=0.0, compact_interval=3600.0).start()
+    world.clear_box((0, 0, 0), (9, 39, 9))
+    world.fill_line((0, 5, 0), (39, 5, 39), (0.9, 0.1, 0.2))
+    world.remove_block(20, 12, 20)
+
+    # Stop the worker without the final compaction, as after a crash
+    autosave.running = False
+    autosave.thread.join()
+    autosave.log.close()
+    assert os.path.getsize(path + '.log') > 0
+
+    assert blocks_of(load_world(path)) == blocks_of(world)
+    assert blocks_of(load_world(path, replay_log=False)) != blocks_of(world)
+
+
+def test_autosave_stop_compacts(tmp_path):
+    world = build_world()
+    path = str(tmp_path / 'auto.bbpw')
+    autosave = AutosaveWorker(world, path, compact_interval=3600.0).start()
+    world.fill_box((5, 5, 5), (8, 8, 8), (0.1, 0.2, 0.3))
+    autosave.stop()
+
+    assert os.path.getsize(path + '.log') == 0
+    assert blocks_of(load_world(path, replay_log=False)) == blocks_of(world)
@@ -0,0 +1,96 @@
+"""
+Train a gesture classifier from recorded landmark traces.
+
+Record traces in the app with --record-gestures (digit keys 0-5 pick the
+gesture being shown), then train and point the app at the model:
+
+    python main.py --record-gestures traces/session1.npz
+    python train_gestures.py traces/*.npz --model knn --output gestures.npz
+    python main.py --gesture-model gestures.npz
+"""
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from gesture_classifier import (KNNClassifier, MLPClassifier, RuleClassifier,
+                                landmark_features, NUM_GESTURES)
+
+
+def load_traces(paths):
+    """
+    Concatenate trace files written by GestureRecorder.
+
+    Returns:
+        ((N, 40) features, (N,) gesture codes)
+    """
+    features, labels = [], []
+    for path in paths:
+        with np.load(path) as data:
+            features.append(landmark_features(data['landmarks'], data['handedness'].tolist()))
+            labels.append(data['labels'].astype(np.intp))
+    return np.concatenate(features), np.concatenate(labels)
+
+
+def evaluate(classifier, features, labels):
+    """Accuracy, mean confidence and per-hand prediction time of a classifier."""
+    start = time.perf_counter_ns()
+    codes, confidence = classifier.predict(features)
+    elapsed = time.perf_counter_ns() - start
+    return {
+        'accuracy': float((codes == labels).mean()),
+        'confidence': float(confidence.mean()),
+        'us_per_hand': elapsed / 1000.0 / max(1, len(labels)),
+    }
+
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Train a gesture classifier from landmark traces")
+    parser.add_argument('traces', nargs='+', help="Trace .npz files recorded with --record-gestures")
+    parser.add_argument('--model', choices=('knn', 'mlp'), default='knn',
+                        help="k-nearest-neighbour vote or one-hidden-layer perceptron")
+    parser.add_argument('--k', type=int, default=5, help="Neighbours voting in the k-NN model")
+    parser.add_argument('--hidden', type=int, default=32, help="Hidden units of the MLP model")
+    parser.add_argument('--epochs', type=int, default=500, help="MLP training steps")
+    parser.add_argument('--holdout', type=float, default=0.2,
+                        help="Share of samples kept out of training for validation")
+    parser.add_argument('--output', default='gestures.npz', help="Model file to write")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Entry point of the trainer."""
+    args = parse_args()
+    features, labels = load_traces(args.traces)
+    counts = np.bincount(labels, minlength=NUM_GESTURES)
+    print(f"Loaded {len(labels)} samples, per gesture code: {counts.tolist()}")
+
+    # Shuffled train/validation split
+    order = np.random.default_rng(0).permutation(len(labels))
+    split = int(len(order) * (1 - args.holdout))
+    train, test = order[:split], order[split:]
+
+    def train_on(samples):
+        if args.model == 'knn':
+            return KNNClassifier(k=args.k).fit(features[samples], labels[samples])
+        return MLPClassifier(hidden=args.hidden).fit(features[samples], labels[samples],
+                                                     epochs=args.epochs)
+
+    if len(test):
+        classifier = train_on(train)
+        for name, model in (('rules', RuleClassifier()), (args.model, classifier)):
+            result = evaluate(model, features[test], labels[test])
+            print(f"{name:>6}: accuracy {result['accuracy']:.3f}  "
+                  f"confidence {result['confidence']:.2f}  {result['us_per_hand']:.2f} us/hand")
+
+    # Ship the model trained on every sample
+    classifier = train_on(order)
+    classifier.save(args.output)
+    print(f"Model written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
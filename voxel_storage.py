@@ -0,0 +1,577 @@
+import numpy as np
+
+# Palette index 0 is reserved for empty cells
+EMPTY = 0
+MAX_COLORS = 255
+
+# Chunk edge length of ChunkedStorage, a power of two so shifts and masks work
+CHUNK_SHIFT = 4
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# Largest grid the "auto" storage keeps as one dense volume (2 MB)
+DENSE_MAX_SIZE = 128
+
+
+class ColorTable:
+    """
+    Maps RGB colors to the small palette indices stored in the voxel volume.
+    Index 0 means empty, so a table holds at most 255 distinct colors.
+    """
+    
+    def __init__(self, colors=()):
+        """
+        Initialize the table.
+        
+        Args:
+            colors: RGB tuples (0-1) to register up front, in index order
+        """
+        self.colors = [None]  # index -> RGB tuple
+        self.lookup = {}      # RGB tuple -> index
+        self.rgb = np.zeros((MAX_COLORS + 1, 3), dtype=np.float32)
+        for color in colors:
+            self.index_of(color)
+    
+    def index_of(self, color):
+        """
+        Get the palette index of a color, registering it if it is new.
+        
+        Args:
+            color: RGB tuple (0-1)
+        
+        Returns:
+            Palette index (1-255)
+        """
+        index = self.lookup.get(color)
+        if index is None:
+            color = tuple(float(c) for c in color)
+            index = self.lookup.get(color)
+        if index is None:
+            index = len(self.colors)
+            if index > MAX_COLORS:
+                raise ValueError(f"Color table is full ({MAX_COLORS} colors)")
+            self.colors.append(color)
+            self.lookup[color] = index
+            self.rgb[index] = color
+        return index
+    
+    def color_of(self, index):
+        """Get the RGB tuple of a palette index (None for empty)."""
+        return self.colors[index]
+    
+    def __len__(self):
+        return len(self.colors) - 1
+
+
+class VoxelStorage:
+    """
+    Base class for GridWorld block storage.
+    Cells hold palette indices, with 0 meaning empty. Bounds checking is
+    left to GridWorld so storages stay free of per-call validation.
+    """
+    
+    def __init__(self, grid_size):
+        """
+        Initialize common storage settings.
+        
+        Args:
+            grid_size: Number of cells per dimension
+        """
+        self.grid_size = grid_size
+    
+    def get(self, x, y, z):
+        """Get the palette index at a cell (0 when empty)."""
+        raise NotImplementedError
+    
+    def set(self, x, y, z, index):
+        """
+        Set the palette index of a cell (0 clears it).
+        
+        Returns:
+            Previous palette index of the cell
+        """
+        raise NotImplementedError
+    
+    def clear(self):
+        """Empty every cell."""
+        raise NotImplementedError
+    
+    def nonzero(self):
+        """
+        Coordinates of every occupied cell.
+        
+        Returns:
+            (N, 3) intp array of x, y, z
+        """
+        raise NotImplementedError
+    
+    def values_at(self, coords):
+        """
+        Palette indices at many cells.
+        
+        Args:
+            coords: (N, 3) integer array of in-bounds cells
+        
+        Returns:
+            (N,) uint8 array
+        """
+        raise NotImplementedError
+    
+    def set_many(self, coords, indices):
+        """
+        Set many cells at once.
+        
+        Args:
+            coords: (N, 3) integer array of in-bounds cells
+            indices: Palette index for every cell, or one index for all
+        """
+        raise NotImplementedError
+    
+    def read_box(self, lo, hi):
+        """
+        Copy an axis-aligned box of palette indices.
+        
+        Args:
+            lo: (x, y, z) inclusive lower corner, in bounds
+            hi: (x, y, z) exclusive upper corner, in bounds
+        
+        Returns:
+            uint8 array of shape hi - lo
+        """
+        lo = np.asarray(lo)
+        box = np.zeros(tuple(np.asarray(hi) - lo), dtype=np.uint8)
+        coords = self.nonzero()
+        coords = coords[np.all((coords >= lo) & (coords < hi), axis=1)]
+        local = coords - lo
+        box[local[:, 0], local[:, 1], local[:, 2]] = self.values_at(coords)
+        return box
+    
+    def write_box(self, lo, values, mask=None):
+        """
+        Write an axis-aligned box of palette indices.
+        
+        Args:
+            lo: (x, y, z) lower corner of the box, in bounds
+            values: uint8 array, the box extends lo + values.shape
+            mask: Optional boolean array of the same shape, only True cells are written
+        """
+        if mask is None:
+            mask = np.ones(values.shape, dtype=bool)
+        local = np.argwhere(mask)
+        self.set_many(local + np.asarray(lo), values[mask])
+    
+    def __len__(self):
+        raise NotImplementedError
+    
+    def __contains__(self, cell):
+        return self.get(*cell) != EMPTY
+    
+    def items(self):
+        """Iterate over ((x, y, z), palette index) of occupied cells."""
+        coords = self.nonzero()
+        return zip(map(tuple, coords.tolist()), self.values_at(coords).tolist())
+    
+    def iter_chunks(self):
+        """
+        Iterate over populated CHUNK_SIZE³ blocks of the world.
+        
+        Yields:
+            ((x0, y0, z0) origin of the chunk, (CHUNK_SIZE,) * 3 uint8 array)
+        """
+        coords = self.nonzero()
+        if len(coords) == 0:
+            return
+        indices = self.values_at(coords)
+        local = coords & CHUNK_MASK
+        for key, members in group_by_chunk(coords):
+            data = np.zeros((CHUNK_SIZE,) * 3, dtype=np.uint8)
+            cells = local[members]
+            data[cells[:, 0], cells[:, 1], cells[:, 2]] = indices[members]
+            yield tuple(k << CHUNK_SHIFT for k in key), data
+    
+    def write_chunks(self, keys, chunks):
+        """
+        Bulk-write whole chunks, e.g. when loading a saved world.
+        
+        Args:
+            keys: (N, 3) integer array of chunk coordinates
+            chunks: (N, CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE) uint8 array
+        """
+        for key, data in zip(np.asarray(keys).tolist(), chunks):
+            lo = [k << CHUNK_SHIFT for k in key]
+            hi = [min(l + CHUNK_SIZE, self.grid_size) for l in lo]
+            self.write_box(lo, data[:hi[0] - lo[0], :hi[1] - lo[1], :hi[2] - lo[2]])
+
+
+def group_by_chunk(coords):
+    """
+    Group cells by the chunk they fall in, with one sort instead of a pass per chunk.
+    
+    Args:
+        coords: (N, 3) non-negative integer array
+    
+    Yields:
+        ((cx, cy, cz) chunk key, array of row indices into coords)
+    """
+    if len(coords) == 0:
+        return
+    keys = np.asarray(coords, dtype=np.int64) >> CHUNK_SHIFT
+    # Pack the three chunk coordinates into one sortable integer (21 bits each)
+    packed = (keys[:, 0] << 42) | (keys[:, 1] << 21) | keys[:, 2]
+    order = np.argsort(packed, kind='stable')
+    packed = packed[order]
+    starts = np.flatnonzero(np.diff(packed)) + 1
+    for members in np.split(order, starts):
+        yield tuple(keys[members[0]].tolist()), members
+
+
+class DictStorage(VoxelStorage):
+    """Sparse storage in a dict keyed by (x, y, z), the original GridWorld layout."""
+    
+    def __init__(self, grid_size):
+        super().__init__(grid_size)
+        self.cells = {}
+    
+    def get(self, x, y, z):
+        return self.cells.get((x, y, z), EMPTY)
+    
+    def set(self, x, y, z, index):
+        if index == EMPTY:
+            return self.cells.pop((x, y, z), EMPTY)
+        previous = self.cells.get((x, y, z), EMPTY)
+        self.cells[(x, y, z)] = index
+        return previous
+    
+    def clear(self):
+        self.cells.clear()
+    
+    def nonzero(self):
+        return np.array(list(self.cells), dtype=np.intp).reshape(-1, 3)
+    
+    def values_at(self, coords):
+        get = self.cells.get
+        return np.array([get(cell, EMPTY) for cell in map(tuple, np.asarray(coords).tolist())],
+                        dtype=np.uint8)
+    
+    def set_many(self, coords, indices):
+        coords = np.asarray(coords).tolist()
+        indices = np.broadcast_to(np.asarray(indices, dtype=np.uint8), (len(coords),)).tolist()
+        for (x, y, z), index in zip(coords, indices):
+            self.set(x, y, z, index)
+    
+    def __len__(self):
+        return len(self.cells)
+    
+    def items(self):
+        return self.cells.items()
+
+
+class DenseStorage(VoxelStorage):
+    """
+    Dense uint8 palette-index volume of shape (grid_size,) * 3.
+    Memory is fixed at grid_size³ bytes and whole-world queries are NumPy ops.
+    """
+    
+    def __init__(self, grid_size):
+        super().__init__(grid_size)
+        self.volume = np.zeros((grid_size,) * 3, dtype=np.uint8)
+        self.cells = memoryview(self.volume)  # fast scalar access without NumPy scalars
+        self.count = 0
+    
+    def get(self, x, y, z):
+        return self.cells[x, y, z]
+    
+    def set(self, x, y, z, index):
+        previous = self.cells[x, y, z]
+        self.cells[x, y, z] = index
+        self.count += (index != EMPTY) - (previous != EMPTY)
+        return previous
+    
+    def clear(self):
+        self.volume.fill(EMPTY)
+        self.count = 0
+    
+    def nonzero(self):
+        return np.argwhere(self.volume)
+    
+    def values_at(self, coords):
+        coords = np.asarray(coords)
+        return self.volume[coords[:, 0], coords[:, 1], coords[:, 2]]
+    
+    def set_many(self, coords, indices):
+        coords = np.asarray(coords).reshape(-1, 3)
+        indices = np.broadcast_to(np.asarray(indices, dtype=np.uint8), (len(coords),))
+        cells = np.ravel_multi_index((coords[:, 0], coords[:, 1], coords[:, 2]), self.volume.shape)
+        # Keep the last write to every cell so the count diff is exact
+        cells, last = np.unique(cells[::-1], return_index=True)
+        indices = indices[::-1][last]
+        flat = self.volume.reshape(-1)
+        self.count += int(np.count_nonzero(indices)) - int(np.count_nonzero(flat[cells]))
+        flat[cells] = indices
+    
+    def read_box(self, lo, hi):
+        return self.volume[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]].copy()
+    
+    def write_box(self, lo, values, mask=None):
+        view = self.volume[lo[0]:lo[0] + values.shape[0],
+                           lo[1]:lo[1] + values.shape[1],
+                           lo[2]:lo[2] + values.shape[2]]
+        if mask is None:
+            self.count += int(np.count_nonzero(values)) - int(np.count_nonzero(view))
+            view[...] = values
+        else:
+            new = values[mask]
+            self.count += int(np.count_nonzero(new)) - int(np.count_nonzero(view[mask]))
+            view[mask] = new
+    
+    def _chunk_grid(self):
+        """
+        View the volume as an (n, n, n, CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+        grid of chunks. Sizes that are not a multiple of CHUNK_SIZE get a
+        padded copy, returned as the second value (None when it is a view).
+        """
+        n = -(-self.grid_size // CHUNK_SIZE)
+        padded = n * CHUNK_SIZE
+        if padded == self.grid_size:
+            target = self.volume
+        else:
+            target = np.zeros((padded,) * 3, dtype=np.uint8)
+            target[:self.grid_size, :self.grid_size, :self.grid_size] = self.volume
+        grid = target.reshape(n, CHUNK_SIZE, n, CHUNK_SIZE, n, CHUNK_SIZE).transpose(0, 2, 4, 1, 3, 5)
+        return grid, None if target is self.volume else target
+    
+    def iter_chunks(self):
+        grid, _ = self._chunk_grid()
+        occupied = np.argwhere(grid.any(axis=(3, 4, 5)))
+        for key in occupied.tolist():
+            yield tuple(k << CHUNK_SHIFT for k in key), np.ascontiguousarray(grid[tuple(key)])
+    
+    def write_chunks(self, keys, chunks):
+        # Scatter every chunk into the chunk grid in one fancy-indexed assignment
+        keys = np.asarray(keys, dtype=np.intp).reshape(-1, 3)
+        grid, padded = self._chunk_grid()
+        grid[keys[:, 0], keys[:, 1], keys[:, 2]] = chunks
+        if padded is not None:
+            self.volume[...] = padded[:self.grid_size, :self.grid_size, :self.grid_size]
+        self.count = int(np.count_nonzero(self.volume))
+    
+    def __len__(self):
+        return self.count
+
+
+class Chunk:
+    """One CHUNK_SIZE³ block of a ChunkedStorage."""
+    
+    __slots__ = ('data', 'cells', 'count')
+    
+    def __init__(self):
+        self.data = np.zeros((CHUNK_SIZE,) * 3, dtype=np.uint8)
+        self.cells = memoryview(self.data)
+        self.count = 0
+
+
+class ChunkedStorage(VoxelStorage):
+    """
+    Sparse storage of CHUNK_SIZE³ palette-index chunks in a dict keyed by
+    chunk coordinate. Chunks are allocated on first write and freed when
+    their last block is removed, so memory follows the number of populated
+    chunks rather than the bounding volume. Chunks touched since the last
+    pop_dirty() call are tracked for incremental consumers.
+    """
+    
+    def __init__(self, grid_size):
+        super().__init__(grid_size)
+        self.chunks = {}     # (cx, cy, cz) -> Chunk
+        self.dirty = set()   # chunk keys modified (or freed) since pop_dirty()
+        self.count = 0
+    
+    def get(self, x, y, z):
+        chunk = self.chunks.get((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT, z >> CHUNK_SHIFT))
+        if chunk is None:
+            return EMPTY
+        return chunk.cells[x & CHUNK_MASK, y & CHUNK_MASK, z & CHUNK_MASK]
+    
+    def set(self, x, y, z, index):
+        key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT, z >> CHUNK_SHIFT)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if index == EMPTY:
+                return EMPTY
+            chunk = self.chunks[key] = Chunk()
+        
+        local = (x & CHUNK_MASK, y & CHUNK_MASK, z & CHUNK_MASK)
+        previous = chunk.cells[local]
+        if previous == index:
+            return previous
+        chunk.cells[local] = index
+        delta = (index != EMPTY) - (previous != EMPTY)
+        chunk.count += delta
+        self.count += delta
+        self.dirty.add(key)
+        if chunk.count == 0:
+            del self.chunks[key]
+        return previous
+    
+    def clear(self):
+        self.dirty.update(self.chunks)
+        self.chunks.clear()
+        self.count = 0
+    
+    def nonzero(self):
+        parts = [np.argwhere(chunk.data) + (np.array(key) << CHUNK_SHIFT)
+                 for key, chunk in self.chunks.items()]
+        if not parts:
+            return np.zeros((0, 3), dtype=np.intp)
+        return np.concatenate(parts)
+    
+    def values_at(self, coords):
+        coords = np.asarray(coords)
+        values = np.zeros(len(coords), dtype=np.uint8)
+        for key, members in group_by_chunk(coords):
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                local = coords[members] & CHUNK_MASK
+                values[members] = chunk.data[local[:, 0], local[:, 1], local[:, 2]]
+        return values
+    
+    def set_many(self, coords, indices):
+        coords = np.asarray(coords)
+        indices = np.broadcast_to(np.asarray(indices, dtype=np.uint8), (len(coords),))
+        for key, members in group_by_chunk(coords):
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                if not indices[members].any():
+                    continue
+                chunk = self.chunks[key] = Chunk()
+            
+            local = coords[members] & CHUNK_MASK
+            chunk.data[local[:, 0], local[:, 1], local[:, 2]] = indices[members]
+            count = int(np.count_nonzero(chunk.data))
+            self.count += count - chunk.count
+            chunk.count = count
+            self.dirty.add(key)
+            if count == 0:
+                del self.chunks[key]
+    
+    def read_box(self, lo, hi):
+        box = np.zeros(tuple(np.asarray(hi) - np.asarray(lo)), dtype=np.uint8)
+        for key, chunk_slices, box_slices in self._overlaps(lo, hi, existing_only=True):
+            box[box_slices] = self.chunks[key].data[chunk_slices]
+        return box
+    
+    def write_box(self, lo, values, mask=None):
+        hi = tuple(l + n for l, n in zip(lo, values.shape))
+        for key, chunk_slices, box_slices in self._overlaps(lo, hi):
+            part = values[box_slices]
+            part_mask = None if mask is None else mask[box_slices]
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                if not (part.any() if part_mask is None else part[part_mask].any()):
+                    continue
+                chunk = self.chunks[key] = Chunk()
+            
+            if part_mask is None:
+                chunk.data[chunk_slices] = part
+            else:
+                chunk.data[chunk_slices][part_mask] = part[part_mask]
+            count = int(np.count_nonzero(chunk.data))
+            self.count += count - chunk.count
+            chunk.count = count
+            self.dirty.add(key)
+            if count == 0:
+                del self.chunks[key]
+    
+    def _overlaps(self, lo, hi, existing_only=False):
+        """
+        Yield (chunk key, chunk-local slices, box-local slices) for every
+        chunk overlapping the box [lo, hi).
+        """
+        if any(h <= l for l, h in zip(lo, hi)):
+            return
+        key_lo = [l >> CHUNK_SHIFT for l in lo]
+        key_hi = [(h - 1) >> CHUNK_SHIFT for h in hi]
+        
+        span = np.prod([b - a + 1 for a, b in zip(key_lo, key_hi)])
+        if existing_only and span > len(self.chunks):
+            # Fewer chunks exist than the box covers, filter the existing ones
+            keys = [key for key in self.chunks
+                    if all(a <= k <= b for k, a, b in zip(key, key_lo, key_hi))]
+        else:
+            keys = [(cx, cy, cz)
+                    for cx in range(key_lo[0], key_hi[0] + 1)
+                    for cy in range(key_lo[1], key_hi[1] + 1)
+                    for cz in range(key_lo[2], key_hi[2] + 1)]
+            if existing_only:
+                keys = [key for key in keys if key in self.chunks]
+        
+        for key in keys:
+            chunk_slices = []
+            box_slices = []
+            for k, l, h in zip(key, lo, hi):
+                origin = k << CHUNK_SHIFT
+                start = max(l, origin)
+                stop = min(h, origin + CHUNK_SIZE)
+                chunk_slices.append(slice(start - origin, stop - origin))
+                box_slices.append(slice(start - l, stop - l))
+            yield key, tuple(chunk_slices), tuple(box_slices)
+    
+    def write_chunks(self, keys, chunks):
+        counts = np.count_nonzero(chunks.reshape(len(chunks), -1), axis=1).tolist()
+        for key, data, count in zip(map(tuple, np.asarray(keys).tolist()), chunks, counts):
+            old = self.chunks.pop(key, None)
+            self.count -= old.count if old is not None else 0
+            self.dirty.add(key)
+            if count:
+                chunk = Chunk()
+                chunk.data[...] = data
+                chunk.count = count
+                self.chunks[key] = chunk
+                self.count += count
+    
+    def __len__(self):
+        return self.count
+    
+    def iter_chunks(self):
+        for key, chunk in list(self.chunks.items()):
+            yield tuple(k << CHUNK_SHIFT for k in key), chunk.data
+    
+    def pop_dirty(self):
+        """
+        Get and reset the chunks modified since the last call.
+        
+        Returns:
+            Set of (cx, cy, cz) chunk keys, including chunks that were freed
+        """
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+    
+    def memory_bytes(self):
+        """Bytes held by chunk arrays."""
+        return len(self.chunks) * CHUNK_SIZE ** 3
+
+
+STORAGE_TYPES = {
+    'dict': DictStorage,
+    'dense': DenseStorage,
+    'chunked': ChunkedStorage,
+}
+
+
+def create_storage(kind, grid_size):
+    """
+    Build a block storage by name.
+    
+    Args:
+        kind: "dict", "dense", "chunked", or "auto" (dense up to
+              DENSE_MAX_SIZE cells per side, chunked beyond)
+        grid_size: Number of cells per dimension
+    
+    Returns:
+        VoxelStorage instance
+    """
+    if kind == 'auto':
+        kind = 'dense' if grid_size <= DENSE_MAX_SIZE else 'chunked'
+    storage_type = STORAGE_TYPES.get(kind)
+    if storage_type is None:
+        raise ValueError(f"Unknown storage type: {kind}")
+    return storage_type(grid_size)
@@ -0,0 +1,376 @@
+import os
+import queue
+import struct
+import threading
+import time
+import traceback
+
+import numpy as np
+
+from grid_world import GridWorld
+from voxel_storage import CHUNK_SIZE, CHUNK_SHIFT, ChunkedStorage, ColorTable
+
+# File layout (little endian, sections padded to 8 bytes so they can be
+# viewed straight out of a memory map):
+#   header   magic, version, grid size, color count, chunk count, run count
+#   colors   float64 (colors, 3), RGB of palette indices 1..colors (exact round trip)
+#   keys     int32 (chunks, 3), chunk coordinates
+#   runs     uint32 (chunks,), number of runs per chunk
+#   values   uint8 (run count,), palette index of every run
+#   lengths  uint16 (run count,), length of every run
+# Chunks are run-length encoded in x, y, z (C) order over CHUNK_SIZE³ cells.
+MAGIC = b'BBPW'
+VERSION = 1
+HEADER = struct.Struct('<4sHIHII')
+
+# Autosave log records: kind, count, then the payload
+#   b'C' count colors: uint8 first index, float64 (count, 3) RGB
+#   b'D' count cells:  int32 (count, 3) coords, uint8 (count,) new indices
+RECORD = struct.Struct('<cI')
+
+CHUNK_CELLS = CHUNK_SIZE ** 3
+
+
+def _pad(size):
+    """Round a byte size up to the next multiple of 8."""
+    return (size + 7) & ~7
+
+
+def encode_chunks(chunks):
+    """
+    Run-length encode a stack of chunks in one vectorized pass.
+    
+    Args:
+        chunks: (N, CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE) uint8 array
+    
+    Returns:
+        (runs per chunk uint32, run values uint8, run lengths uint16)
+    """
+    flat = chunks.reshape(-1)
+    if len(flat) == 0:
+        return (np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint8),
+                np.zeros(0, dtype=np.uint16))
+    
+    # A run starts wherever the value changes, and at every chunk boundary
+    change = np.empty(len(flat), dtype=bool)
+    change[0] = True
+    np.not_equal(flat[1:], flat[:-1], out=change[1:])
+    change[::CHUNK_CELLS] = True
+    starts = np.flatnonzero(change)
+    
+    lengths = np.diff(np.append(starts, len(flat))).astype(np.uint16)
+    runs = np.bincount(starts // CHUNK_CELLS, minlength=len(chunks)).astype(np.uint32)
+    return runs, flat[starts], lengths
+
+
+def decode_chunks(values, lengths):
+    """Inverse of encode_chunks: (N, CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE) uint8."""
+    flat = np.repeat(values, lengths.astype(np.intp))
+    return flat.reshape(-1, CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+
+
+def write_world_file(path, grid_size, colors, chunk_items):
+    """
+    Write chunks to a world file, atomically (temp file + rename).
+    
+    Args:
+        path: Destination file
+        grid_size: World size stored in the header
+        colors: RGB tuples of palette indices 1..n
+        chunk_items: Iterable of ((x0, y0, z0) origin, chunk array)
+    """
+    keys = []
+    chunks = []
+    for origin, data in chunk_items:
+        keys.append([o >> CHUNK_SHIFT for o in origin])
+        chunks.append(data)
+    keys = np.array(keys, dtype=np.int32).reshape(-1, 3)
+    stack = np.stack(chunks) if chunks else np.zeros((0,) + (CHUNK_SIZE,) * 3, dtype=np.uint8)
+    runs, values, lengths = encode_chunks(stack)
+    colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+    
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, grid_size, len(colors), len(keys), len(values)))
+        f.write(b'\0' * (_pad(HEADER.size) - HEADER.size))
+        for section in (colors, keys, runs, values, lengths):
+            data = np.ascontiguousarray(section).tobytes()
+            f.write(data)
+            f.write(b'\0' * (_pad(len(data)) - len(data)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_world(world, path):
+    """
+    Save a GridWorld in the compact binary format.
+    
+    Args:
+        world: GridWorld to save
+        path: Destination file
+    """
+    write_world_file(path, world.grid_size, world.color_table.colors[1:], world.iter_chunks())
+
+
+def read_world_file(path):
+    """
+    Memory-map a world file.
+    
+    Returns:
+        Dict with grid_size, colors, keys and the decoded chunks
+    """
+    mm = np.memmap(path, dtype=np.uint8, mode='r')
+    magic, version, grid_size, num_colors, num_chunks, num_runs = HEADER.unpack(
+        mm[:HEADER.size].tobytes())
+    if magic != MAGIC:
+        raise ValueError(f"Not a BlocksByPi world file: {path}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported world file version {version}: {path}")
+    
+    offset = _pad(HEADER.size)
+    sections = []
+    for dtype, count, width in ((np.float64, num_colors, 3), (np.int32, num_chunks, 3),
+                                (np.uint32, num_chunks, 1), (np.uint8, num_runs, 1),
+                                (np.uint16, num_runs, 1)):
+        size = np.dtype(dtype).itemsize * count * width
+        sections.append(mm[offset:offset + size].view(dtype).reshape(-1, width) if width > 1
+                        else mm[offset:offset + size].view(dtype))
+        offset += _pad(size)
+    colors, keys, _, values, lengths = sections
+    
+    return {
+        'grid_size': grid_size,
+        'colors': [tuple(float(c) for c in rgb) for rgb in colors.tolist()],
+        'keys': np.array(keys, dtype=np.intp),
+        'chunks': decode_chunks(values, lengths),
+    }
+
+
+def load_world(path, storage='auto', replay_log=True):
+    """
+    Load a world saved with save_world (plus its autosave log, if any).
+    
+    Args:
+        path: World file
+        storage: GridWorld storage backend for the loaded world
+        replay_log: Apply changes from the autosave log next to the file
+    
+    Returns:
+        GridWorld
+    """
+    data = read_world_file(path)
+    world = GridWorld(grid_size=data['grid_size'], storage=storage)
+    world.color_table = ColorTable(data['colors'])
+    for color in world.color_palette:
+        world.color_table.index_of(color)
+    world.blocks.write_chunks(data['keys'], data['chunks'])
+    
+    log_path = path + '.log'
+    if replay_log and os.path.exists(log_path):
+        for kind, payload in read_log(log_path):
+            if kind == b'C':
+                first, colors = payload
+                for offset, color in enumerate(colors):
+                    if first + offset >= len(world.color_table.colors):
+                        world.color_table.index_of(color)
+            else:
+                coords, indices = payload
+                world.blocks.set_many(coords, indices)
+    return world
+
+
+def read_log(path):
+    """
+    Iterate over the records of an autosave log. A record torn by a crash
+    ends the iteration.
+    
+    Yields:
+        (b'C', (first index, list of RGB)) or (b'D', (coords, new indices))
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    offset = 0
+    while offset + RECORD.size <= len(data):
+        kind, count = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if kind == b'C':
+            size = 1 + count * 24
+            if offset + size > len(data):
+                return
+            first = data[offset]
+            colors = np.frombuffer(data, dtype=np.float64, count=count * 3, offset=offset + 1)
+            yield kind, (first, [tuple(rgb) for rgb in colors.reshape(-1, 3).tolist()])
+        elif kind == b'D':
+            size = count * 13
+            if offset + size > len(data):
+                return
+            coords = np.frombuffer(data, dtype=np.int32, count=count * 3, offset=offset).reshape(-1, 3)
+            indices = np.frombuffer(data, dtype=np.uint8, count=count, offset=offset + count * 12)
+            yield kind, (coords, indices)
+        else:
+            return
+        offset += size
+
+
+class AutosaveWorker:
+    """
+    Background autosave for a GridWorld.
+    
+    The world listener only queues change sets, so the frame loop never
+    waits on disk. A worker thread mirrors the changes into a private
+    ChunkedStorage, appends them to a log next to the world file, and
+    periodically compacts the log by rewriting the world file from the
+    mirror and truncating the log.
+    """
+    
+    def __init__(self, world, path, flush_interval=1.0, compact_interval=60.0,
+                 compact_bytes=16 * 1024 * 1024):
+        """
+        Initialize autosave.
+        
+        Args:
+            world: GridWorld to persist
+            path: World file (the log is written to path + '.log')
+            flush_interval: Seconds between log flushes
+            compact_interval: Seconds between compactions
+            compact_bytes: Log size that triggers an early compaction
+        """
+        self.world = world
+        self.path = path
+        self.log_path = path + '.log'
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+        self.compact_bytes = compact_bytes
+        
+        self.changes = queue.Queue()
+        self.thread = None
+        self.running = False
+        self.log = None
+        self.known_colors = 0
+        
+        # Private copy of the world, only touched by the worker thread
+        self.mirror = ChunkedStorage(world.grid_size)
+        self.colors = []
+        self.records = 0
+        self.compacted_records = 0
+        self.compactions = 0
+        self.error = None  # exception that stopped the worker
+    
+    def start(self):
+        """Snapshot the world and start the worker thread."""
+        keys = []
+        chunks = []
+        for origin, data in self.world.iter_chunks():
+            keys.append([o >> CHUNK_SHIFT for o in origin])
+            chunks.append(data)
+        if chunks:
+            self.mirror.write_chunks(np.array(keys), np.stack(chunks))
+        self.colors = list(self.world.color_table.colors[1:])
+        self.known_colors = len(self.colors)
+        
+        # Fold any previous log into a fresh world file before appending
+        self._compact()
+        self.log = open(self.log_path, 'ab')
+        
+        self.world.add_listener(self._on_change)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"Autosave to {self.path}")
+        return self
+    
+    def _on_change(self, coords, old, new):
+        """World listener, runs on the editing thread: queue only."""
+        if self.error is not None:
+            return
+        table = self.world.color_table
+        if len(table) > self.known_colors:
+            first = self.known_colors + 1
+            self.changes.put((b'C', first, table.colors[first:]))
+            self.known_colors = len(table)
+        self.changes.put((b'D', coords, new))
+    
+    def _run(self):
+        """Worker loop: write queued changes, flush and compact on schedule."""
+        try:
+            self._loop()
+        except Exception as e:
+            # Disk full, permissions, ...: stop queueing instead of dying silently
+            self.error = e
+            self.running = False
+            print(f"\nAutosave to {self.path} failed, further changes are not saved: {e}")
+            traceback.print_exc()
+            while not self.changes.empty():
+                self.changes.get_nowait()
+    
+    def _loop(self):
+        """Body of the worker loop (exceptions are handled by _run)."""
+        last_flush = time.perf_counter()
+        last_compact = last_flush
+        
+        while self.running or not self.changes.empty():
+            try:
+                item = self.changes.get(timeout=0.1)
+                self._write(item)
+                # Drain whatever else is pending before touching the disk again
+                while True:
+                    self._write(self.changes.get_nowait())
+            except queue.Empty:
+                pass
+            
+            now = time.perf_counter()
+            if now - last_flush >= self.flush_interval:
+                self.log.flush()
+                last_flush = now
+            # An idle session has nothing to fold into the world file
+            if self.records != self.compacted_records and (
+                    now - last_compact >= self.compact_interval or
+                    self.log.tell() >= self.compact_bytes):
+                self.log.close()
+                self._compact()
+                self.log = open(self.log_path, 'ab')
+                last_compact = now
+    
+    def _write(self, item):
+        """Apply one queued change to the mirror and append it to the log."""
+        kind, a, b = item
+        if kind == b'C':
+            colors = np.asarray(b, dtype=np.float64).reshape(-1, 3)
+            self.colors.extend(b)
+            self.log.write(RECORD.pack(kind, len(colors)) + bytes([a]) + colors.tobytes())
+        else:
+            coords = np.ascontiguousarray(a, dtype=np.int32)
+            indices = np.ascontiguousarray(b, dtype=np.uint8)
+            self.mirror.set_many(coords, indices)
+            self.log.write(RECORD.pack(kind, len(indices)) + coords.tobytes() + indices.tobytes())
+        self.records += 1
+    
+    def _compact(self):
+        """Rewrite the world file from the mirror and start an empty log."""
+        write_world_file(self.path, self.world.grid_size, self.colors, self.mirror.iter_chunks())
+        with open(self.log_path, 'wb'):
+            pass
+        self.compactions += 1
+        self.compacted_records = self.records
+    
+    def stop(self):
+        """Write everything still queued, compact once more and stop."""
+        if self.thread is None:
+            return
+        self.running = False
+        self.thread.join()
+        self.thread = None
+        self.log.close()
+        if self.error is not None:
+            print(f"World not saved to {self.path} (autosave failed: {self.error})")
+            return
+        if self.records != self.compacted_records:
+            try:
+                self._compact()
+            except OSError as e:
+                # The log still holds every change, load_world replays it
+                print(f"Could not compact {self.path}, changes kept in {self.log_path}: {e}")
+                return
+        print(f"World saved to {self.path}")